@@ -4,6 +4,7 @@
 
 创建数据库表和初始数据
 """
+import asyncio
 import sys
 from pathlib import Path
 
@@ -11,19 +12,19 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.database import init_database, db_manager
+from src.database import init_database, close_database
 from src.utils import get_logger
 
 logger = get_logger(__name__)
 
 
-def main():
+async def main():
     """主函数"""
     logger.info("Starting database setup...")
 
     try:
         # 初始化数据库
-        init_database()
+        await init_database()
 
         logger.info("Database setup completed successfully!")
         logger.info("Tables created:")
@@ -38,7 +39,9 @@ def main():
     except Exception as e:
         logger.error(f"Database setup failed: {e}")
         sys.exit(1)
+    finally:
+        await close_database()
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -12,7 +12,7 @@ from .base import (
 
 from .monitor import MonitorAgent
 from .source_hunter import SourceHunterAgent
-from .verifier import VerifierAgent, VerificationStatus
+from .verifier import VerifierAgent, VerificationStatus, VerificationResult, Evidence
 from .narrative import NarrativeAnalystAgent
 from .synthesizer import SynthesizerAgent
 
@@ -33,4 +33,8 @@ __all__ = [
 
     # 枚举
     "VerificationStatus",
+
+    # 核查结果结构
+    "VerificationResult",
+    "Evidence",
 ]
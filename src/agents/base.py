@@ -30,9 +30,9 @@ class InvestigationContext:
     findings: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentResult:
-    """Agent执行结果"""
+    """Agent执行结果（slots：无实例__dict__，属性定长偏移访问）"""
     agent_name: str
     status: AgentStatus
     data: Dict[str, Any]
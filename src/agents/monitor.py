@@ -6,8 +6,15 @@
 2. 周期性巡查特选信源列表，检测热度异常（演示功能）
 3. 触发调查任务
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Deque
+from collections import defaultdict, deque
+
+import numpy as np
+
 from .base import BaseAgent, InvestigationContext, AgentResult, AgentStatus
+from ..utils import get_logger
+
+logger = get_logger(__name__)
 
 
 class MonitorAgent(BaseAgent):
@@ -19,7 +26,20 @@ class MonitorAgent(BaseAgent):
     def __init__(self, config: Dict[str, Any] = None):
         super().__init__(name="MonitorAgent", config=config)
         self.monitored_sources = self.config.get("monitored_sources", [])
-        self.keyword_threshold = self.config.get("keyword_threshold", 100)
+        # 激增判定：当前热度相对历史基线的z-score阈值
+        self.surge_zscore = self.config.get("surge_zscore", 3.0)
+        # 旧的绝对热度阈值无法换算为z-score，已不再生效
+        if "keyword_threshold" in self.config:
+            logger.warning(
+                "MonitorAgent config 'keyword_threshold' is deprecated and ignored; "
+                f"surges are detected with 'surge_zscore' (current: {self.surge_zscore})"
+            )
+
+        # 每个关键词的滚动热度窗口（默认288个周期 = 5分钟间隔下的24小时）
+        baseline_window = self.config.get("baseline_window", 288)
+        self._history: Dict[str, Deque[float]] = defaultdict(
+            lambda: deque(maxlen=baseline_window)
+        )
 
     async def execute(self, context: InvestigationContext) -> AgentResult:
         """
@@ -64,17 +84,78 @@ class MonitorAgent(BaseAgent):
         Returns:
             dict: 热度分析结果
         """
-        # TODO: 实现关键词热度检测
-        # 1. 查询搜索引擎API
-        # 2. 对比历史基线
+        if not keywords:
+            return {
+                "surge_detected": False,
+                "heat_score": 0.0,
+                "keywords": keywords,
+                "z_scores": {},
+                "surging_keywords": []
+            }
+
+        # 1. 查询当前热度
+        heats = await self._fetch_keyword_heat(keywords)
+        current = np.fromiter((heats.get(kw, 0.0) for kw in keywords), dtype=np.float32)
+
+        # 2. 更新滚动窗口并对比历史基线
+        for kw, heat in zip(keywords, current):
+            self._history[kw].append(float(heat))
+        z_scores = self._compute_z_scores(keywords, current)
+
         # 3. 判断是否激增
+        surging = [kw for kw, z in zip(keywords, z_scores) if z > self.surge_zscore]
 
         return {
-            "surge_detected": False,
-            "heat_score": 0.0,
-            "keywords": keywords
+            "surge_detected": bool(surging),
+            "heat_score": float(current.max()),
+            "keywords": keywords,
+            "z_scores": {kw: float(z) for kw, z in zip(keywords, z_scores)},
+            "surging_keywords": surging
         }
 
+    async def _fetch_keyword_heat(self, keywords: List[str]) -> Dict[str, float]:
+        """
+        查询关键词当前热度
+
+        Args:
+            keywords: 关键词列表
+
+        Returns:
+            dict: 关键词 -> 热度值
+        """
+        # TODO: 查询搜索引擎/社交媒体API
+        return {kw: 0.0 for kw in keywords}
+
+    def _compute_z_scores(self, keywords: List[str], current: np.ndarray) -> np.ndarray:
+        """
+        计算当前热度相对滚动基线的z-score
+
+        窗口长度一致时堆叠为 (K, N) 矩阵一次性计算，否则逐个关键词计算。
+
+        Args:
+            keywords: 关键词列表
+            current: 当前热度（与keywords一一对应）
+
+        Returns:
+            ndarray: 各关键词的z-score
+        """
+        windows = [self._history[kw] for kw in keywords]
+        lengths = {len(w) for w in windows}
+
+        if len(lengths) == 1:
+            matrix = np.array(windows, dtype=np.float32)
+            mean = matrix.mean(axis=1)
+            std = matrix.std(axis=1)
+        else:
+            mean = np.empty(len(windows), dtype=np.float32)
+            std = np.empty(len(windows), dtype=np.float32)
+            for i, w in enumerate(windows):
+                arr = np.fromiter(w, dtype=np.float32, count=len(w))
+                mean[i] = arr.mean()
+                std[i] = arr.std()
+
+        return (current - mean) / np.maximum(std, 1e-6)
+
     async def check_monitored_sources(self) -> List[Dict[str, Any]]:
         """
         检查特选信源列表（周期性任务）
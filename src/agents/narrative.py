@@ -9,7 +9,44 @@
 """
 from typing import Dict, Any, List, Optional
 from datetime import datetime
+
+import msgspec
+import numpy as np
+
 from .base import BaseAgent, InvestigationContext, AgentResult, AgentStatus
+from ..utils.fingerprint import dedup_documents
+
+
+class PropagationGraph(msgspec.Struct):
+    """
+    传播图（CSR压缩稀疏行存储）
+
+    节点u的出边（u被谁放大）为 indices[indptr[u]:indptr[u+1]]，
+    邻接表连续存储，遍历时按顺序访问内存。
+    """
+    nodes: List[str]    # 节点名称（账户/媒体），下标即节点ID
+    indptr: np.ndarray  # int32[N+1]
+    indices: np.ndarray  # int32[E]，边的目标节点
+    weights: np.ndarray  # float32[E]，边权重（转发/引用次数）
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.nodes)
+
+    def neighbors(self, u: int) -> np.ndarray:
+        """获取节点u的所有出边目标"""
+        return self.indices[self.indptr[u]:self.indptr[u + 1]]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为节点/边列表（用于可视化）"""
+        sources = np.repeat(np.arange(self.num_nodes), np.diff(self.indptr))
+        return {
+            "nodes": [{"id": name} for name in self.nodes],
+            "edges": [
+                {"from": self.nodes[u], "to": self.nodes[v], "weight": float(w)}
+                for u, v, w in zip(sources.tolist(), self.indices.tolist(), self.weights.tolist())
+            ]
+        }
 
 
 class NarrativeAnalystAgent(BaseAgent):
@@ -21,6 +58,8 @@ class NarrativeAnalystAgent(BaseAgent):
     def __init__(self, config: Dict[str, Any] = None):
         super().__init__(name="NarrativeAnalystAgent", config=config)
         self.amplification_threshold = self.config.get("amplification_threshold", 10)
+        # 协同判定：被同一上游放大的账户占比阈值
+        self.coordination_threshold = self.config.get("coordination_threshold", 0.8)
 
     async def execute(self, context: InvestigationContext) -> AgentResult:
         """
@@ -88,8 +127,10 @@ class NarrativeAnalystAgent(BaseAgent):
         #     "author": "@User2"
         #   }
         # ]
+        candidates: List[Dict[str, Any]] = []
 
-        return []
+        # 过滤重复/近似重复的转载版本
+        return dedup_documents(candidates)
 
     async def _analyze_evolution(self, versions: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -173,37 +214,96 @@ class NarrativeAnalystAgent(BaseAgent):
         # TODO: 提取并对比数字
         return []
 
-    async def build_propagation_graph(self, versions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def build_propagation_graph(self, versions: List[Dict[str, Any]]) -> PropagationGraph:
         """
         构建传播路径图
 
+        节点：账户/媒体（version["author"]）
+        边：转发/引用关系（version["amplified_from"] -> version["author"]）
+
         Args:
             versions: 版本列表
 
         Returns:
-            dict: 传播图数据（可用于可视化）
+            PropagationGraph: CSR格式传播图（to_dict()可用于可视化）
         """
-        # TODO: 构建传播图
-        # 节点：账户/媒体
-        # 边：转发/引用关系
-
-        return {
-            "nodes": [],
-            "edges": []
-        }
+        node_ids: Dict[str, int] = {}
+        src: List[int] = []
+        dst: List[int] = []
+
+        for version in versions:
+            author = version.get("author")
+            if not author:
+                continue
+            v = node_ids.setdefault(author, len(node_ids))
+
+            upstream = version.get("amplified_from")
+            if upstream:
+                src.append(node_ids.setdefault(upstream, len(node_ids)))
+                dst.append(v)
+
+        n = len(node_ids)
+        src_arr = np.asarray(src, dtype=np.int64)
+        dst_arr = np.asarray(dst, dtype=np.int64)
+
+        # 合并重复边（权重为出现次数），按 (src, dst) 排序即为CSR行序
+        keys, counts = np.unique(src_arr * max(n, 1) + dst_arr, return_counts=True)
+        rows = keys // max(n, 1)
+
+        indptr = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+
+        return PropagationGraph(
+            nodes=list(node_ids),
+            indptr=indptr,
+            indices=(keys % max(n, 1)).astype(np.int32),
+            weights=counts.astype(np.float32)
+        )
 
-    async def detect_coordinated_behavior(self, accounts: List[str]) -> Dict[str, Any]:
+    async def detect_coordinated_behavior(
+        self,
+        accounts: List[str],
+        graph: Optional[PropagationGraph] = None
+    ) -> Dict[str, Any]:
         """
         检测协同行为
 
+        基于传播图：若大部分账户放大的是同一个上游，视为协同放大。
+
         Args:
             accounts: 账户列表
+            graph: 传播图（可选）
 
         Returns:
             dict: 协同行为分析
         """
         # TODO: 时间序列分析、文本相似度分析
+        if graph is None or not accounts:
+            return {
+                "coordinated": False,
+                "confidence": 0.0
+            }
+
+        index = {name: i for i, name in enumerate(graph.nodes)}
+        selected = [index[a] for a in accounts if a in index]
+        if not selected:
+            return {
+                "coordinated": False,
+                "confidence": 0.0
+            }
+
+        mask = np.zeros(graph.num_nodes, dtype=bool)
+        mask[selected] = True
+
+        # 每个上游节点放大出的目标账户数（一次遍历全部边）
+        rows = np.repeat(np.arange(graph.num_nodes), np.diff(graph.indptr))
+        hits = np.bincount(rows[mask[graph.indices]], minlength=graph.num_nodes)
+
+        hub = int(hits.argmax())
+        shared_fraction = float(hits[hub]) / len(selected)
+
         return {
-            "coordinated": False,
-            "confidence": 0.0
+            "coordinated": shared_fraction >= self.coordination_threshold,
+            "confidence": shared_fraction,
+            "hub_account": graph.nodes[hub] if hits[hub] else None
         }
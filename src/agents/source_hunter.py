@@ -7,9 +7,51 @@
 3. 反向图像搜索（如果涉及图片）
 4. 精确定位信息的时间线
 """
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, TYPE_CHECKING
 from datetime import datetime
+from functools import lru_cache
+import asyncio
+
+import httpx
+
 from .base import BaseAgent, InvestigationContext, AgentResult, AgentStatus
+from ..utils.batcher import BatchRequest, http_batcher
+
+if TYPE_CHECKING:
+    from spacy.language import Language
+
+
+# 默认NER模型（中文）
+DEFAULT_NER_MODEL = "zh_core_web_sm"
+
+# Wayback Machine 快照查询接口
+WAYBACK_AVAILABLE_URL = "https://archive.org/wayback/available"
+
+
+@lru_cache(maxsize=None)
+def load_ner(model_name: str = DEFAULT_NER_MODEL) -> Optional["Language"]:
+    """
+    延迟加载NER模型
+
+    spaCy/transformers等重量级库只在首次使用时导入，
+    避免每个API worker在启动时都承担数百MB的初始化开销。
+
+    Args:
+        model_name: spaCy模型名称
+
+    Returns:
+        Language: NER管道（依赖未安装时返回None）
+    """
+    try:
+        import spacy
+    except ImportError:
+        return None
+
+    try:
+        return spacy.load(model_name)
+    except OSError:
+        # 模型未下载
+        return None
 
 
 class SourceHunterAgent(BaseAgent):
@@ -21,6 +63,8 @@ class SourceHunterAgent(BaseAgent):
     def __init__(self, config: Dict[str, Any] = None):
         super().__init__(name="SourceHunterAgent", config=config)
         self.search_depth = self.config.get("search_depth", 3)  # 搜索深度
+        self.ner_model = self.config.get("ner_model", DEFAULT_NER_MODEL)  # NER模型
+        self.batcher = self.config.get("batcher", http_batcher)  # 外部请求批处理
 
     async def execute(self, context: InvestigationContext) -> AgentResult:
         """
@@ -102,8 +146,16 @@ class SourceHunterAgent(BaseAgent):
         Returns:
             dict: 档案记录
         """
-        # TODO: 集成Wayback Machine API
-        return None
+        request = BatchRequest(url=WAYBACK_AVAILABLE_URL, params={"url": url})
+
+        try:
+            response = await self.batcher.submit(request)
+            response.raise_for_status()
+        except httpx.HTTPError:
+            return None
+
+        # 返回最接近的快照（如果有）
+        return response.json().get("archived_snapshots", {}).get("closest")
 
     async def extract_entities(self, text: str) -> List[str]:
         """
@@ -115,6 +167,12 @@ class SourceHunterAgent(BaseAgent):
         Returns:
             list: 实体列表
         """
-        # TODO: 使用NER（命名实体识别）
-        # 或者LLM提取关键实体
-        return []
+        # TODO: 或者LLM提取关键实体
+        ner = await asyncio.to_thread(load_ner, self.ner_model)
+        if ner is None:
+            return []
+
+        # spaCy 推理是同步的CPU计算，放到线程中执行，避免阻塞事件循环
+        doc = await asyncio.to_thread(ner, text)
+        # 去重并保持出现顺序
+        return list(dict.fromkeys(ent.text for ent in doc.ents))
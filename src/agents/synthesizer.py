@@ -8,8 +8,81 @@
 4. 准备EKG写入数据（更新知识图谱）
 """
 from typing import Dict, Any, List, Optional
+from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime
+
+import msgspec
+import numpy as np
+
 from .base import BaseAgent, InvestigationContext, AgentResult, AgentStatus
+from .verifier import VerificationResult, VerificationStatus
+
+
+# 模块级JSON编码器（复用内部缓冲区）
+_json_encoder = msgspec.json.Encoder()
+
+# 信誉分变化查找表：下标为取整后的可信度评分（0-100）
+# - 可信度 >= 70: +5
+# - 可信度 30-70: 不变
+# - 可信度 < 30: -5
+_CREDIT_DELTA = np.zeros(101, dtype=np.int8)
+_CREDIT_DELTA[:30] = -5
+_CREDIT_DELTA[70:] = 5
+
+# 报告文本模板（模块加载时构建一次，调用时仅做字段替换）
+_SUMMARY_TMPL = "信息最早来自 {source_name}。"
+_SUMMARY_REFUTED_TMPL = "信息最早来自 {source_name}。发现 {refuted_count} 项声明存在证伪证据。"
+_RECOMMENDATION_REFUTED = "建议：该信息存在多处不实之处，建议谨慎对待，等待官方确认。"
+_RECOMMENDATION_DEFAULT = "建议：该信息尚未发现明显证伪证据，但建议持续关注官方渠道更新。"
+
+# 核查状态分类编码（用于bincount统计），未知状态归入 _STATUS_OTHER
+_STATUS_INDEX = {status.value: i for i, status in enumerate(VerificationStatus)}
+_STATUS_OTHER = len(_STATUS_INDEX)
+_VERIFIED = _STATUS_INDEX[VerificationStatus.VERIFIED.value]
+_REFUTED = _STATUS_INDEX[VerificationStatus.REFUTED.value]
+
+
+@dataclass(slots=True)
+class VerificationDigest:
+    """
+    核查结果摘要
+
+    对 verification_results 只遍历一次，摘要、评分、建议等均从此派生。
+    """
+    counts: np.ndarray            # 各状态数量，下标见 _STATUS_INDEX
+    refuted_indices: np.ndarray   # 被证伪声明的下标
+    verified_indices: np.ndarray  # 已证实声明的下标
+    claim_texts: List[str]
+
+    @property
+    def total(self) -> int:
+        return len(self.claim_texts)
+
+    @property
+    def refuted_count(self) -> int:
+        return int(self.counts[_REFUTED])
+
+    @property
+    def verified_count(self) -> int:
+        return int(self.counts[_VERIFIED])
+
+    @classmethod
+    def from_results(cls, results: List[VerificationResult]) -> "VerificationDigest":
+        """单次遍历构建摘要"""
+        claim_texts = []
+        codes = []
+        for r in results:
+            claim_texts.append(r.claim)
+            codes.append(_STATUS_INDEX.get(r.status, _STATUS_OTHER))
+
+        codes_arr = np.asarray(codes, dtype=np.int8)
+        return cls(
+            counts=np.bincount(codes_arr, minlength=_STATUS_OTHER + 1),
+            refuted_indices=np.flatnonzero(codes_arr == _REFUTED),
+            verified_indices=np.flatnonzero(codes_arr == _VERIFIED),
+            claim_texts=claim_texts
+        )
 
 
 class SynthesizerAgent(BaseAgent):
@@ -35,11 +108,14 @@ class SynthesizerAgent(BaseAgent):
         # 从context收集所有Agent的发现
         findings = context.findings
 
+        # 核查结果只遍历一次，后续各环节共用摘要
+        digest = VerificationDigest.from_results(findings.get("verification_results", []))
+
         # 生成报告
-        report = await self._generate_report(context, findings)
+        report = await self._generate_report(context, findings, digest)
 
         # 计算可信度评分
-        credibility_score = await self._calculate_credibility_score(findings)
+        credibility_score = await self._calculate_credibility_score(findings, digest)
 
         # 准备EKG更新数据
         ekg_update = await self._prepare_ekg_update(context, findings, credibility_score)
@@ -58,7 +134,8 @@ class SynthesizerAgent(BaseAgent):
     async def _generate_report(
         self,
         context: InvestigationContext,
-        findings: Dict[str, Any]
+        findings: Dict[str, Any],
+        digest: VerificationDigest
     ) -> Dict[str, Any]:
         """
         生成调查报告
@@ -66,6 +143,7 @@ class SynthesizerAgent(BaseAgent):
         Args:
             context: 调查上下文
             findings: 所有Agent的发现
+            digest: 核查结果摘要
 
         Returns:
             dict: 格式化报告
@@ -92,9 +170,9 @@ class SynthesizerAgent(BaseAgent):
 
             # 核查结果
             "verification": {
-                "claims_verified": len(verification_results),
-                "overall_status": self._get_verification_status(verification_results),
-                "details": verification_results
+                "claims_verified": digest.total,
+                "overall_status": self._get_verification_status(digest),
+                "details": msgspec.to_builtins(verification_results)
             },
 
             # 叙事分析
@@ -105,34 +183,34 @@ class SynthesizerAgent(BaseAgent):
             },
 
             # 总结
-            "summary": self._generate_summary(findings),
+            "summary": self._generate_summary(findings, digest),
 
             # 建议
-            "recommendation": self._generate_recommendation(findings)
+            "recommendation": self._generate_recommendation(digest)
         }
 
         return report
 
-    def _get_verification_status(self, results: List[Dict[str, Any]]) -> str:
+    def _get_verification_status(self, digest: VerificationDigest) -> str:
         """获取核查总体状态"""
-        if not results:
+        if not digest.total:
             return "未核查"
 
         # 简化逻辑
-        statuses = [r.get("status") for r in results]
-        if "refuted" in statuses:
+        if digest.refuted_count > 0:
             return "存在证伪证据"
-        elif all(s == "verified" for s in statuses):
+        elif digest.verified_count == digest.total:
             return "已验证"
         else:
             return "部分验证"
 
-    def _generate_summary(self, findings: Dict[str, Any]) -> str:
+    def _generate_summary(self, findings: Dict[str, Any], digest: VerificationDigest) -> str:
         """
         生成摘要（核心发现）
 
         Args:
             findings: 所有发现
+            digest: 核查结果摘要
 
         Returns:
             str: 摘要文本
@@ -141,47 +219,47 @@ class SynthesizerAgent(BaseAgent):
         # 这里是框架示例
 
         original_source = findings.get("original_source", {})
-        verification_results = findings.get("verification_results", [])
 
-        summary_parts = []
+        # 缺失字段替换为空字符串
+        parts = defaultdict(str)
 
         # 信源部分
-        source_name = original_source.get("source_name", "未知来源")
-        summary_parts.append(f"信息最早来自 {source_name}")
+        parts["source_name"] = original_source.get("source_name", "未知来源")
 
         # 核查部分
-        refuted_count = sum(1 for r in verification_results if r.get("status") == "refuted")
-        if refuted_count > 0:
-            summary_parts.append(f"发现 {refuted_count} 项声明存在证伪证据")
+        if digest.refuted_count > 0:
+            parts["refuted_count"] = digest.refuted_count
+            return _SUMMARY_REFUTED_TMPL.format_map(parts)
 
-        return "。".join(summary_parts) + "。"
+        return _SUMMARY_TMPL.format_map(parts)
 
-    def _generate_recommendation(self, findings: Dict[str, Any]) -> str:
+    def _generate_recommendation(self, digest: VerificationDigest) -> str:
         """
         生成建议
 
         Args:
-            findings: 所有发现
+            digest: 核查结果摘要
 
         Returns:
             str: 建议文本
         """
-        verification_results = findings.get("verification_results", [])
-
         # 简化逻辑
-        refuted_count = sum(1 for r in verification_results if r.get("status") == "refuted")
-
-        if refuted_count > 0:
-            return "建议：该信息存在多处不实之处，建议谨慎对待，等待官方确认。"
+        if digest.refuted_count > 0:
+            return _RECOMMENDATION_REFUTED
         else:
-            return "建议：该信息尚未发现明显证伪证据，但建议持续关注官方渠道更新。"
+            return _RECOMMENDATION_DEFAULT
 
-    async def _calculate_credibility_score(self, findings: Dict[str, Any]) -> float:
+    async def _calculate_credibility_score(
+        self,
+        findings: Dict[str, Any],
+        digest: VerificationDigest
+    ) -> float:
         """
         计算可信度评分（0-100）
 
         Args:
             findings: 所有发现
+            digest: 核查结果摘要
 
         Returns:
             float: 可信度评分
@@ -196,13 +274,8 @@ class SynthesizerAgent(BaseAgent):
         score = 50.0  # 基准分
 
         # 根据核查结果调整
-        verification_results = findings.get("verification_results", [])
-        if verification_results:
-            refuted_count = sum(1 for r in verification_results if r.get("status") == "refuted")
-            verified_count = sum(1 for r in verification_results if r.get("status") == "verified")
-
-            score -= refuted_count * 20  # 每个证伪 -20分
-            score += verified_count * 10  # 每个验证 +10分
+        score -= digest.refuted_count * 20  # 每个证伪 -20分
+        score += digest.verified_count * 10  # 每个验证 +10分
 
         # 根据叙事分析调整
         narrative_analysis = findings.get("narrative_analysis", {})
@@ -253,9 +326,9 @@ class SynthesizerAgent(BaseAgent):
             # 声明节点
             "claims": [
                 {
-                    "text": r.get("claim"),
-                    "status": r.get("status"),
-                    "evidence": r.get("evidence", [])
+                    "text": r.claim,
+                    "status": r.status,
+                    "evidence": msgspec.to_builtins(r.evidence)
                 }
                 for r in verification_results
             ],
@@ -280,17 +353,22 @@ class SynthesizerAgent(BaseAgent):
         Returns:
             int: 信誉分变化值（正数表示增加，负数表示减少）
         """
-        # 规则：
-        # - 可信度 >= 70: +5
-        # - 可信度 30-70: 不变
-        # - 可信度 < 30: -5
-
-        if credibility_score >= 70:
-            return 5
-        elif credibility_score < 30:
-            return -5
-        else:
-            return 0
+        # 规则见 _CREDIT_DELTA
+        return int(_CREDIT_DELTA[min(100, max(0, int(credibility_score)))])
+
+    @staticmethod
+    def calculate_source_credit_changes(credibility_scores: np.ndarray) -> np.ndarray:
+        """
+        批量计算信源信誉分变化（用于EKG批量回填）
+
+        Args:
+            credibility_scores: 可信度评分数组
+
+        Returns:
+            ndarray: 信誉分变化数组（int8）
+        """
+        scores = np.asarray(credibility_scores)
+        return _CREDIT_DELTA[np.clip(scores.astype(np.int64), 0, 100)]
 
     async def format_for_api(self, report: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -303,7 +381,19 @@ class SynthesizerAgent(BaseAgent):
             dict: API格式报告
         """
         # TODO: 根据TaaS API规范格式化
-        return report
+        return msgspec.to_builtins(report)
+
+    def encode_for_api(self, report: Dict[str, Any]) -> bytes:
+        """
+        将报告直接编码为JSON字节（跳过中间dict转换）
+
+        Args:
+            report: 原始报告
+
+        Returns:
+            bytes: JSON编码结果
+        """
+        return _json_encoder.encode(report)
 
     async def format_for_ui(self, report: Dict[str, Any]) -> Dict[str, Any]:
         """
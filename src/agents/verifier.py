@@ -9,15 +9,43 @@
 """
 from typing import Dict, Any, List, Optional
 from enum import Enum
+import asyncio
+
+import httpx
+import msgspec
+
 from .base import BaseAgent, InvestigationContext, AgentResult, AgentStatus
+from ..utils.batcher import BatchRequest, http_batcher
+
 
+# SEC EDGAR 全文检索接口
+SEC_EDGAR_SEARCH_URL = "https://efts.sec.gov/LATEST/search-index"
 
-class VerificationStatus(Enum):
-    """核查状态"""
+
+class VerificationStatus(str, Enum):
+    """核查状态（str枚举，可直接与状态字符串比较）"""
     VERIFIED = "verified"  # 已证实
     REFUTED = "refuted"    # 已证伪
     UNVERIFIABLE = "unverifiable"  # 无法验证
     PENDING = "pending"    # 待核查
+    # 仅用于多个声明的整体状态
+    HIGHLY_SUSPICIOUS = "highly_suspicious"  # 存在被证伪的声明
+    MIXED = "mixed"        # 部分证实
+
+
+class Evidence(msgspec.Struct, frozen=True, omit_defaults=True):
+    """核查证据"""
+    source: str
+    finding: str
+    url: Optional[str] = None
+
+
+class VerificationResult(msgspec.Struct, frozen=True, omit_defaults=True):
+    """单个声明的核查结果（Agent间传递，序列化时省略默认值字段）"""
+    claim: str
+    status: VerificationStatus
+    evidence: List[Evidence] = []
+    silent_evidence: Optional[str] = None  # 沉默证据
 
 
 class VerifierAgent(BaseAgent):
@@ -29,6 +57,8 @@ class VerifierAgent(BaseAgent):
     def __init__(self, config: Dict[str, Any] = None):
         super().__init__(name="VerifierAgent", config=config)
         self.primary_sources = self.config.get("primary_sources", [])
+        self.sec_user_agent = self.config.get("sec_user_agent", "NEWS_GT/0.1 (contact@example.com)")
+        self.batcher = self.config.get("batcher", http_batcher)
 
     async def execute(self, context: InvestigationContext) -> AgentResult:
         """
@@ -51,11 +81,7 @@ class VerifierAgent(BaseAgent):
 
         # 框架示例：提取并验证声明
         claims = await self._extract_claims(context.user_submission)
-        verification_results = []
-
-        for claim in claims:
-            result = await self._verify_claim(claim)
-            verification_results.append(result)
+        verification_results = await self.verify_claims(claims)
 
         # 将核查结果存入context
         context.findings["verification_results"] = verification_results
@@ -65,7 +91,7 @@ class VerifierAgent(BaseAgent):
             status=AgentStatus.COMPLETED,
             data={
                 "claims_count": len(claims),
-                "verification_results": verification_results,
+                "verification_results": msgspec.to_builtins(verification_results),
                 "overall_status": self._calculate_overall_status(verification_results)
             }
         )
@@ -95,7 +121,20 @@ class VerifierAgent(BaseAgent):
             }
         ]
 
-    async def _verify_claim(self, claim: Dict[str, Any]) -> Dict[str, Any]:
+    async def verify_claims(self, claims: List[Dict[str, Any]]) -> List[VerificationResult]:
+        """
+        批量验证声明
+
+        Args:
+            claims: 声明列表
+
+        Returns:
+            list: 验证结果（与输入一一对应）
+        """
+        # TODO: 合并为一次批量LLM调用
+        return list(await asyncio.gather(*(self._verify_claim(claim) for claim in claims)))
+
+    async def _verify_claim(self, claim: Dict[str, Any]) -> VerificationResult:
         """
         验证单个声明
 
@@ -103,7 +142,7 @@ class VerifierAgent(BaseAgent):
             claim: 声明对象
 
         Returns:
-            dict: 验证结果
+            VerificationResult: 验证结果
         """
         # TODO: 实现验证逻辑
         # 1. 根据声明类型选择验证策略
@@ -119,7 +158,7 @@ class VerifierAgent(BaseAgent):
         else:
             return await self._verify_generic_claim(claim)
 
-    async def _verify_financial_claim(self, claim: Dict[str, Any]) -> Dict[str, Any]:
+    async def _verify_financial_claim(self, claim: Dict[str, Any]) -> VerificationResult:
         """
         验证金融类声明（如投资、收购）
 
@@ -127,24 +166,24 @@ class VerifierAgent(BaseAgent):
             claim: 声明对象
 
         Returns:
-            dict: 验证结果
+            VerificationResult: 验证结果
         """
         # TODO: 查询SEC EDGAR、公司公告、监管文件
         # 框架示例
-        return {
-            "claim": claim["text"],
-            "status": VerificationStatus.REFUTED.value,
-            "evidence": [
-                {
-                    "source": "SEC EDGAR",
-                    "finding": "未找到相关文件",
-                    "url": "https://www.sec.gov/..."
-                }
+        return VerificationResult(
+            claim=claim["text"],
+            status=VerificationStatus.REFUTED,
+            evidence=[
+                Evidence(
+                    source="SEC EDGAR",
+                    finding="未找到相关文件",
+                    url="https://www.sec.gov/..."
+                )
             ],
-            "silent_evidence": "SEC未披露此交易"  # 沉默证据
-        }
+            silent_evidence="SEC未披露此交易"  # 沉默证据
+        )
 
-    async def _verify_temporal_claim(self, claim: Dict[str, Any]) -> Dict[str, Any]:
+    async def _verify_temporal_claim(self, claim: Dict[str, Any]) -> VerificationResult:
         """
         验证时间相关声明
 
@@ -152,16 +191,15 @@ class VerifierAgent(BaseAgent):
             claim: 声明对象
 
         Returns:
-            dict: 验证结果
+            VerificationResult: 验证结果
         """
         # TODO: 验证时间线的合理性
-        return {
-            "claim": claim["text"],
-            "status": VerificationStatus.UNVERIFIABLE.value,
-            "evidence": []
-        }
+        return VerificationResult(
+            claim=claim["text"],
+            status=VerificationStatus.UNVERIFIABLE
+        )
 
-    async def _verify_generic_claim(self, claim: Dict[str, Any]) -> Dict[str, Any]:
+    async def _verify_generic_claim(self, claim: Dict[str, Any]) -> VerificationResult:
         """
         验证通用声明
 
@@ -169,16 +207,15 @@ class VerifierAgent(BaseAgent):
             claim: 声明对象
 
         Returns:
-            dict: 验证结果
+            VerificationResult: 验证结果
         """
         # TODO: 通用验证策略
-        return {
-            "claim": claim["text"],
-            "status": VerificationStatus.PENDING.value,
-            "evidence": []
-        }
+        return VerificationResult(
+            claim=claim["text"],
+            status=VerificationStatus.PENDING
+        )
 
-    def _calculate_overall_status(self, results: List[Dict[str, Any]]) -> str:
+    def _calculate_overall_status(self, results: List[VerificationResult]) -> VerificationStatus:
         """
         计算整体核查状态
 
@@ -186,19 +223,19 @@ class VerifierAgent(BaseAgent):
             results: 各声明的验证结果
 
         Returns:
-            str: 整体状态
+            VerificationStatus: 整体状态
         """
         if not results:
-            return VerificationStatus.PENDING.value
+            return VerificationStatus.PENDING
 
         # 如果有任何一个被证伪，整体标记为"存疑"
-        statuses = [r.get("status") for r in results]
-        if VerificationStatus.REFUTED.value in statuses:
-            return "highly_suspicious"
-        elif all(s == VerificationStatus.VERIFIED.value for s in statuses):
-            return "verified"
+        statuses = [r.status for r in results]
+        if VerificationStatus.REFUTED in statuses:
+            return VerificationStatus.HIGHLY_SUSPICIOUS
+        elif all(s == VerificationStatus.VERIFIED for s in statuses):
+            return VerificationStatus.VERIFIED
         else:
-            return "mixed"
+            return VerificationStatus.MIXED
 
     async def query_sec_edgar(self, company: str) -> Optional[Dict[str, Any]]:
         """
@@ -210,8 +247,21 @@ class VerifierAgent(BaseAgent):
         Returns:
             dict: 查询结果
         """
-        # TODO: 集成SEC EDGAR API
-        return None
+        # SEC要求请求携带可识别的User-Agent
+        request = BatchRequest(
+            url=SEC_EDGAR_SEARCH_URL,
+            params={"q": f'"{company}"'},
+            headers={"User-Agent": self.sec_user_agent}
+        )
+
+        try:
+            response = await self.batcher.submit(request)
+            response.raise_for_status()
+        except httpx.HTTPError:
+            return None
+
+        # TODO: 解析披露文件列表
+        return response.json()
 
     async def query_official_press_room(self, entity: str) -> Optional[Dict[str, Any]]:
         """
@@ -0,0 +1,47 @@
+"""
+TaaS 请求合并
+
+按端点维护微批处理器：并发到达的单条TaaS请求在时间窗口内合并，
+对EKG/LLM只发起一次批量调用
+"""
+from typing import Any, Awaitable, Callable, Dict, List
+
+from ..utils.batcher import AsyncBatcher
+
+# 合并窗口（毫秒）和单批上限，先到者触发发送
+TAAS_BATCH_WINDOW_MS = 50.0
+TAAS_MAX_BATCH_SIZE = 32
+
+_batchers: Dict[str, AsyncBatcher] = {}
+
+
+def get_batcher(
+    endpoint: str,
+    handler: Callable[[List[Any]], Awaitable[List[Any]]]
+) -> AsyncBatcher:
+    """
+    获取端点对应的批处理器（不存在则创建）
+
+    Args:
+        endpoint: 端点名称
+        handler: 批量处理回调
+
+    Returns:
+        AsyncBatcher: 批处理器
+    """
+    batcher = _batchers.get(endpoint)
+    if batcher is None:
+        batcher = AsyncBatcher(
+            handler,
+            batch_window_ms=TAAS_BATCH_WINDOW_MS,
+            max_batch_size=TAAS_MAX_BATCH_SIZE
+        )
+        _batchers[endpoint] = batcher
+    return batcher
+
+
+async def close_batchers() -> None:
+    """关闭所有批处理器（应用关闭时调用）"""
+    for batcher in _batchers.values():
+        await batcher.close()
+    _batchers.clear()
@@ -0,0 +1,42 @@
+"""
+API 内部传输对象
+
+调查报告中的嵌套结构只由内部Agent结果组装、从不从外部JSON反序列化，
+使用 slots dataclass 代替 Pydantic 模型，省去中间对象的校验和实例字典；
+响应出口处由 response_model 统一校验一次。
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+
+@dataclass(slots=True, frozen=True)
+class SourceInfo:
+    """信源信息"""
+    source_name: str
+    source_type: str
+    first_appearance: str
+    confidence: float
+
+
+@dataclass(slots=True, frozen=True)
+class VerificationDetail:
+    """核查详情"""
+    claim: str
+    status: str
+    evidence: List[Dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass(slots=True, frozen=True)
+class VerificationSummary:
+    """核查摘要"""
+    claims_verified: int
+    overall_status: str
+    details: List[VerificationDetail]
+
+
+@dataclass(slots=True, frozen=True)
+class NarrativeEvolution:
+    """叙事演变"""
+    versions_analyzed: int
+    evolution_detected: List[Dict[str, Any]]
+    suspicious_accounts: List[Dict[str, Any]]
@@ -3,13 +3,23 @@ FastAPI 主应用
 
 NEWS GT - AI 新闻真相认知引擎
 """
+import asyncio
+import os
 from datetime import datetime
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
+from brotli_asgi import BrotliMiddleware
+from prometheus_client import CollectorRegistry, make_asgi_app, multiprocess
 
 from .routes import investigation_router, taas_router
+from .routes.investigation import orchestrator
+from .batcher import close_batchers
 from .schemas import HealthCheckResponse
+from ..agents.source_hunter import load_ner
+from ..database import init_database, close_database
+from ..tasks import close_arq_pool
+from ..utils.batcher import http_batcher
 
 # 创建FastAPI应用
 app = FastAPI(
@@ -17,7 +27,9 @@ app = FastAPI(
     description="AI 新闻真相认知引擎 - Truth-as-a-Service",
     version="0.1.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    # orjson 直接输出bytes，比标准库json快数倍
+    default_response_class=ORJSONResponse
 )
 
 # CORS配置（生产环境需要限制）
@@ -29,11 +41,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 响应压缩（事件图谱、核查结果等较大的JSON），小响应不压缩
+app.add_middleware(BrotliMiddleware, quality=4, minimum_size=1024)
+
 # 注册路由
 app.include_router(investigation_router)
 app.include_router(taas_router)
 
 
+def _metrics_app():
+    """
+    Prometheus 指标端点
+
+    指标计数器是进程内的；多 worker 部署时各进程把指标写入 PROMETHEUS_MULTIPROC_DIR，
+    这里汇总全部 worker，否则每次抓取只能拿到随机一个 worker 的数值。
+
+    Returns:
+        ASGI 应用
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return make_asgi_app(registry=registry)
+    return make_asgi_app()
+
+
+# Prometheus 指标（缓存命中率等）
+app.mount("/metrics", _metrics_app())
+
+
 # ============================================
 # 基础端点
 # ============================================
@@ -76,7 +112,7 @@ async def health_check() -> HealthCheckResponse:
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """全局异常处理"""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
@@ -93,9 +129,17 @@ async def global_exception_handler(request, exc):
 async def startup_event():
     """应用启动时执行"""
     print("🚀 NEWS GT API starting...")
-    # TODO: 初始化数据库连接
-    # TODO: 初始化EKG
+    # 初始化数据库连接（EKG Repository共享其会话工厂）
+    await init_database()
     # TODO: 初始化缓存
+
+    # 启动时生成OpenAPI文档（所有路由已注册），避免首次访问 /docs 的冷启动开销
+    app.openapi_schema = app.openapi()
+
+    # 后台预热NER模型（与溯源Agent配置的模型一致），不阻塞启动，首个请求也无需等待加载
+    app.state.ner_warmup = asyncio.create_task(
+        asyncio.to_thread(load_ner, orchestrator.source_hunter.ner_model)
+    )
     print("✅ NEWS GT API started successfully")
 
 
@@ -103,8 +147,11 @@ async def startup_event():
 async def shutdown_event():
     """应用关闭时执行"""
     print("🛑 NEWS GT API shutting down...")
-    # TODO: 关闭数据库连接
     # TODO: 清理资源
+    await close_batchers()
+    await close_arq_pool()
+    await http_batcher.close()
+    await close_database()
     print("✅ NEWS GT API shut down successfully")
 
 
@@ -113,12 +160,31 @@ async def shutdown_event():
 # ============================================
 
 if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
     import uvicorn
 
+    # DEV=1 时启用热重载（单进程），否则按生产配置启动多worker
+    dev_mode = os.environ.get("DEV") == "1"
+    workers = 1 if dev_mode else int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1))
+
+    # 多 worker 时指标经共享目录汇总（worker 进程继承该环境变量），启动前清除上次运行遗留的文件
+    if workers > 1:
+        metrics_dir = Path(os.environ.setdefault(
+            "PROMETHEUS_MULTIPROC_DIR", tempfile.mkdtemp(prefix="news_gt_metrics_")
+        ))
+        metrics_dir.mkdir(parents=True, exist_ok=True)
+        for stale in metrics_dir.glob("*.db"):
+            stale.unlink()
+
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,  # 开发模式热重载
+        loop="uvloop",  # libuv事件循环，比默认asyncio循环更快
+        http="httptools",  # C实现的HTTP解析器
+        workers=workers,
+        reload=dev_mode,  # 仅开发模式热重载
         log_level="info"
     )
@@ -1,17 +1,31 @@
 """
 调查相关 API 路由
 """
-from typing import Dict, Any
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
+import base64
+import hashlib
+import secrets
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+import msgspec
+import orjson
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse
+from redis.exceptions import RedisError
 
 from ..schemas import (
     InvestigationSubmission,
+    InvestigationSubmissionTrusted,
     InvestigationResponse,
     InvestigationResult,
     ErrorResponse
 )
+from ...ekg import EKGGraphOps, EKGRepository, ekg_repo, get_ekg_repo
 from ...orchestrator import InvestigationOrchestrator
+from ...tasks import enqueue_investigation
+from ...utils import get_logger, settings
+
+logger = get_logger(__name__)
 
 router = APIRouter(
     prefix="/api/v1/investigation",
@@ -20,47 +34,86 @@ router = APIRouter(
 
 # TODO: 初始化Orchestrator（实际应用中从依赖注入获取）
 orchestrator = InvestigationOrchestrator()
+graph_ops = EKGGraphOps(ekg_repo)
+
+# 事件图谱允许下游缓存的时间（秒）
+GRAPH_CACHE_MAX_AGE = 30
+
+# 任务队列不可用时建议客户端重试的间隔（秒）
+QUEUE_RETRY_AFTER = 5
+
+# 批量导入单次最多提交的条数
+MAX_BATCH_SIZE = 100
+
+
+def verify_internal_key(
+    internal_key: Optional[str] = Header(None, alias="X-Internal-Key")
+) -> None:
+    """
+    验证内部接口访问密钥（FastAPI依赖）
+
+    Args:
+        internal_key: 访问密钥（X-Internal-Key 请求头）
+
+    Raises:
+        HTTPException: 未配置 INTERNAL_API_KEY 或密钥不匹配（403）
+    """
+    expected = settings.internal_api_key
+    if not expected or not internal_key or not secrets.compare_digest(internal_key, expected):
+        raise HTTPException(status_code=403, detail="Internal API key required")
 
 
 @router.post(
     "/submit",
     response_model=InvestigationResponse,
+    response_class=ORJSONResponse,
+    status_code=202,
     summary="提交调查请求",
     description="用户提交新闻链接或事件描述，启动调查流程"
 )
 async def submit_investigation(
-    submission: InvestigationSubmission,
-    background_tasks: BackgroundTasks
-) -> InvestigationResponse:
+    submission: InvestigationSubmission
+) -> ORJSONResponse:
     """
     提交调查请求
 
-    接受用户提交的链接或文本，立即返回调查ID，
-    然后在后台异步执行调查流程。
+    接受用户提交的链接或文本，立即返回调查ID（202 Accepted），
+    调查流程由arq worker在后台执行；任务队列不可用时返回 503，由客户端稍后重试
+    （调查状态只保存在Redis中，队列不可用时进程内执行的结果无法被查询）。
 
     Args:
         submission: 调查提交数据
-        background_tasks: FastAPI后台任务
 
     Returns:
-        InvestigationResponse: 包含调查ID和状态
+        ORJSONResponse: 包含调查ID和状态
     """
     try:
-        # TODO: 实现异步调查
-        # 当前为同步演示
-        result = await orchestrator.start_investigation(
-            submission=submission.submission,
-            submission_type=submission.submission_type
-        )
+        # ID在入队前生成，响应只需等待入队
+        investigation_id = orchestrator.generate_investigation_id()
 
-        investigation_id = result.get("investigation_id")
+        try:
+            await enqueue_investigation(
+                investigation_id,
+                submission.submission,
+                submission.submission_type
+            )
+        except (RedisError, OSError) as e:
+            logger.warning(f"Task queue unavailable, rejecting {investigation_id}: {e}")
+            raise HTTPException(
+                status_code=503,
+                detail="Investigation queue unavailable, please retry later",
+                headers={"Retry-After": str(QUEUE_RETRY_AFTER)}
+            )
 
-        return InvestigationResponse(
+        response = InvestigationResponse(
             investigation_id=investigation_id,
             status="pending",
             message="Investigation started successfully"
         )
+        return ORJSONResponse(status_code=202, content=response.model_dump(mode="json"))
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -68,6 +121,124 @@ async def submit_investigation(
         )
 
 
+@router.post(
+    "/batch",
+    response_model=List[InvestigationResponse],
+    response_class=ORJSONResponse,
+    status_code=202,
+    summary="批量提交调查请求",
+    description="内部批量导入接口（可信调用方，需 X-Internal-Key），跳过提交内容校验",
+    dependencies=[Depends(verify_internal_key)]
+)
+async def submit_investigation_batch(
+    submissions: List[InvestigationSubmissionTrusted] = Body(..., min_length=1, max_length=MAX_BATCH_SIZE)
+) -> ORJSONResponse:
+    """
+    批量提交调查请求
+
+    Args:
+        submissions: 调查提交数据列表（最多 MAX_BATCH_SIZE 条）
+
+    Returns:
+        ORJSONResponse: 每条提交对应的调查ID和状态；任务队列中途不可用时返回 503，
+        附带已入队的调查ID和首个未入队提交的下标（客户端只需重试剩余部分）
+    """
+    responses = []
+    try:
+        for index, submission in enumerate(submissions):
+            investigation_id = orchestrator.generate_investigation_id()
+            try:
+                await enqueue_investigation(
+                    investigation_id,
+                    submission.submission,
+                    submission.submission_type
+                )
+            except (RedisError, OSError) as e:
+                logger.warning(
+                    f"Task queue unavailable after {index}/{len(submissions)} batch submissions: {e}"
+                )
+                return ORJSONResponse(
+                    status_code=503,
+                    headers={"Retry-After": str(QUEUE_RETRY_AFTER)},
+                    content={
+                        "detail": "Investigation queue unavailable, please retry the remaining submissions",
+                        "investigations": responses,
+                        "remaining_from": index
+                    }
+                )
+
+            responses.append({
+                "investigation_id": investigation_id,
+                "status": "pending",
+                "message": "Investigation started successfully"
+            })
+
+        return ORJSONResponse(status_code=202, content=responses)
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to start investigations: {str(e)}"
+        )
+
+
+@router.get(
+    "/events/{event_id}/graph",
+    summary="获取事件图谱",
+    description="获取事件的节点和边（用于可视化），支持 ETag / If-None-Match"
+)
+async def get_event_graph(event_id: str, request: Request) -> Response:
+    """
+    获取事件图谱
+
+    图谱只序列化一次，ETag取序列化结果的摘要；客户端缓存未变化时返回304。
+
+    Args:
+        event_id: 事件ID
+        request: 当前请求
+
+    Returns:
+        Response: 图谱JSON
+    """
+    graph = await graph_ops.generate_event_graph(event_id)
+    payload = orjson.dumps(graph)
+
+    # 弱校验器：摘要基于未压缩的JSON，经 BrotliMiddleware 压缩后线上表示不同，不能用强ETag
+    etag = f'W/"{hashlib.blake2b(payload, digest_size=16).hexdigest()}"'
+    headers = {
+        "Cache-Control": f"public, max-age={GRAPH_CACHE_MAX_AGE}",
+        "ETag": etag
+    }
+
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=payload, media_type="application/json", headers=headers)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match 弱比较（RFC 9110 §13.1.2）：支持 "*" 和逗号分隔的多个ETag，忽略 W/ 前缀
+
+    Args:
+        if_none_match: If-None-Match 请求头
+        etag: 当前表示的ETag
+
+    Returns:
+        bool: 是否匹配
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
 @router.get(
     "/{investigation_id}",
     response_model=InvestigationResult,
@@ -85,8 +256,7 @@ async def get_investigation_result(investigation_id: str) -> InvestigationResult
         InvestigationResult: 调查结果（包含报告）
     """
     try:
-        # TODO: 从数据库或缓存查询结果
-        # 当前为演示数据
+        # 由后台worker写入Redis
         result = await orchestrator.get_investigation_status(investigation_id)
 
         if result.get("status") == "unknown":
@@ -95,6 +265,10 @@ async def get_investigation_result(investigation_id: str) -> InvestigationResult
                 detail=f"Investigation {investigation_id} not found"
             )
 
+        # 未完成的调查没有报告，直接返回当前状态
+        if result.get("status") != "completed":
+            return ORJSONResponse(content=result)
+
         return result
 
     except HTTPException:
@@ -149,25 +323,64 @@ async def cancel_investigation(investigation_id: str) -> Dict[str, str]:
     description="获取所有调查的列表（支持分页和过滤）"
 )
 async def list_investigations(
-    status: str = None,
-    limit: int = 10,
-    offset: int = 0
+    status: Optional[str] = None,
+    after: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=100),
+    repo: EKGRepository = Depends(get_ekg_repo)
 ) -> Dict[str, Any]:
     """
-    获取调查列表
+    获取调查列表（游标分页）
 
     Args:
-        status: 过滤状态（pending/completed/failed）
-        limit: 返回数量
-        offset: 偏移量
+        status: 过滤状态（completed/failed）
+        after: 上一页返回的 next_cursor
+        limit: 返回数量（1-100）
+        repo: EKG数据访问层
 
     Returns:
-        dict: 调查列表
+        dict: 调查列表和下一页游标
     """
-    # TODO: 实现数据库查询
+    try:
+        cursor = _decode_cursor(after) if after else None
+    except (ValueError, msgspec.DecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    investigations = await repo.list_investigations(
+        status=status,
+        after=cursor,
+        limit=limit
+    )
+
+    next_cursor = None
+    if len(investigations) == limit:
+        last = investigations[-1]
+        next_cursor = _encode_cursor(last.completed_at, last.id)
+
     return {
-        "total": 0,
         "limit": limit,
-        "offset": offset,
-        "investigations": []
+        "investigations": [
+            {
+                "investigation_id": h.investigation_id,
+                "event_id": h.event_id,
+                "status": h.status,
+                "credibility_score": h.credibility_score,
+                "started_at": h.started_at.isoformat(),
+                "completed_at": h.completed_at.isoformat()
+            }
+            for h in investigations
+        ],
+        "next_cursor": next_cursor
     }
+
+
+def _encode_cursor(completed_at: datetime, row_id: int) -> str:
+    """分页游标编码：base64(msgpack((completed_at, id)))"""
+    return base64.urlsafe_b64encode(msgspec.msgpack.encode((completed_at, row_id))).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """分页游标解码"""
+    return msgspec.msgpack.decode(
+        base64.urlsafe_b64decode(cursor.encode()),
+        type=Tuple[datetime, int]
+    )
@@ -3,8 +3,14 @@ TaaS (Truth-as-a-Service) API 路由
 
 提供溯源能力的API服务，供外部系统集成
 """
-from typing import Dict, Any, List
-from fastapi import APIRouter, HTTPException, Header
+import bisect
+import hashlib
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, HTTPException, Header, Request
+from fastapi.responses import ORJSONResponse
 
 from ..schemas import (
     TaaSSourceCheckRequest,
@@ -14,38 +20,120 @@ from ..schemas import (
     TaaSFactCheckRequest,
     TaaSFactCheckResponse
 )
+from ..batcher import get_batcher
+from .investigation import orchestrator
+from ...utils.cache import cached, source_cache_key
 
-router = APIRouter(
-    prefix="/api/v1/taas",
-    tags=["taas"]
-)
+# 信源信誉缓存时间（秒）：信誉分变化缓慢，且写入时会主动失效
+SOURCE_CHECK_CACHE_TTL = 300
+
+# 并发到达的单条请求在窗口内合并，对EKG/LLM只发起一次批量调用
+fact_check_batcher = get_batcher("fact_check", orchestrator.batch_fact_check)
+source_check_batcher = get_batcher("source_check", orchestrator.batch_source_check)
+
+# 分数 -> 等级 查找表：风险分用 bisect_left（超过阈值才升档），信誉分用 bisect_right（达到阈值即升档）
+_RISK_THRESHOLDS = (40.0, 70.0)
+_RISK_LEVELS = ("low", "medium", "high")
+_REPUTATION_THRESHOLDS = (30, 70)
+_REPUTATION_LEVELS = ("low", "medium", "high")
+
+# API Key 校验结果的进程内缓存：blake2b-128摘要 -> (是否有效, 租户ID)
+# 缓存摘要而非原始密钥，避免在内存中长期驻留密钥字符串
+API_KEY_CACHE_TTL = 60
+API_KEY_CACHE_SIZE = 10_000
+_api_key_cache: TTLCache = TTLCache(maxsize=API_KEY_CACHE_SIZE, ttl=API_KEY_CACHE_TTL)
+
+
+@dataclass(frozen=True, slots=True)
+class TenantCtx:
+    """API Key 解析出的租户上下文"""
+    tenant_id: str
+
+
+def _hash_api_key(api_key: str) -> bytes:
+    """API Key 摘要（blake2b-128）"""
+    return hashlib.blake2b(api_key.encode(), digest_size=16).digest()
+
+
+def _verify_api_key_db(key_hash: bytes) -> Tuple[bool, str]:
+    """
+    从数据库验证API密钥
+
+    Args:
+        key_hash: API Key 摘要
+
+    Returns:
+        tuple: (是否有效, 租户ID)
+    """
+    # TODO: 按摘要从数据库查询API Key
+    return True, "default"
 
 
-# TODO: 实现API Key验证
-def verify_api_key(api_key: str = Header(..., alias="X-API-Key")) -> bool:
+async def verify_api_key(
+    request: Request,
+    api_key: str = Header(..., alias="X-API-Key")
+) -> TenantCtx:
     """
-    验证API密钥
+    验证API密钥（FastAPI依赖，命中缓存时不访问数据库）
+
+    同一请求内FastAPI只调用一次，解析出的租户挂到 request.state.tenant。
 
     Args:
-        api_key: API密钥
+        request: 当前请求
+        api_key: API密钥（X-API-Key 请求头）
 
     Returns:
-        bool: 是否有效
+        TenantCtx: 租户上下文
+
+    Raises:
+        HTTPException: API密钥无效（401）
     """
-    # TODO: 从数据库验证API Key
-    return True
+    key_hash = _hash_api_key(api_key)
+    result = _api_key_cache.get(key_hash)
+    if result is None:
+        result = _verify_api_key_db(key_hash)
+        _api_key_cache[key_hash] = result
+
+    valid, tenant_id = result
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid API key")
+
+    ctx = TenantCtx(tenant_id=tenant_id)
+    request.state.tenant = ctx
+    return ctx
+
+
+def invalidate_api_key(api_key: Optional[str] = None) -> None:
+    """
+    吊销API Key时清除校验缓存
+
+    Args:
+        api_key: 需要失效的API Key（为空则清空全部缓存）
+    """
+    if api_key is None:
+        _api_key_cache.clear()
+    else:
+        _api_key_cache.pop(_hash_api_key(api_key), None)
+
+
+# 路由级依赖：所有TaaS端点都需要API Key（同时写入OpenAPI文档）
+router = APIRouter(
+    prefix="/api/v1/taas",
+    tags=["taas"],
+    dependencies=[Depends(verify_api_key)]
+)
 
 
 @router.post(
     "/source/check",
     response_model=TaaSSourceCheckResponse,
+    response_class=ORJSONResponse,
     summary="信源信誉查询",
     description="查询信源的历史信誉和统计数据"
 )
 async def check_source(
-    request: TaaSSourceCheckRequest,
-    api_key: str = Header(..., alias="X-API-Key")
-) -> TaaSSourceCheckResponse:
+    request: TaaSSourceCheckRequest
+) -> ORJSONResponse:
     """
     查询信源信誉（TaaS核心功能）
 
@@ -54,46 +142,64 @@ async def check_source(
 
     Args:
         request: 信源查询请求
-        api_key: API密钥
 
     Returns:
-        TaaSSourceCheckResponse: 信源信誉数据
+        ORJSONResponse: 信源信誉数据
     """
-    if not verify_api_key(api_key):
-        raise HTTPException(status_code=401, detail="Invalid API key")
+    response = await _lookup_source_reputation(request.source_name)
+    return ORJSONResponse(content=response.model_dump(mode="json"))
 
-    # TODO: 从EKG查询信源数据
-    # 框架示例
-    source_name = request.source_name
 
-    # 模拟EKG查询
-    # source_data = ekg_repo.query_source_reputation(source_name)
+@cached(
+    ttl=SOURCE_CHECK_CACHE_TTL,
+    key=lambda source_name: source_cache_key(source_name),
+    model=TaaSSourceCheckResponse
+)
+async def _lookup_source_reputation(source_name: str) -> TaaSSourceCheckResponse:
+    """
+    查询信源信誉（带Redis缓存）
+
+    Args:
+        source_name: 信源名称
 
-    # 演示数据
+    Returns:
+        TaaSSourceCheckResponse: 信源信誉数据
+    """
+    source_data: Optional[Dict[str, Any]] = await source_check_batcher.submit(source_name)
+
+    if source_data is None:
+        return TaaSSourceCheckResponse(source_name=source_name, exists=False)
+
+    credit_score = source_data["credit_score"]
     return TaaSSourceCheckResponse(
         source_name=source_name,
         exists=True,
-        credit_score=25,
-        reputation="low",
-        statistics={
-            "total_claims": 10,
-            "verified_claims": 2,
-            "refuted_claims": 6,
-            "accuracy_rate": 20.0
-        }
+        credit_score=credit_score,
+        reputation=_reputation_level(credit_score),
+        statistics=source_data["statistics"]
     )
 
 
+def _reputation_level(credit_score: int) -> str:
+    """信誉分 -> 信誉等级（与信誉分调整的30/70阈值一致）"""
+    return _REPUTATION_LEVELS[bisect.bisect_right(_REPUTATION_THRESHOLDS, credit_score)]
+
+
+def risk_level_for(risk_score: float) -> str:
+    """风险分 -> 风险等级（>70 high，>40 medium，其余 low）"""
+    return _RISK_LEVELS[bisect.bisect_left(_RISK_THRESHOLDS, risk_score)]
+
+
 @router.post(
     "/risk/score",
     response_model=TaaSRiskScoreResponse,
+    response_class=ORJSONResponse,
     summary="实时传言风险评分",
     description="对传言文本进行风险评分，用于金融交易等场景的预警"
 )
 async def calculate_risk_score(
-    request: TaaSRiskScoreRequest,
-    api_key: str = Header(..., alias="X-API-Key")
-) -> TaaSRiskScoreResponse:
+    request: TaaSRiskScoreRequest
+) -> ORJSONResponse:
     """
     计算传言风险评分（TaaS核心功能）
 
@@ -102,14 +208,10 @@ async def calculate_risk_score(
 
     Args:
         request: 风险评分请求
-        api_key: API密钥
 
     Returns:
-        TaaSRiskScoreResponse: 风险评分
+        ORJSONResponse: 风险评分
     """
-    if not verify_api_key(api_key):
-        raise HTTPException(status_code=401, detail="Invalid API key")
-
     text = request.text
     source = request.source
 
@@ -127,26 +229,27 @@ async def calculate_risk_score(
         "类似传言曾被证伪"
     ]
 
-    risk_level = "high" if risk_score > 70 else "medium" if risk_score > 40 else "low"
+    risk_level = risk_level_for(risk_score)
 
-    return TaaSRiskScoreResponse(
+    response = TaaSRiskScoreResponse(
         risk_score=risk_score,
         risk_level=risk_level,
         factors=risk_factors,
         recommendation="高度存疑，建议等待官方确认"
     )
+    return ORJSONResponse(content=response.model_dump(mode="json"))
 
 
 @router.post(
     "/fact/check",
     response_model=TaaSFactCheckResponse,
+    response_class=ORJSONResponse,
     summary="事实核查",
     description="对单个声明进行事实核查"
 )
 async def check_fact(
-    request: TaaSFactCheckRequest,
-    api_key: str = Header(..., alias="X-API-Key")
-) -> TaaSFactCheckResponse:
+    request: TaaSFactCheckRequest
+) -> ORJSONResponse:
     """
     事实核查（TaaS核心功能）
 
@@ -155,36 +258,29 @@ async def check_fact(
 
     Args:
         request: 事实核查请求
-        api_key: API密钥
 
     Returns:
-        TaaSFactCheckResponse: 核查结果
+        ORJSONResponse: 核查结果
     """
-    if not verify_api_key(api_key):
-        raise HTTPException(status_code=401, detail="Invalid API key")
-
     claim = request.claim
     entities = request.entities or []
 
-    # TODO: 实现事实核查
     # 1. 在EKG中查找历史核查记录
     # 2. 如果没有，调用VerifierAgent进行核查
-    # 3. 返回结果并更新EKG
+    # 同一窗口内的请求合并为一次批量查询/核查
+    # TODO: 返回结果并更新EKG
+    result = await fact_check_batcher.submit((claim, entities))
 
-    # 框架示例
-    return TaaSFactCheckResponse(
+    evidence = result.get("evidence", [])
+    response = TaaSFactCheckResponse(
         claim=claim,
-        status="refuted",
-        confidence=0.9,
-        evidence=[
-            {
-                "source": "SEC EDGAR",
-                "finding": "未找到相关披露文件",
-                "url": "https://www.sec.gov/..."
-            }
-        ],
-        summary="在SEC官方数据库中未找到该交易的披露文件"
+        status=result["status"],
+        confidence=result.get("confidence", 0.0),
+        evidence=evidence,
+        # EKG 历史结论中的证据为数据库存储的 dict，不保证含 finding 字段
+        summary=evidence[0].get("finding", "") if evidence else ""
     )
+    return ORJSONResponse(content=response.model_dump(mode="json"))
 
 
 @router.get(
@@ -192,21 +288,13 @@ async def check_fact(
     summary="获取TaaS统计",
     description="获取API使用统计和系统状态"
 )
-async def get_taas_stats(
-    api_key: str = Header(..., alias="X-API-Key")
-) -> Dict[str, Any]:
+async def get_taas_stats() -> Dict[str, Any]:
     """
     获取TaaS统计
 
-    Args:
-        api_key: API密钥
-
     Returns:
         dict: 统计数据
     """
-    if not verify_api_key(api_key):
-        raise HTTPException(status_code=401, detail="Invalid API key")
-
     # TODO: 从数据库查询统计
     return {
         "total_requests": 0,
@@ -222,22 +310,17 @@ async def get_taas_stats(
     description="获取当前热门的信源列表"
 )
 async def get_trending_sources(
-    limit: int = 10,
-    api_key: str = Header(..., alias="X-API-Key")
+    limit: int = 10
 ) -> Dict[str, List[Dict[str, Any]]]:
     """
     获取热门信源
 
     Args:
         limit: 返回数量
-        api_key: API密钥
 
     Returns:
         dict: 热门信源列表
     """
-    if not verify_api_key(api_key):
-        raise HTTPException(status_code=401, detail="Invalid API key")
-
     # TODO: 从EKG查询热门信源
     return {
         "trending_sources": []
@@ -1,17 +1,30 @@
 """
 API 数据模型 (Pydantic Schemas)
 
-定义API的请求和响应模型
+定义API的请求和响应模型（响应模型只构造不修改，统一 frozen）
 """
+import re
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from .dto import SourceInfo, VerificationSummary, NarrativeEvolution
+
+# 提交内容校验：预编译正则，热路径上不做URL解析
+SUBMISSION_MAX_LENGTH = 4096
+_SUBMISSION_RE = re.compile(r"^(?:https?://|\S)")
 
 
 # ============================================
 # 用户提交相关
 # ============================================
 
+INVESTIGATION_SUBMISSION_EXAMPLE = {
+    "submission": "https://example.com/news/breaking-story",
+    "submission_type": "url"
+}
+
+
 class InvestigationSubmission(BaseModel):
     """用户提交调查请求"""
     submission: str = Field(..., description="新闻链接或事件描述")
@@ -20,13 +33,32 @@ class InvestigationSubmission(BaseModel):
         description="提交类型: url 或 text"
     )
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "submission": "https://example.com/news/breaking-story",
-                "submission_type": "url"
-            }
-        }
+    model_config = ConfigDict(json_schema_extra={"example": INVESTIGATION_SUBMISSION_EXAMPLE})
+
+    @field_validator("submission")
+    @classmethod
+    def check_submission(cls, v: str) -> str:
+        """长度和格式检查（链接或非空白开头的文本）"""
+        if len(v) >= SUBMISSION_MAX_LENGTH:
+            raise ValueError(f"submission must be shorter than {SUBMISSION_MAX_LENGTH} characters")
+        if not _SUBMISSION_RE.match(v):
+            raise ValueError("submission must be a URL or non-blank text")
+        return v
+
+
+class InvestigationSubmissionTrusted(BaseModel):
+    """内部批量导入的调查请求（可信调用方，不做字段校验）"""
+    model_config = ConfigDict(extra="ignore")
+
+    submission: str
+    submission_type: str = "url"
+
+
+INVESTIGATION_RESPONSE_EXAMPLE = {
+    "investigation_id": "E-12345678",
+    "status": "pending",
+    "message": "Investigation started successfully"
+}
 
 
 class InvestigationResponse(BaseModel):
@@ -35,51 +67,17 @@ class InvestigationResponse(BaseModel):
     status: str = Field(..., description="调查状态")
     message: str = Field(default="Investigation started", description="消息")
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "investigation_id": "E-12345678",
-                "status": "pending",
-                "message": "Investigation started successfully"
-            }
-        }
+    model_config = ConfigDict(frozen=True, json_schema_extra={"example": INVESTIGATION_RESPONSE_EXAMPLE})
 
 
 # ============================================
 # 调查报告相关
 # ============================================
 
-class SourceInfo(BaseModel):
-    """信源信息"""
-    source_name: str
-    source_type: str
-    first_appearance: str
-    confidence: float
-
-
-class VerificationDetail(BaseModel):
-    """核查详情"""
-    claim: str
-    status: str
-    evidence: List[Dict[str, Any]] = []
-
-
-class VerificationSummary(BaseModel):
-    """核查摘要"""
-    claims_verified: int
-    overall_status: str
-    details: List[VerificationDetail]
-
-
-class NarrativeEvolution(BaseModel):
-    """叙事演变"""
-    versions_analyzed: int
-    evolution_detected: List[Dict[str, Any]]
-    suspicious_accounts: List[Dict[str, Any]]
-
-
 class InvestigationReport(BaseModel):
     """完整调查报告"""
+    model_config = ConfigDict(frozen=True)
+
     investigation_id: str
     timestamp: str
     user_submission: str
@@ -98,6 +96,18 @@ class InvestigationReport(BaseModel):
     recommendation: str
 
 
+INVESTIGATION_RESULT_EXAMPLE = {
+    "investigation_id": "E-12345678",
+    "status": "completed",
+    "credibility_score": 35.5,
+    "report": {
+        "investigation_id": "E-12345678",
+        "timestamp": "2024-01-01T12:00:00",
+        "summary": "信息最早来自 @UnknownSource。发现 2 项声明存在证伪证据。"
+    }
+}
+
+
 class InvestigationResult(BaseModel):
     """调查结果（完整）"""
     investigation_id: str
@@ -106,35 +116,37 @@ class InvestigationResult(BaseModel):
     credibility_score: float
     agent_results: List[Dict[str, Any]] = []
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "investigation_id": "E-12345678",
-                "status": "completed",
-                "credibility_score": 35.5,
-                "report": {
-                    "investigation_id": "E-12345678",
-                    "timestamp": "2024-01-01T12:00:00",
-                    "summary": "信息最早来自 @UnknownSource。发现 2 项声明存在证伪证据。"
-                }
-            }
-        }
+    model_config = ConfigDict(frozen=True, json_schema_extra={"example": INVESTIGATION_RESULT_EXAMPLE})
 
 
 # ============================================
 # TaaS API 相关
 # ============================================
 
+TAAS_SOURCE_CHECK_REQUEST_EXAMPLE = {
+    "source_name": "@TechInsider"
+}
+
+
 class TaaSSourceCheckRequest(BaseModel):
     """信源检查请求"""
     source_name: str = Field(..., description="信源名称")
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "source_name": "@TechInsider"
-            }
-        }
+    model_config = ConfigDict(json_schema_extra={"example": TAAS_SOURCE_CHECK_REQUEST_EXAMPLE})
+
+
+TAAS_SOURCE_CHECK_RESPONSE_EXAMPLE = {
+    "source_name": "@TechInsider",
+    "exists": True,
+    "credit_score": 25,
+    "reputation": "low",
+    "statistics": {
+        "total_claims": 10,
+        "verified_claims": 2,
+        "refuted_claims": 6,
+        "accuracy_rate": 20.0
+    }
+}
 
 
 class TaaSSourceCheckResponse(BaseModel):
@@ -145,21 +157,13 @@ class TaaSSourceCheckResponse(BaseModel):
     reputation: Optional[str] = None
     statistics: Optional[Dict[str, Any]] = None
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "source_name": "@TechInsider",
-                "exists": True,
-                "credit_score": 25,
-                "reputation": "low",
-                "statistics": {
-                    "total_claims": 10,
-                    "verified_claims": 2,
-                    "refuted_claims": 6,
-                    "accuracy_rate": 20.0
-                }
-            }
-        }
+    model_config = ConfigDict(frozen=True, json_schema_extra={"example": TAAS_SOURCE_CHECK_RESPONSE_EXAMPLE})
+
+
+TAAS_RISK_SCORE_REQUEST_EXAMPLE = {
+    "text": "OpenAI投资AMD 1000亿美元",
+    "source": "@TechInsider"
+}
 
 
 class TaaSRiskScoreRequest(BaseModel):
@@ -167,13 +171,19 @@ class TaaSRiskScoreRequest(BaseModel):
     text: str = Field(..., description="待评估文本")
     source: Optional[str] = Field(None, description="信源（如果已知）")
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "text": "OpenAI投资AMD 1000亿美元",
-                "source": "@TechInsider"
-            }
-        }
+    model_config = ConfigDict(json_schema_extra={"example": TAAS_RISK_SCORE_REQUEST_EXAMPLE})
+
+
+TAAS_RISK_SCORE_RESPONSE_EXAMPLE = {
+    "risk_score": 75.5,
+    "risk_level": "high",
+    "factors": [
+        "信源历史准确率仅18%",
+        "未找到官方证据",
+        "类似传言曾被证伪"
+    ],
+    "recommendation": "高度存疑，建议等待官方确认"
+}
 
 
 class TaaSRiskScoreResponse(BaseModel):
@@ -183,19 +193,13 @@ class TaaSRiskScoreResponse(BaseModel):
     factors: List[str] = Field(default=[], description="风险因素")
     recommendation: str = Field(..., description="建议")
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "risk_score": 75.5,
-                "risk_level": "high",
-                "factors": [
-                    "信源历史准确率仅18%",
-                    "未找到官方证据",
-                    "类似传言曾被证伪"
-                ],
-                "recommendation": "高度存疑，建议等待官方确认"
-            }
-        }
+    model_config = ConfigDict(frozen=True, json_schema_extra={"example": TAAS_RISK_SCORE_RESPONSE_EXAMPLE})
+
+
+TAAS_FACT_CHECK_REQUEST_EXAMPLE = {
+    "claim": "OpenAI将于Q2收购AMD",
+    "entities": ["OpenAI", "AMD"]
+}
 
 
 class TaaSFactCheckRequest(BaseModel):
@@ -203,13 +207,22 @@ class TaaSFactCheckRequest(BaseModel):
     claim: str = Field(..., description="待核查的声明")
     entities: Optional[List[str]] = Field(None, description="涉及的实体")
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "claim": "OpenAI将于Q2收购AMD",
-                "entities": ["OpenAI", "AMD"]
-            }
+    model_config = ConfigDict(json_schema_extra={"example": TAAS_FACT_CHECK_REQUEST_EXAMPLE})
+
+
+TAAS_FACT_CHECK_RESPONSE_EXAMPLE = {
+    "claim": "OpenAI将于Q2收购AMD",
+    "status": "refuted",
+    "confidence": 0.9,
+    "evidence": [
+        {
+            "source": "SEC EDGAR",
+            "finding": "未找到相关披露文件",
+            "url": "https://www.sec.gov/..."
         }
+    ],
+    "summary": "在SEC官方数据库中未找到该交易的披露文件"
+}
 
 
 class TaaSFactCheckResponse(BaseModel):
@@ -220,22 +233,7 @@ class TaaSFactCheckResponse(BaseModel):
     evidence: List[Dict[str, str]] = Field(default=[], description="证据列表")
     summary: str
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "claim": "OpenAI将于Q2收购AMD",
-                "status": "refuted",
-                "confidence": 0.9,
-                "evidence": [
-                    {
-                        "source": "SEC EDGAR",
-                        "finding": "未找到相关披露文件",
-                        "url": "https://www.sec.gov/..."
-                    }
-                ],
-                "summary": "在SEC官方数据库中未找到该交易的披露文件"
-            }
-        }
+    model_config = ConfigDict(frozen=True, json_schema_extra={"example": TAAS_FACT_CHECK_RESPONSE_EXAMPLE})
 
 
 # ============================================
@@ -244,6 +242,8 @@ class TaaSFactCheckResponse(BaseModel):
 
 class ErrorResponse(BaseModel):
     """错误响应"""
+    model_config = ConfigDict(frozen=True)
+
     error: str
     detail: Optional[str] = None
     investigation_id: Optional[str] = None
@@ -251,6 +251,8 @@ class ErrorResponse(BaseModel):
 
 class HealthCheckResponse(BaseModel):
     """健康检查响应"""
+    model_config = ConfigDict(frozen=True)
+
     status: str
     version: str
     timestamp: str
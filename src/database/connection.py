@@ -1,20 +1,35 @@
 """
 数据库连接管理
 
-提供SQLAlchemy数据库连接和会话管理
+提供SQLAlchemy异步数据库连接和会话管理（asyncpg驱动）
 """
-from typing import Generator
-from contextlib import contextmanager
-
-from sqlalchemy import create_engine, event
-from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import QueuePool
+import asyncio
+import time
+import uuid
+from typing import AsyncGenerator, Optional
+from contextlib import asynccontextmanager
+
+from sqlalchemy import event, exc, text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine
+)
 
 from ..utils import settings, get_logger
 from ..ekg.models import Base
+from .migrations import upgrade_schema
 
 logger = get_logger(__name__)
 
+# 连接最长存活时间（秒），超过后由连接池丢弃重建
+POOL_RECYCLE_SECONDS = 1800
+# 空闲超过该时间（秒）的连接在取出时才ping一次
+STALE_CONNECTION_SECONDS = 60
+# SQL编译缓存容量（仓储层语句重复度高，编译一次后复用）
+COMPILED_CACHE_SIZE = 1200
+
 
 class DatabaseManager:
     """
@@ -23,10 +38,34 @@ class DatabaseManager:
     """
 
     def __init__(self):
-        self.engine = None
-        self.SessionLocal = None
+        self.engine: Optional[AsyncEngine] = None
+        self.SessionLocal: Optional[async_sessionmaker[AsyncSession]] = None
         self._initialized = False
 
+    @staticmethod
+    def _async_url(url: str) -> str:
+        """将 postgresql:// 连接串转换为 asyncpg 驱动"""
+        if url.startswith("postgresql://"):
+            return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+        return url
+
+    @staticmethod
+    def _connect_args() -> dict:
+        """
+        asyncpg 连接参数
+
+        PgBouncer transaction 模式下同一会话的语句可能落到不同后端连接，
+        需关闭预编译语句缓存，并使用唯一语句名避免冲突。
+        """
+        if not settings.database_pgbouncer:
+            return {}
+
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+
     def initialize(self):
         """初始化数据库连接"""
         if self._initialized:
@@ -34,13 +73,17 @@ class DatabaseManager:
             return
 
         try:
-            # 创建引擎
-            self.engine = create_engine(
-                settings.database_url,
-                poolclass=QueuePool,
+            # 创建异步引擎（查询不再阻塞事件循环）
+            self.engine = create_async_engine(
+                self._async_url(settings.database_url),
                 pool_size=settings.database_pool_size,
                 max_overflow=settings.database_max_overflow,
-                pool_pre_ping=True,  # 连接前ping确保连接可用
+                pool_recycle=POOL_RECYCLE_SECONDS,  # 定期回收，替代每次取出都ping
+                pool_pre_ping=False,  # 存活检查由 checkout 监听器按空闲时长进行
+                query_cache_size=COMPILED_CACHE_SIZE,
+                use_insertmanyvalues=True,
+                insertmanyvalues_page_size=settings.database_insertmanyvalues_page_size,  # 批量INSERT每页行数
+                connect_args=self._connect_args(),
                 echo=settings.debug,  # 开发环境打印SQL
             )
 
@@ -48,10 +91,12 @@ class DatabaseManager:
             self._register_event_listeners()
 
             # 创建SessionLocal
-            self.SessionLocal = sessionmaker(
-                autocommit=False,
+            # expire_on_commit=False：提交后仍可访问属性，避免异步上下文中的隐式刷新
+            self.SessionLocal = async_sessionmaker(
+                bind=self.engine,
+                class_=AsyncSession,
                 autoflush=False,
-                bind=self.engine
+                expire_on_commit=False
             )
 
             self._initialized = True
@@ -62,31 +107,66 @@ class DatabaseManager:
             raise
 
     def _register_event_listeners(self):
-        """注册数据库事件监听器"""
+        """注册数据库事件监听器（异步引擎的事件挂在其同步代理上）"""
+        sync_engine = self.engine.sync_engine
 
-        @event.listens_for(self.engine, "connect")
+        @event.listens_for(sync_engine, "connect")
         def receive_connect(dbapi_conn, connection_record):
             """连接建立时的回调"""
+            connection_record.info["last_use"] = time.monotonic()
             logger.debug("Database connection established")
 
-        @event.listens_for(self.engine, "checkout")
+        @event.listens_for(sync_engine, "checkout")
         def receive_checkout(dbapi_conn, connection_record, connection_proxy):
-            """从连接池获取连接时的回调"""
+            """从连接池获取连接时的回调：只对空闲过久的连接做存活检查"""
+            idle = time.monotonic() - connection_record.info.get("last_use", 0)
+            if idle > STALE_CONNECTION_SECONDS:
+                cursor = dbapi_conn.cursor()
+                try:
+                    cursor.execute("SELECT 1")
+                except Exception as e:
+                    # 连接池会丢弃该连接并重新获取
+                    raise exc.DisconnectionError(f"Stale connection: {e}") from e
+                finally:
+                    cursor.close()
             logger.debug("Connection checked out from pool")
 
-    def create_tables(self):
+        @event.listens_for(sync_engine, "checkin")
+        def receive_checkin(dbapi_conn, connection_record):
+            """连接归还连接池时记录使用时间"""
+            connection_record.info["last_use"] = time.monotonic()
+
+    async def warm_pool(self):
+        """预热连接池：启动时建立 pool_size 个连接，首批请求无需等待建连"""
+        if not self._initialized:
+            raise RuntimeError("Database not initialized")
+
+        conns = [self.engine.connect() for _ in range(settings.database_pool_size)]
+        try:
+            await asyncio.gather(*(conn.start() for conn in conns))
+        finally:
+            for conn in conns:
+                await conn.close()
+        logger.info(f"Database pool warmed with {len(conns)} connections")
+
+    async def create_tables(self):
         """创建所有表"""
         if not self._initialized:
             raise RuntimeError("Database not initialized")
 
         try:
-            Base.metadata.create_all(bind=self.engine)
+            async with self.engine.begin() as conn:
+                # 三元组索引依赖 pg_trgm 扩展
+                await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                await conn.run_sync(Base.metadata.create_all)
+                # create_all 不修改已存在的表：补齐新增列、索引和触发器
+                await upgrade_schema(conn)
             logger.info("Database tables created successfully")
         except Exception as e:
             logger.error(f"Failed to create tables: {e}")
             raise
 
-    def drop_tables(self):
+    async def drop_tables(self):
         """删除所有表（危险操作，仅用于开发）"""
         if settings.is_production():
             raise RuntimeError("Cannot drop tables in production environment")
@@ -95,52 +175,52 @@ class DatabaseManager:
             raise RuntimeError("Database not initialized")
 
         try:
-            Base.metadata.drop_all(bind=self.engine)
+            async with self.engine.begin() as conn:
+                await conn.run_sync(Base.metadata.drop_all)
             logger.warning("Database tables dropped")
         except Exception as e:
             logger.error(f"Failed to drop tables: {e}")
             raise
 
-    def get_session(self) -> Session:
+    def get_session(self) -> AsyncSession:
         """
         获取数据库会话
 
         Returns:
-            Session: SQLAlchemy会话
+            AsyncSession: SQLAlchemy异步会话
         """
         if not self._initialized:
             raise RuntimeError("Database not initialized")
 
         return self.SessionLocal()
 
-    @contextmanager
-    def session_scope(self) -> Generator[Session, None, None]:
+    @asynccontextmanager
+    async def session_scope(self) -> AsyncGenerator[AsyncSession, None]:
         """
         提供事务性会话上下文管理器
 
         Usage:
-            with db_manager.session_scope() as session:
-                session.query(...)
-                session.commit()
+            async with db_manager.session_scope() as session:
+                await session.execute(select(...))
 
         Yields:
-            Session: SQLAlchemy会话
+            AsyncSession: SQLAlchemy异步会话
         """
         session = self.get_session()
         try:
             yield session
-            session.commit()
+            await session.commit()
         except Exception as e:
-            session.rollback()
+            await session.rollback()
             logger.error(f"Session rollback due to error: {e}")
             raise
         finally:
-            session.close()
+            await session.close()
 
-    def close(self):
+    async def close(self):
         """关闭数据库连接"""
         if self.engine:
-            self.engine.dispose()
+            await self.engine.dispose()
             logger.info("Database connections closed")
             self._initialized = False
 
@@ -149,39 +229,37 @@ class DatabaseManager:
 db_manager = DatabaseManager()
 
 
-def get_db() -> Generator[Session, None, None]:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     FastAPI 依赖注入函数
 
     Usage:
         @app.get("/items")
-        def read_items(db: Session = Depends(get_db)):
-            return db.query(Item).all()
+        async def read_items(db: AsyncSession = Depends(get_db)):
+            return (await db.execute(select(Item))).scalars().all()
 
     Yields:
-        Session: SQLAlchemy会话
+        AsyncSession: SQLAlchemy异步会话
     """
-    session = db_manager.get_session()
-    try:
+    async with db_manager.get_session() as session:
         yield session
-    finally:
-        session.close()
 
 
-def init_database():
+async def init_database():
     """
     初始化数据库（应用启动时调用）
 
     初始化数据库连接并创建表
     """
     db_manager.initialize()
-    db_manager.create_tables()
+    await db_manager.create_tables()
+    await db_manager.warm_pool()
     logger.info("Database initialization completed")
 
 
-def close_database():
+async def close_database():
     """
     关闭数据库（应用关闭时调用）
     """
-    db_manager.close()
+    await db_manager.close()
     logger.info("Database closed")
@@ -0,0 +1,237 @@
+"""
+数据库结构升级
+
+Base.metadata.create_all 只创建缺失的表，不会修改已存在的表，也不会为已存在的表
+触发 after_create 事件（触发器）。这里的语句在 create_all 之后执行，
+把已部署数据库升级到当前模型结构；每条语句都是幂等的，新库上执行为空操作。
+"""
+from typing import Tuple
+
+from sqlalchemy import DDL, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from ..ekg.models import CLAIM_REFUTATION_COUNTS_DDL
+from ..utils import get_logger
+
+logger = get_logger(__name__)
+
+
+# ============================================
+# 列类型：JSON -> JSONB，timestamp -> timestamptz，content_hash -> bytea
+# ============================================
+
+# 原 JSON 列
+JSONB_COLUMNS = (
+    ("sources", "metadata"),
+    ("events", "tags"),
+    ("events", "metadata"),
+    ("claims", "verification_result"),
+    ("claims", "entities"),
+    ("claims", "metadata"),
+    ("entities", "metadata"),
+    ("artifacts", "metadata"),
+    ("claim_refutations", "evidence"),
+    ("investigation_history", "report"),
+)
+
+# 原 timestamp（无时区）列；旧值由 datetime.utcnow 写入，按 UTC 解释；(表, 列, 是否由数据库生成默认值)
+TIMESTAMPTZ_COLUMNS = (
+    ("sources", "created_at", True),
+    ("sources", "updated_at", True),
+    ("events", "created_at", True),
+    ("events", "updated_at", True),
+    ("claims", "timestamp", True),
+    ("claims", "created_at", True),
+    ("entities", "created_at", True),
+    ("entities", "updated_at", True),
+    ("artifacts", "captured_at", True),
+    ("artifacts", "created_at", True),
+    ("claim_refutations", "created_at", True),
+    ("investigation_history", "started_at", False),
+    ("investigation_history", "completed_at", True),
+)
+
+
+def _column_list(columns) -> str:
+    return ", ".join(f"('{table}', '{column}')" for table, column, *_ in columns)
+
+
+def _convert_columns(data_type: str, columns, alter: str) -> str:
+    """
+    逐列转换类型的 DO 块（只处理仍为旧类型的列）
+
+    Args:
+        data_type: 旧类型（information_schema.columns.data_type）
+        columns: (表, 列, ...) 列表
+        alter: ALTER 语句模板，{t} / {c} 为表名 / 列名（以 quote_ident 拼接）
+
+    Returns:
+        str: DO 块
+    """
+    statement = "'" + (
+        alter.replace("'", "''")
+        .replace("{t}", "' || quote_ident(col.table_name) || '")
+        .replace("{c}", "' || quote_ident(col.column_name) || '")
+    ) + "'"
+    return f"""
+        DO $$
+        DECLARE col record;
+        BEGIN
+            FOR col IN
+                SELECT table_name, column_name FROM information_schema.columns
+                WHERE table_schema = current_schema()
+                  AND data_type = '{data_type}'
+                  AND (table_name, column_name) IN ({_column_list(columns)})
+            LOOP
+                EXECUTE {statement};
+            END LOOP;
+        END $$
+    """
+
+
+COLUMN_TYPE_DDL = (
+    _convert_columns(
+        "json", JSONB_COLUMNS,
+        "ALTER TABLE {t} ALTER COLUMN {c} TYPE jsonb USING {c}::jsonb"
+    ),
+    _convert_columns(
+        "timestamp without time zone", TIMESTAMPTZ_COLUMNS,
+        "ALTER TABLE {t} ALTER COLUMN {c} TYPE timestamptz USING {c} AT TIME ZONE 'UTC'"
+    ),
+    *(
+        f'ALTER TABLE {table} ALTER COLUMN "{column}" SET DEFAULT now()'
+        for table, column, server_default in TIMESTAMPTZ_COLUMNS if server_default
+    ),
+    # 原十六进制字符串摘要 -> 原始 32 字节 SHA-256
+    """
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_schema = current_schema() AND table_name = 'artifacts'
+                  AND column_name = 'content_hash' AND data_type = 'character varying'
+            ) THEN
+                ALTER TABLE artifacts ALTER COLUMN content_hash TYPE bytea USING decode(content_hash, 'hex');
+            END IF;
+        END $$
+    """,
+)
+
+
+# ============================================
+# 新增列
+# ============================================
+
+COLUMN_DDL = (
+    """
+        ALTER TABLE sources ADD COLUMN IF NOT EXISTS accuracy_rate numeric GENERATED ALWAYS AS (
+            CASE WHEN total_claims > 0 THEN verified_claims::numeric / total_claims * 100 ELSE 0 END
+        ) STORED
+    """,
+    """
+        ALTER TABLE claims ADD COLUMN IF NOT EXISTS text_tsv tsvector
+            GENERATED ALWAYS AS (to_tsvector('simple', text)) STORED
+    """,
+    # 证伪计数：新增列时按现有证伪关系回填
+    """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_schema = current_schema() AND table_name = 'claims'
+                  AND column_name = 'refuted_count'
+            ) THEN
+                ALTER TABLE claims
+                    ADD COLUMN refuted_count integer NOT NULL DEFAULT 0,
+                    ADD COLUMN refuting_count integer NOT NULL DEFAULT 0;
+                UPDATE claims c SET
+                    refuted_count = (SELECT count(*) FROM claim_refutations r WHERE r.refuted_claim_id = c.id),
+                    refuting_count = (SELECT count(*) FROM claim_refutations r WHERE r.refuting_claim_id = c.id);
+            END IF;
+        END $$
+    """,
+)
+
+
+# ============================================
+# 索引
+# ============================================
+
+INDEX_DDL = (
+    "CREATE INDEX IF NOT EXISTS ix_sources_accuracy_total ON sources (accuracy_rate DESC, total_claims DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_sources_total_claims ON sources (total_claims DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_events_tags_gin ON events USING gin (tags)",
+    "CREATE INDEX IF NOT EXISTS ix_events_metadata_gin ON events USING gin (metadata jsonb_path_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_claims_event_timestamp ON claims (event_id, \"timestamp\")",
+    "CREATE INDEX IF NOT EXISTS ix_claims_event_status ON claims (event_id, status)",
+    "CREATE INDEX IF NOT EXISTS ix_claims_source_id ON claims (source_id)",
+    "CREATE INDEX IF NOT EXISTS ix_claims_text_tsv ON claims USING gin (text_tsv)",
+    "CREATE INDEX IF NOT EXISTS ix_claims_text_md5 ON claims (md5(text))",
+    "CREATE INDEX IF NOT EXISTS ix_claims_entities_gin ON claims USING gin (entities)",
+    "CREATE INDEX IF NOT EXISTS ix_entities_name_trgm ON entities USING gin (lower(name) gin_trgm_ops)",
+)
+
+
+# ============================================
+# 调查历史：状态列、非空完成时间（keyset 分页键）及索引
+# ============================================
+
+INVESTIGATION_HISTORY_DDL = (
+    "ALTER TABLE investigation_history ADD COLUMN IF NOT EXISTS status varchar(32) NOT NULL DEFAULT 'completed'",
+    "UPDATE investigation_history SET completed_at = started_at WHERE completed_at IS NULL",
+    "ALTER TABLE investigation_history ALTER COLUMN completed_at SET NOT NULL",
+    """
+        CREATE INDEX IF NOT EXISTS ix_investigation_history_status_completed
+        ON investigation_history (status, completed_at DESC, id DESC)
+    """,
+    """
+        CREATE INDEX IF NOT EXISTS ix_invhist_low_cred
+        ON investigation_history (completed_at DESC) WHERE credibility_score < 50
+    """,
+)
+
+
+# ============================================
+# 触发器
+# ============================================
+
+# 函数本身可重复 CREATE OR REPLACE，触发器只在不存在时创建
+TRIGGER_DDL = (
+    CLAIM_REFUTATION_COUNTS_DDL[0],
+    """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM pg_trigger
+                WHERE tgname = 'trg_claim_refutation_counts'
+                  AND tgrelid = 'claim_refutations'::regclass
+            ) THEN
+                CREATE TRIGGER trg_claim_refutation_counts
+                AFTER INSERT OR DELETE ON claim_refutations
+                FOR EACH ROW EXECUTE FUNCTION claim_refutation_counts();
+            END IF;
+        END $$
+    """,
+)
+
+
+# 按顺序执行（新增列先于依赖它们的索引）
+SCHEMA_UPGRADE_DDL: Tuple = (
+    *COLUMN_TYPE_DDL,
+    *COLUMN_DDL,
+    *INDEX_DDL,
+    *INVESTIGATION_HISTORY_DDL,
+    *TRIGGER_DDL,
+)
+
+
+async def upgrade_schema(conn: AsyncConnection) -> None:
+    """
+    将已存在的表升级到当前模型结构（幂等）
+
+    Args:
+        conn: 事务中的数据库连接（在 create_all 之后调用）
+    """
+    for statement in SCHEMA_UPGRADE_DDL:
+        await conn.execute(statement if isinstance(statement, DDL) else text(statement))
+    logger.info(f"Schema upgrade applied ({len(SCHEMA_UPGRADE_DDL)} statements)")
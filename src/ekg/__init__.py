@@ -1,7 +1,7 @@
 """
 EKG (Event Knowledge Graph) 模块
 
-导出数据模型、数据访问层和图操作
+导出数据模型、传输对象、数据访问层和图操作
 """
 from .models import (
     Base,
@@ -10,7 +10,8 @@ from .models import (
     SourceType, EventStatus, ClaimStatus
 )
 
-from .repository import EKGRepository
+from .dto import ClaimDTO
+from .repository import EKGRepository, ekg_repo, get_ekg_repo
 from .graph_ops import EKGGraphOps
 
 __all__ = [
@@ -29,8 +30,13 @@ __all__ = [
     "EventStatus",
     "ClaimStatus",
 
+    # 传输对象
+    "ClaimDTO",
+
     # 数据访问
     "EKGRepository",
+    "ekg_repo",
+    "get_ekg_repo",
 
     # 图操作
     "EKGGraphOps",
@@ -0,0 +1,19 @@
+"""
+EKG 内部传输对象 (DTO)
+
+Repository -> Orchestrator/路由 之间传递的只读数据，使用 msgspec.Struct
+（slots布局，构造和JSON编码均远快于Pydantic），只在API边界转换为响应模型。
+"""
+from typing import Optional
+
+import msgspec
+
+
+class ClaimDTO(msgspec.Struct, frozen=True):
+    """声明及其信源（事件图谱等只读场景）"""
+    id: int
+    text: str
+    status: str
+    source_id: Optional[int] = None
+    source_name: Optional[str] = None
+    credit_score: Optional[int] = None
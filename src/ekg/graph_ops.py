@@ -3,11 +3,13 @@ EKG 图操作 (Graph Operations)
 
 提供高级图查询和分析功能
 """
-from typing import Dict, Any, List, Optional, Set, Tuple
+from typing import Dict, Any, List, Optional, Sequence, Set, Tuple
 from collections import defaultdict, deque
 
+import numpy as np
+
 from .repository import EKGRepository
-from .models import Source, Event, Claim
+from .models import Source, Event, Claim, ClaimStatus
 
 
 class EKGGraphOps:
@@ -121,7 +123,7 @@ class EKGGraphOps:
     # 统计和聚合
     # ============================================
 
-    def calculate_event_credibility(
+    async def calculate_event_credibility(
         self,
         event_id: str
     ) -> Dict[str, Any]:
@@ -134,23 +136,66 @@ class EKGGraphOps:
         Returns:
             dict: 可信度分析
         """
-        event = self.repo.get_event(event_id)
+        event = await self.repo.get_event(event_id)
         if not event:
             return {"error": "Event not found"}
 
-        claims = self.repo.get_claims_by_event(event_id)
+        # 统计声明状态（一次聚合查询）
+        stats = await self.repo.aggregate_event_credibility(event_id)
+        return self.score_credibility(stats)
+
+    @staticmethod
+    def aggregate_claim_rows(rows: Sequence[Tuple[Any, Optional[float]]]) -> Dict[str, Any]:
+        """
+        在内存中聚合声明统计（NumPy向量化）
+
+        用于数据已在Python中的场景（如离线分析），结果与
+        EKGRepository.aggregate_event_credibility 同构，可直接传给 score_credibility。
+
+        Args:
+            rows: (声明状态, 信源信誉分) 列表，信誉分可为None
+
+        Returns:
+            dict: 声明总数、已验证数、已证伪数、信源平均信誉分
+        """
+        n = len(rows)
+        statuses = np.asarray([getattr(status, "value", status) for status, _ in rows], dtype="U16")
+        scores = np.fromiter(
+            (np.nan if score is None else score for _, score in rows),
+            dtype=np.float32,
+            count=n
+        )
+        has_score = ~np.isnan(scores)
+
+        return {
+            "total_claims": n,
+            "verified_claims": int(np.count_nonzero(statuses == ClaimStatus.VERIFIED.value)),
+            "refuted_claims": int(np.count_nonzero(statuses == ClaimStatus.REFUTED.value)),
+            "avg_source_score": float(scores[has_score].mean()) if has_score.any() else None
+        }
+
+    @staticmethod
+    def score_credibility(stats: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        根据声明统计计算可信度
 
-        if not claims:
+        Args:
+            stats: 声明总数、已验证数、已证伪数、信源平均信誉分
+
+        Returns:
+            dict: 可信度分析
+        """
+        total = stats["total_claims"]
+
+        if not total:
             return {
                 "credibility_score": 50.0,
                 "confidence": "low",
                 "reason": "No claims to verify"
             }
 
-        # 统计声明状态
-        verified_count = sum(1 for c in claims if c.status.value == "verified")
-        refuted_count = sum(1 for c in claims if c.status.value == "refuted")
-        total = len(claims)
+        verified_count = stats["verified_claims"]
+        refuted_count = stats["refuted_claims"]
 
         # 计算可信度
         score = 50.0  # 基准
@@ -158,13 +203,8 @@ class EKGGraphOps:
         score -= (refuted_count / total) * 40   # 已证伪降低分数
 
         # 考虑信源信誉
-        source_scores = []
-        for claim in claims:
-            if claim.source:
-                source_scores.append(claim.source.credit_score)
-
-        if source_scores:
-            avg_source_score = sum(source_scores) / len(source_scores)
+        avg_source_score = stats["avg_source_score"]
+        if avg_source_score is not None:
             score = score * 0.7 + avg_source_score * 0.3  # 加权
 
         return {
@@ -200,7 +240,7 @@ class EKGGraphOps:
     # 可视化数据生成
     # ============================================
 
-    def generate_event_graph(
+    async def generate_event_graph(
         self,
         event_id: str
     ) -> Dict[str, Any]:
@@ -213,65 +253,65 @@ class EKGGraphOps:
         Returns:
             dict: 图谱数据（节点和边）
         """
-        event = self.repo.get_event(event_id)
+        event = await self.repo.get_event(event_id)
         if not event:
             return {"nodes": [], "edges": []}
 
-        claims = self.repo.get_claims_by_event(event_id)
-
-        nodes = []
-        edges = []
+        claims = await self.repo.get_claim_dtos_by_event(event_id)
 
         # 事件节点
-        nodes.append({
+        nodes = [{
             "id": event.id,
             "type": "event",
             "label": event.title or event.id,
             "credibility": event.credibility_score
-        })
+        }]
 
-        # 声明节点
-        for claim in claims:
-            nodes.append({
-                "id": f"claim-{claim.id}",
+        # 声明节点与事件-声明边
+        claim_node_ids = [f"claim-{claim.id}" for claim in claims]
+        nodes.extend(
+            {
+                "id": node_id,
                 "type": "claim",
                 "label": claim.text[:50] + "...",
-                "status": claim.status.value
-            })
-
-            # 事件-声明边
-            edges.append({
-                "from": event.id,
-                "to": f"claim-{claim.id}",
-                "type": "has_claim"
-            })
-
-            # 信源节点
-            if claim.source:
-                source_node_id = f"source-{claim.source.id}"
-
-                # 检查是否已添加
-                if not any(n["id"] == source_node_id for n in nodes):
-                    nodes.append({
-                        "id": source_node_id,
-                        "type": "source",
-                        "label": claim.source.name,
-                        "credit_score": claim.source.credit_score
-                    })
-
-                # 信源-声明边
-                edges.append({
-                    "from": source_node_id,
-                    "to": f"claim-{claim.id}",
-                    "type": "made_claim"
+                "status": claim.status
+            }
+            for node_id, claim in zip(claim_node_ids, claims)
+        )
+        edges = [
+            {"from": event.id, "to": node_id, "type": "has_claim"}
+            for node_id in claim_node_ids
+        ]
+
+        # 信源节点（按信源ID去重）与信源-声明边
+        seen_sources: Set[int] = set()
+        source_nodes = []
+        source_edges = []
+        for node_id, claim in zip(claim_node_ids, claims):
+            source_id = claim.source_id
+            if source_id is None:
+                continue
+
+            source_node_id = f"source-{source_id}"
+            if source_id not in seen_sources:
+                seen_sources.add(source_id)
+                source_nodes.append({
+                    "id": source_node_id,
+                    "type": "source",
+                    "label": claim.source_name,
+                    "credit_score": claim.credit_score
                 })
+            source_edges.append({"from": source_node_id, "to": node_id, "type": "made_claim"})
+
+        nodes.extend(source_nodes)
+        edges.extend(source_edges)
 
         return {
             "nodes": nodes,
             "edges": edges
         }
 
-    def generate_propagation_timeline(
+    async def generate_propagation_timeline(
         self,
         event_id: str
     ) -> List[Dict[str, Any]]:
@@ -284,29 +324,24 @@ class EKGGraphOps:
         Returns:
             list: 时间线数据
         """
-        claims = self.repo.get_claims_by_event(event_id)
-
-        # 按时间排序
-        timeline = sorted(
-            [
-                {
-                    "timestamp": claim.timestamp.isoformat(),
-                    "source": claim.source.name if claim.source else "Unknown",
-                    "claim": claim.text[:100],
-                    "status": claim.status.value
-                }
-                for claim in claims
-            ],
-            key=lambda x: x["timestamp"]
-        )
-
-        return timeline
+        # 数据库已按时间排序并格式化时间戳
+        rows = await self.repo.get_claims_timeline(event_id)
+
+        return [
+            {
+                "timestamp": timestamp,
+                "source": source_name or "Unknown",
+                "claim": text,
+                "status": status.value
+            }
+            for timestamp, source_name, text, status in rows
+        ]
 
     # ============================================
     # 批量操作
     # ============================================
 
-    def batch_update_source_scores(
+    async def batch_update_source_scores(
         self,
         investigation_results: List[Dict[str, Any]]
     ) -> int:
@@ -319,14 +354,10 @@ class EKGGraphOps:
         Returns:
             int: 更新数量
         """
-        updated = 0
-
-        for result in investigation_results:
-            source_id = result.get("source_id")
-            score_change = result.get("score_change")
-
-            if source_id and score_change is not None:
-                if self.repo.update_source_credit_score(source_id, score_change):
-                    updated += 1
+        pairs = [
+            (result["source_id"], result["score_change"])
+            for result in investigation_results
+            if result.get("source_id") and result.get("score_change") is not None
+        ]
 
-        return updated
+        return await self.repo.bulk_update_source_scores(pairs)
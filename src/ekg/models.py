@@ -8,12 +8,20 @@ from typing import List, Optional
 from enum import Enum
 
 from sqlalchemy import (
-    Column, Integer, String, Float, DateTime, Text, ForeignKey, JSON, Enum as SQLEnum
+    DDL, Computed, Integer, LargeBinary, Numeric, String, Float, DateTime, Text, ForeignKey,
+    Index, Enum as SQLEnum, event, func
 )
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
-Base = declarative_base()
+from ..utils.config import settings
+
+
+class Base(DeclarativeBase):
+    """模型基类（2.0 声明式映射）"""
+
+# 非调试环境下关系禁止懒加载：意外的逐条查询（N+1）直接报错，需显式 selectinload
+RELATIONSHIP_LAZY = "select" if settings.debug else "raise"
 
 
 # ============================================
@@ -58,29 +66,47 @@ class Source(Base):
     """
     __tablename__ = 'sources'
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    name = Column(String(255), unique=True, nullable=False, index=True)
-    type = Column(SQLEnum(SourceType), nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(String(255), unique=True, index=True)
+    type: Mapped[SourceType] = mapped_column(SQLEnum(SourceType))
 
     # 核心指标：信誉分（0-100）
-    credit_score = Column(Integer, default=50, nullable=False)
+    credit_score: Mapped[int] = mapped_column(Integer, default=50)
 
-    # 元数据
-    url = Column(String(512), nullable=True)
-    description = Column(Text, nullable=True)
-    metadata = Column(JSON, default=dict)
+    # 元数据（属性名 meta，避免遮蔽 Base.metadata；列名保持 metadata）
+    url: Mapped[Optional[str]] = mapped_column(String(512))
+    description: Mapped[Optional[str]] = mapped_column(Text)
+    meta: Mapped[Optional[dict]] = mapped_column("metadata", JSONB, default=dict)
 
     # 统计数据
-    total_claims = Column(Integer, default=0)
-    verified_claims = Column(Integer, default=0)
-    refuted_claims = Column(Integer, default=0)
+    total_claims: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    verified_claims: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    refuted_claims: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+
+    # 准确率（%，数据库生成列）
+    accuracy_rate: Mapped[Optional[float]] = mapped_column(
+        Numeric(asdecimal=False),
+        Computed(
+            "CASE WHEN total_claims > 0 THEN verified_claims::numeric / total_claims * 100 ELSE 0 END",
+            persisted=True
+        )
+    )
 
     # 时间戳
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
 
     # 关系
-    claims = relationship("Claim", back_populates="source")
+    claims: Mapped[List["Claim"]] = relationship(back_populates="source", lazy=RELATIONSHIP_LAZY)
+
+    __table_args__ = (
+        # 准确率排行
+        Index("ix_sources_accuracy_total", accuracy_rate.column.desc(), total_claims.column.desc()),
+        # 热门信源 Top-N
+        Index("ix_sources_total_claims", total_claims.column.desc()),
+    )
 
     def __repr__(self):
         return f"<Source(name='{self.name}', type='{self.type.value}', credit={self.credit_score})>"
@@ -93,30 +119,42 @@ class Event(Base):
     """
     __tablename__ = 'events'
 
-    id = Column(String(64), primary_key=True)  # E-xxxxxxxx
-    status = Column(SQLEnum(EventStatus), nullable=False, default=EventStatus.DEVELOPING)
+    id: Mapped[str] = mapped_column(String(64), primary_key=True)  # E-xxxxxxxxxxxx
+    status: Mapped[EventStatus] = mapped_column(SQLEnum(EventStatus), default=EventStatus.DEVELOPING)
 
     # 核心信息
-    title = Column(String(512), nullable=True)
-    description = Column(Text, nullable=True)
+    title: Mapped[Optional[str]] = mapped_column(String(512))
+    description: Mapped[Optional[str]] = mapped_column(Text)
 
     # 评分
-    credibility_score = Column(Float, default=50.0)
-    heat_score = Column(Float, default=0.0)
+    credibility_score: Mapped[Optional[float]] = mapped_column(Float, default=50.0)
+    heat_score: Mapped[Optional[float]] = mapped_column(Float, default=0.0)
 
     # 标签和分类
-    tags = Column(JSON, default=list)  # ["金融", "科技"]
-    category = Column(String(64), nullable=True)
+    tags: Mapped[Optional[list]] = mapped_column(JSONB, default=list)  # ["金融", "科技"]
+    category: Mapped[Optional[str]] = mapped_column(String(64))
 
     # 元数据
-    metadata = Column(JSON, default=dict)
+    meta: Mapped[Optional[dict]] = mapped_column("metadata", JSONB, default=dict)
 
     # 时间戳
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
 
     # 关系
-    claims = relationship("Claim", back_populates="event")
+    claims: Mapped[List["Claim"]] = relationship(back_populates="event", lazy=RELATIONSHIP_LAZY)
+
+    __table_args__ = (
+        # 标签 / 元数据包含查询（@>、?|）
+        Index("ix_events_tags_gin", "tags", postgresql_using="gin"),
+        Index(
+            "ix_events_metadata_gin", "metadata",
+            postgresql_using="gin",
+            postgresql_ops={"metadata": "jsonb_path_ops"}
+        ),
+    )
 
     def __repr__(self):
         return f"<Event(id='{self.id}', status='{self.status.value}')>"
@@ -129,29 +167,53 @@ class Claim(Base):
     """
     __tablename__ = 'claims'
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    text = Column(Text, nullable=False)
-    status = Column(SQLEnum(ClaimStatus), nullable=False, default=ClaimStatus.PENDING)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    text: Mapped[str] = mapped_column(Text)
+    status: Mapped[ClaimStatus] = mapped_column(SQLEnum(ClaimStatus), default=ClaimStatus.PENDING)
+
+    # 全文检索向量（数据库生成列）
+    text_tsv: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR, Computed("to_tsvector('simple', text)", persisted=True)
+    )
 
     # 外键
-    event_id = Column(String(64), ForeignKey('events.id'), nullable=True)
-    source_id = Column(Integer, ForeignKey('sources.id'), nullable=False)
+    event_id: Mapped[Optional[str]] = mapped_column(String(64), ForeignKey('events.id'))
+    source_id: Mapped[int] = mapped_column(Integer, ForeignKey('sources.id'))
 
     # 核查结果
-    verification_result = Column(JSON, default=dict)  # 存储详细核查结果
+    verification_result: Mapped[Optional[dict]] = mapped_column(JSONB, default=dict)  # 存储详细核查结果
+
+    # 证伪关系计数（由 claim_refutations 上的触发器维护）
+    refuted_count: Mapped[int] = mapped_column(Integer, server_default="0")
+    refuting_count: Mapped[int] = mapped_column(Integer, server_default="0")
 
     # 元数据
-    claim_type = Column(String(64), nullable=True)  # financial, temporal, etc.
-    entities = Column(JSON, default=list)  # 提及的实体
-    metadata = Column(JSON, default=dict)
+    claim_type: Mapped[Optional[str]] = mapped_column(String(64))  # financial, temporal, etc.
+    entities: Mapped[Optional[list]] = mapped_column(JSONB, default=list)  # 提及的实体
+    meta: Mapped[Optional[dict]] = mapped_column("metadata", JSONB, default=dict)
 
     # 时间戳
-    timestamp = Column(DateTime, default=datetime.utcnow)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    timestamp: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     # 关系
-    event = relationship("Event", back_populates="claims")
-    source = relationship("Source", back_populates="claims")
+    event: Mapped[Optional["Event"]] = relationship(back_populates="claims", lazy=RELATIONSHIP_LAZY)
+    source: Mapped["Source"] = relationship(back_populates="claims", lazy=RELATIONSHIP_LAZY)
+
+    __table_args__ = (
+        # 事件时间线：按事件过滤，按时间排序
+        Index("ix_claims_event_timestamp", "event_id", "timestamp"),
+        # 按事件（及状态）过滤声明
+        Index("ix_claims_event_status", "event_id", "status"),
+        # 信源 JOIN / 统计
+        Index("ix_claims_source_id", "source_id"),
+        # 声明全文检索
+        Index("ix_claims_text_tsv", "text_tsv", postgresql_using="gin"),
+        # 按原文精确查找（TEXT 列过长不适合直接建B树索引）
+        Index("ix_claims_text_md5", func.md5(text.column)),
+        # 按提及实体过滤
+        Index("ix_claims_entities_gin", "entities", postgresql_using="gin"),
+    )
 
     def __repr__(self):
         return f"<Claim(id={self.id}, status='{self.status.value}', text='{self.text[:50]}...')>"
@@ -164,17 +226,29 @@ class Entity(Base):
     """
     __tablename__ = 'entities'
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    name = Column(String(255), unique=True, nullable=False, index=True)
-    type = Column(String(64), nullable=False)  # person, organization, location
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(String(255), unique=True, index=True)
+    type: Mapped[str] = mapped_column(String(64))  # person, organization, location
 
     # 元数据
-    description = Column(Text, nullable=True)
-    metadata = Column(JSON, default=dict)
+    description: Mapped[Optional[str]] = mapped_column(Text)
+    meta: Mapped[Optional[dict]] = mapped_column("metadata", JSONB, default=dict)
 
     # 时间戳
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    __table_args__ = (
+        # 实体名模糊匹配（pg_trgm）：lower(name) % :q
+        Index(
+            "ix_entities_name_trgm",
+            func.lower(name.column).label("name_lower"),
+            postgresql_using="gin",
+            postgresql_ops={"name_lower": "gin_trgm_ops"}
+        ),
+    )
 
     def __repr__(self):
         return f"<Entity(name='{self.name}', type='{self.type}')>"
@@ -187,20 +261,21 @@ class Artifact(Base):
     """
     __tablename__ = 'artifacts'
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    type = Column(String(64), nullable=False)  # url, tweet, document, image
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    type: Mapped[str] = mapped_column(String(64))  # url, tweet, document, image
 
     # 标识符
-    url = Column(String(1024), nullable=True)
-    content_hash = Column(String(128), nullable=True, index=True)
+    url: Mapped[Optional[str]] = mapped_column(String(1024))
+    # 原始 SHA-256 摘要（hashlib.sha256(...).digest()）
+    content_hash: Mapped[Optional[bytes]] = mapped_column(LargeBinary(32), index=True)
 
     # 内容
-    content = Column(Text, nullable=True)
-    metadata = Column(JSON, default=dict)
+    content: Mapped[Optional[str]] = mapped_column(Text)
+    meta: Mapped[Optional[dict]] = mapped_column("metadata", JSONB, default=dict)
 
     # 时间戳
-    captured_at = Column(DateTime, default=datetime.utcnow)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    captured_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     def __repr__(self):
         return f"<Artifact(type='{self.type}', url='{self.url}')>"
@@ -217,25 +292,53 @@ class ClaimRefutation(Base):
     """
     __tablename__ = 'claim_refutations'
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
 
     # 声明A证伪声明B
-    refuting_claim_id = Column(Integer, ForeignKey('claims.id'), nullable=False)
-    refuted_claim_id = Column(Integer, ForeignKey('claims.id'), nullable=False)
+    refuting_claim_id: Mapped[int] = mapped_column(Integer, ForeignKey('claims.id'))
+    refuted_claim_id: Mapped[int] = mapped_column(Integer, ForeignKey('claims.id'))
 
     # 证伪强度（0-1）
-    confidence = Column(Float, default=1.0)
+    confidence: Mapped[Optional[float]] = mapped_column(Float, default=1.0)
 
     # 证据
-    evidence = Column(JSON, default=list)
+    evidence: Mapped[Optional[list]] = mapped_column(JSONB, default=list)
 
     # 时间戳
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     def __repr__(self):
         return f"<ClaimRefutation(refuting={self.refuting_claim_id}, refuted={self.refuted_claim_id})>"
 
 
+# 证伪关系增删时同步维护 claims.refuted_count / refuting_count
+# （asyncpg 按预编译语句执行，每个 DDL 只能包含一条语句）
+CLAIM_REFUTATION_COUNTS_DDL = (
+    DDL("""
+        CREATE OR REPLACE FUNCTION claim_refutation_counts() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                UPDATE claims SET refuted_count = refuted_count + 1 WHERE id = NEW.refuted_claim_id;
+                UPDATE claims SET refuting_count = refuting_count + 1 WHERE id = NEW.refuting_claim_id;
+                RETURN NEW;
+            END IF;
+            UPDATE claims SET refuted_count = refuted_count - 1 WHERE id = OLD.refuted_claim_id;
+            UPDATE claims SET refuting_count = refuting_count - 1 WHERE id = OLD.refuting_claim_id;
+            RETURN OLD;
+        END;
+        $$ LANGUAGE plpgsql
+    """),
+    DDL("""
+        CREATE TRIGGER trg_claim_refutation_counts
+        AFTER INSERT OR DELETE ON claim_refutations
+        FOR EACH ROW EXECUTE FUNCTION claim_refutation_counts()
+    """),
+)
+
+for _ddl in CLAIM_REFUTATION_COUNTS_DDL:
+    event.listen(ClaimRefutation.__table__, "after_create", _ddl)
+
+
 class InvestigationHistory(Base):
     """
     调查历史记录
@@ -243,19 +346,35 @@ class InvestigationHistory(Base):
     """
     __tablename__ = 'investigation_history'
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    investigation_id = Column(String(64), unique=True, nullable=False, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    investigation_id: Mapped[str] = mapped_column(String(64), unique=True, index=True)
 
     # 关联事件
-    event_id = Column(String(64), ForeignKey('events.id'), nullable=True)
+    event_id: Mapped[Optional[str]] = mapped_column(String(64), ForeignKey('events.id'))
 
     # 调查结果
-    report = Column(JSON, nullable=False)  # 完整报告
-    credibility_score = Column(Float, nullable=False)
+    status: Mapped[str] = mapped_column(String(32), default="completed")  # completed/failed
+    report: Mapped[dict] = mapped_column(JSONB)  # 完整报告
+    credibility_score: Mapped[float] = mapped_column(Float)
 
     # 时间戳
-    started_at = Column(DateTime, nullable=False)
-    completed_at = Column(DateTime, default=datetime.utcnow)
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    # 非空：作为列表 keyset 分页键，NULL 会破坏 (completed_at, id) 行比较
+    completed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # 列表分页（keyset）：按状态过滤，按 (completed_at, id) 倒序
+        Index(
+            "ix_investigation_history_status_completed",
+            "status", completed_at.column.desc(), id.column.desc()
+        ),
+        # 近期低可信度调查（部分索引，只收录 credibility_score < 50 的行）
+        Index(
+            "ix_invhist_low_cred",
+            completed_at.column.desc(),
+            postgresql_where=credibility_score.column < 50
+        ),
+    )
 
     def __repr__(self):
         return f"<InvestigationHistory(id='{self.investigation_id}', score={self.credibility_score})>"
@@ -3,17 +3,74 @@ EKG 数据访问层 (Repository)
 
 提供对知识图谱的CRUD操作
 """
-from typing import Dict, Any, List, Optional
-from datetime import datetime
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-
+import hashlib
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+
+import orjson
+from sqlalchemy import (
+    Integer, case, column, func, insert, literal_column, select, text, tuple_, update, values
+)
+from sqlalchemy.dialects.postgresql import JSONB, array, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer, raiseload, selectinload
+from sqlalchemy.sql import Select
+
+from ..utils.config import settings
+from ..utils.cache import get_json, invalidate, set_json, source_cache_key, source_reputation_key
+from .dto import ClaimDTO
 from .models import (
     Source, Event, Claim, Entity, Artifact,
     ClaimRefutation, InvestigationHistory,
     SourceType, EventStatus, ClaimStatus
 )
 
+# 信源声誉读缓存过期时间（秒），所有写入方都会主动失效
+SOURCE_REPUTATION_TTL = 60
+# EKG历史查询：相似事件 + 信源声誉，一次往返返回单个JSON对象
+EKG_HISTORY_SQL = text("""
+    WITH se AS (
+        SELECT id, title, status, credibility_score, updated_at
+        FROM events
+        WHERE tags ?| CAST(:entities AS text[])
+        ORDER BY updated_at DESC
+        LIMIT :limit
+    ), sr AS (
+        SELECT name, type, credit_score, total_claims, verified_claims, refuted_claims,
+               accuracy_rate, updated_at
+        FROM sources
+        WHERE name = :source_name
+    )
+    SELECT jsonb_build_object(
+        'similar_events', COALESCE((SELECT jsonb_agg(row_to_json(se)) FROM se), '[]'::jsonb),
+        'source_reputation', (SELECT row_to_json(sr) FROM sr)
+    ) AS history
+""").columns(history=JSONB)
+# 实体名去重的三元组相似度下限
+ENTITY_SIMILARITY_THRESHOLD = 0.8
+# COPY 导入物料时写入的列（顺序即记录元组顺序，created_at 由数据库默认值填充）
+ARTIFACT_COPY_COLUMNS = ("type", "url", "content_hash", "content", "metadata", "captured_at")
+
+
+def _q(model: type) -> Select:
+    """
+    读查询入口：非生产环境下禁止一切未声明的关系加载
+
+    隐式懒加载（N+1）在开发/测试阶段直接报错；确需的关系显式 selectinload。
+
+    Args:
+        model: ORM模型类
+
+    Returns:
+        Select: 查询语句
+    """
+    stmt = select(model)
+    if not settings.is_production():
+        stmt = stmt.options(raiseload("*"))
+    return stmt
+
 
 class EKGRepository:
     """
@@ -21,27 +78,63 @@ class EKGRepository:
     封装所有数据库操作
     """
 
-    def __init__(self, session: Session):
+    def __init__(
+        self,
+        session: Optional[AsyncSession] = None,
+        session_factory: Optional[Callable[[], AsyncSession]] = None
+    ):
         """
         初始化Repository
 
         Args:
-            session: SQLAlchemy Session
+            session: 绑定的SQLAlchemy AsyncSession（生命周期由调用方管理）
+            session_factory: 会话工厂（未绑定会话时，每次操作新建并关闭会话）
         """
+        if session is None and session_factory is None:
+            raise ValueError("Either session or session_factory is required")
+
         self.session = session
+        self._session_factory = session_factory
+
+    @asynccontextmanager
+    async def _session(self) -> AsyncIterator[AsyncSession]:
+        """获取会话：优先复用绑定的会话，否则从会话工厂新建"""
+        if self.session is not None:
+            yield self.session
+        else:
+            async with self._session_factory() as session:
+                yield session
+
+    async def _commit(self, session: AsyncSession) -> None:
+        """
+        仅在会话由Repository自己创建时提交；绑定的会话由调用方统一提交（每次调查一次），
+        这里只 flush，使新对象的自增主键等在返回前可用
+        """
+        if self.session is None:
+            await session.commit()
+        else:
+            await session.flush()
+
+    @staticmethod
+    async def _invalidate_sources(*names: str) -> None:
+        """失效信源相关缓存（TaaS查询结果 + 声誉读缓存）"""
+        await invalidate(*(
+            key for name in names
+            for key in (source_cache_key(name), source_reputation_key(name))
+        ))
 
     # ============================================
     # Source (信源) 操作
     # ============================================
 
-    def find_or_create_source(
+    async def find_or_create_source(
         self,
         name: str,
         source_type: SourceType,
         **kwargs
     ) -> Source:
         """
-        查找或创建信源
+        查找或创建信源（单条 INSERT ... ON CONFLICT DO UPDATE ... RETURNING）
 
         Args:
             name: 信源名称
@@ -51,20 +144,23 @@ class EKGRepository:
         Returns:
             Source: 信源对象
         """
-        source = self.session.query(Source).filter_by(name=name).first()
+        stmt = pg_insert(Source).values(name=name, type=source_type, **kwargs)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Source.name],
+            set_={"name": stmt.excluded.name}  # 空更新，使已存在的行也能RETURNING
+        ).returning(Source, literal_column("(xmax = 0)").label("inserted"))
 
-        if not source:
-            source = Source(
-                name=name,
-                type=source_type,
-                **kwargs
-            )
-            self.session.add(source)
-            self.session.commit()
+        async with self._session() as session:
+            source, inserted = (await session.execute(stmt)).one()
+            await self._commit(session)
+
+        if inserted:
+            # 失效"信源不存在"的缓存结果
+            await self._invalidate_sources(name)
 
         return source
 
-    def get_source_by_name(self, name: str) -> Optional[Source]:
+    async def get_source_by_name(self, name: str) -> Optional[Source]:
         """
         根据名称查询信源
 
@@ -74,12 +170,15 @@ class EKGRepository:
         Returns:
             Source: 信源对象（如果存在）
         """
-        return self.session.query(Source).filter_by(name=name).first()
+        async with self._session() as session:
+            return await session.scalar(_q(Source).where(Source.name == name))
 
-    def update_source_credit_score(self, source_id: int, change: int) -> bool:
+    async def update_source_credit_score(self, source_id: int, change: int) -> bool:
         """
         更新信源信誉分（飞轮机制核心）
 
+        单条原子 UPDATE ... RETURNING，并发调查同时更新同一信源时不会丢失更新。
+
         Args:
             source_id: 信源ID
             change: 信誉分变化值（正数或负数）
@@ -87,19 +186,67 @@ class EKGRepository:
         Returns:
             bool: 是否更新成功
         """
-        source = self.session.query(Source).filter_by(id=source_id).first()
-        if not source:
-            return False
-
         # 更新信誉分，限制在0-100范围
-        new_score = max(0, min(100, source.credit_score + change))
-        source.credit_score = new_score
-        source.updated_at = datetime.utcnow()
+        stmt = (
+            update(Source)
+            .where(Source.id == source_id)
+            .values(
+                credit_score=func.least(100, func.greatest(0, Source.credit_score + change)),
+                updated_at=func.now()
+            )
+            .returning(Source.name)
+        )
 
-        self.session.commit()
+        async with self._session() as session:
+            name = await session.scalar(stmt)
+            if name is None:
+                return False
+            await self._commit(session)
+
+        await self._invalidate_sources(name)
         return True
 
-    def get_source_statistics(self, source_id: int) -> Dict[str, Any]:
+    async def bulk_update_source_scores(self, pairs: List[Tuple[int, int]]) -> int:
+        """
+        批量更新信源信誉分（单条 UPDATE ... FROM (VALUES ...)）
+
+        Args:
+            pairs: (信源ID, 信誉分变化值) 列表，同一信源的变化值会先合并
+
+        Returns:
+            int: 更新的信源数量
+        """
+        if not pairs:
+            return 0
+
+        deltas: Dict[int, int] = defaultdict(int)
+        for source_id, change in pairs:
+            deltas[source_id] += change
+
+        v = values(
+            column("id", Integer),
+            column("delta", Integer),
+            name="v"
+        ).data(list(deltas.items()))
+
+        async with self._session() as session:
+            # 信誉分限制在0-100范围
+            result = await session.execute(
+                update(Source)
+                .where(Source.id == v.c.id)
+                .values(
+                    credit_score=func.greatest(0, func.least(100, Source.credit_score + v.c.delta)),
+                    updated_at=func.now()
+                )
+                .returning(Source.name)
+            )
+            names = result.scalars().all()
+            await self._commit(session)
+
+        await self._invalidate_sources(*names)
+        return len(names)
+
+    async def get_source_statistics(self, source_id: int) -> Dict[str, Any]:
         """
         获取信源统计数据
 
@@ -109,18 +256,21 @@ class EKGRepository:
         Returns:
             dict: 统计数据
         """
-        source = self.session.query(Source).filter_by(id=source_id).first()
-        if not source:
-            return {}
+        async with self._session() as session:
+            source = await session.get(Source, source_id)
+            if not source:
+                return {}
 
+            return self._source_statistics(source)
+
+    @staticmethod
+    def _source_statistics(source: Source) -> Dict[str, Any]:
+        """从已加载的信源对象计算统计数据（不再查询数据库）"""
         return {
             "total_claims": source.total_claims,
             "verified_claims": source.verified_claims,
             "refuted_claims": source.refuted_claims,
-            "accuracy_rate": (
-                source.verified_claims / source.total_claims * 100
-                if source.total_claims > 0 else 0
-            ),
+            "accuracy_rate": source.accuracy_rate,
             "credit_score": source.credit_score
         }
 
@@ -128,7 +278,7 @@ class EKGRepository:
     # Event (事件) 操作
     # ============================================
 
-    def create_event(self, event_id: str, **kwargs) -> Event:
+    async def create_event(self, event_id: str, **kwargs) -> Event:
         """
         创建事件
 
@@ -139,12 +289,13 @@ class EKGRepository:
         Returns:
             Event: 事件对象
         """
-        event = Event(id=event_id, **kwargs)
-        self.session.add(event)
-        self.session.commit()
-        return event
+        async with self._session() as session:
+            event = Event(id=event_id, **kwargs)
+            session.add(event)
+            await self._commit(session)
+            return event
 
-    def get_event(self, event_id: str) -> Optional[Event]:
+    async def get_event(self, event_id: str) -> Optional[Event]:
         """
         获取事件
 
@@ -154,9 +305,10 @@ class EKGRepository:
         Returns:
             Event: 事件对象
         """
-        return self.session.query(Event).filter_by(id=event_id).first()
+        async with self._session() as session:
+            return await session.scalar(_q(Event).where(Event.id == event_id))
 
-    def update_event_status(
+    async def update_event_status(
         self,
         event_id: str,
         status: EventStatus,
@@ -173,23 +325,23 @@ class EKGRepository:
         Returns:
             bool: 是否更新成功
         """
-        event = self.get_event(event_id)
-        if not event:
-            return False
+        async with self._session() as session:
+            event = await session.get(Event, event_id)
+            if not event:
+                return False
 
-        event.status = status
-        if credibility_score is not None:
-            event.credibility_score = credibility_score
-        event.updated_at = datetime.utcnow()
+            event.status = status
+            if credibility_score is not None:
+                event.credibility_score = credibility_score
 
-        self.session.commit()
-        return True
+            await self._commit(session)
+            return True
 
     # ============================================
     # Claim (声明) 操作
     # ============================================
 
-    def create_claim(
+    async def create_claim(
         self,
         text: str,
         source_id: int,
@@ -208,23 +360,66 @@ class EKGRepository:
         Returns:
             Claim: 声明对象
         """
-        claim = Claim(
-            text=text,
-            source_id=source_id,
-            event_id=event_id,
-            **kwargs
-        )
-        self.session.add(claim)
+        async with self._session() as session:
+            claim = Claim(
+                text=text,
+                source_id=source_id,
+                event_id=event_id,
+                **kwargs
+            )
+            session.add(claim)
+
+            # 更新信源统计（原子自增）
+            source_name = await session.scalar(
+                update(Source)
+                .where(Source.id == source_id)
+                .values(total_claims=Source.total_claims + 1)
+                .returning(Source.name)
+            )
 
-        # 更新信源统计
-        source = self.session.query(Source).filter_by(id=source_id).first()
-        if source:
-            source.total_claims += 1
+            await self._commit(session)
 
-        self.session.commit()
+        if source_name:
+            await self._invalidate_sources(source_name)
         return claim
 
-    def update_claim_status(
+    async def create_claims_bulk(self, claims: List[Dict[str, Any]]) -> List[int]:
+        """
+        批量创建声明（insertmanyvalues 批量INSERT + 单条UPDATE更新信源计数）
+
+        Args:
+            claims: 声明属性列表（至少包含 text、source_id）
+
+        Returns:
+            list: 新声明ID（与输入顺序一致）
+        """
+        if not claims:
+            return []
+
+        per_source = values(
+            column("id", Integer),
+            column("delta", Integer),
+            name="v"
+        ).data(list(Counter(c["source_id"] for c in claims).items()))
+
+        async with self._session() as session:
+            result = await session.scalars(insert(Claim).returning(Claim.id, sort_by_parameter_order=True), claims)
+            claim_ids = list(result)
+
+            # 更新信源统计
+            result = await session.execute(
+                update(Source)
+                .where(Source.id == per_source.c.id)
+                .values(total_claims=Source.total_claims + per_source.c.delta)
+                .returning(Source.name)
+            )
+            names = result.scalars().all()
+            await self._commit(session)
+
+        await self._invalidate_sources(*names)
+        return claim_ids
+
+    async def update_claim_status(
         self,
         claim_id: int,
         status: ClaimStatus,
@@ -241,30 +436,45 @@ class EKGRepository:
         Returns:
             bool: 是否更新成功
         """
-        claim = self.session.query(Claim).filter_by(id=claim_id).first()
-        if not claim:
-            return False
+        async with self._session() as session:
+            # 行锁保证读取的旧状态与本次更新一致
+            claim = await session.scalar(
+                select(Claim).where(Claim.id == claim_id).with_for_update()
+            )
+            if not claim:
+                return False
 
-        old_status = claim.status
-        claim.status = status
+            old_status = claim.status
+            claim.status = status
 
-        if verification_result:
-            claim.verification_result = verification_result
+            if verification_result:
+                claim.verification_result = verification_result
 
-        # 更新信源统计
-        source = claim.source
-        if source:
+            # 更新信源统计（原子自增，无需加载信源）
+            counter = None
             if old_status != ClaimStatus.VERIFIED and status == ClaimStatus.VERIFIED:
-                source.verified_claims += 1
+                counter = Source.verified_claims
             elif old_status != ClaimStatus.REFUTED and status == ClaimStatus.REFUTED:
-                source.refuted_claims += 1
+                counter = Source.refuted_claims
 
-        self.session.commit()
+            source_name = None
+            if counter is not None:
+                source_name = await session.scalar(
+                    update(Source)
+                    .where(Source.id == claim.source_id)
+                    .values({counter: counter + 1})
+                    .returning(Source.name)
+                )
+
+            await self._commit(session)
+
+        if source_name:
+            await self._invalidate_sources(source_name)
         return True
 
-    def get_claims_by_event(self, event_id: str) -> List[Claim]:
+    async def get_claims_by_event(self, event_id: str) -> List[Claim]:
         """
-        获取事件的所有声明
+        获取事件的所有声明（预加载信源和事件）
 
         Args:
             event_id: 事件ID
@@ -272,13 +482,151 @@ class EKGRepository:
         Returns:
             list: 声明列表
         """
-        return self.session.query(Claim).filter_by(event_id=event_id).all()
+        async with self._session() as session:
+            result = await session.scalars(
+                _q(Claim)
+                .options(selectinload(Claim.source), selectinload(Claim.event))
+                .where(Claim.event_id == event_id)
+            )
+            return list(result)
+
+    async def get_claim_dtos_by_event(self, event_id: str) -> List[ClaimDTO]:
+        """
+        获取事件的所有声明及其信源（单次JOIN，只取所需列，不构造ORM对象）
+
+        Args:
+            event_id: 事件ID
+
+        Returns:
+            list: 声明DTO列表
+        """
+        async with self._session() as session:
+            result = await session.execute(
+                select(
+                    Claim.id,
+                    Claim.text,
+                    Claim.status,
+                    Source.id,
+                    Source.name,
+                    Source.credit_score
+                )
+                .outerjoin(Source, Claim.source_id == Source.id)
+                .where(Claim.event_id == event_id)
+            )
+            return [
+                ClaimDTO(claim_id, text, status.value, source_id, source_name, credit_score)
+                for claim_id, text, status, source_id, source_name, credit_score in result
+            ]
+
+    async def get_claims_timeline(self, event_id: str) -> List[Tuple[str, Optional[str], str, ClaimStatus]]:
+        """
+        获取事件的声明时间线（排序和时间格式化在数据库中完成，走 (event_id, timestamp) 索引）
+
+        Args:
+            event_id: 事件ID
+
+        Returns:
+            list: (ISO时间（UTC，带 +00:00 偏移）, 信源名称, 声明文本前100字, 状态) 按时间升序
+        """
+        async with self._session() as session:
+            result = await session.execute(
+                select(
+                    # 统一按 UTC 渲染并带上偏移，结果不随会话 TimeZone 变化
+                    func.to_char(func.timezone("UTC", Claim.timestamp), 'YYYY-MM-DD"T"HH24:MI:SS.US"+00:00"'),
+                    Source.name,
+                    func.substr(Claim.text, 1, 100),
+                    Claim.status
+                )
+                .outerjoin(Source, Claim.source_id == Source.id)
+                .where(Claim.event_id == event_id)
+                .order_by(Claim.timestamp.asc())
+            )
+            return list(result.tuples())
+
+    async def find_claims_by_texts(self, texts: List[str]) -> Dict[str, Claim]:
+        """
+        批量查找已有核查结论的声明（单次 IN 查询，走 md5(text) 表达式索引）
+
+        Args:
+            texts: 声明文本列表
+
+        Returns:
+            dict: 声明文本 -> 声明对象（同一文本取最新记录）
+        """
+        if not texts:
+            return {}
+
+        async with self._session() as session:
+            # PostgreSQL md5(text) 基于 UTF-8 字节计算，与这里的摘要一致；再比较原文排除碰撞
+            digests = [hashlib.md5(text.encode("utf-8")).hexdigest() for text in texts]
+            claims = await session.scalars(
+                select(Claim).where(
+                    func.md5(Claim.text).in_(digests),
+                    Claim.text.in_(texts),
+                    Claim.status != ClaimStatus.PENDING
+                ).order_by(Claim.created_at)
+            )
+
+            return {claim.text: claim for claim in claims}
+
+    async def search_claims(self, q: str, limit: int = 20) -> List[Claim]:
+        """
+        全文检索声明（text_tsv @@ plainto_tsquery，走 GIN 索引）
+
+        Args:
+            q: 检索文本
+            limit: 返回数量
+
+        Returns:
+            list: 按相关度排序的声明列表
+        """
+        query = func.plainto_tsquery("simple", q)
+
+        async with self._session() as session:
+            claims = await session.scalars(
+                select(Claim)
+                .where(Claim.text_tsv.op("@@")(query))
+                .order_by(func.ts_rank(Claim.text_tsv, query).desc())
+                .limit(limit)
+            )
+
+            return list(claims)
+
+    async def aggregate_event_credibility(self, event_id: str) -> Dict[str, Any]:
+        """
+        聚合事件的声明统计（单条SQL，计数和平均值在数据库中完成）
+
+        Args:
+            event_id: 事件ID
+
+        Returns:
+            dict: 声明总数、已验证数、已证伪数、信源平均信誉分
+        """
+        async with self._session() as session:
+            result = await session.execute(
+                select(
+                    func.count(Claim.id),
+                    func.sum(case((Claim.status == ClaimStatus.VERIFIED, 1), else_=0)),
+                    func.sum(case((Claim.status == ClaimStatus.REFUTED, 1), else_=0)),
+                    func.avg(Source.credit_score)
+                ).join(Source, Claim.source_id == Source.id).where(
+                    Claim.event_id == event_id
+                )
+            )
+            total, verified, refuted, avg_source_score = result.one()
+
+            return {
+                "total_claims": total,
+                "verified_claims": int(verified or 0),
+                "refuted_claims": int(refuted or 0),
+                "avg_source_score": float(avg_source_score) if avg_source_score is not None else None
+            }
 
     # ============================================
     # Entity (实体) 操作
     # ============================================
 
-    def find_or_create_entity(
+    async def find_or_create_entity(
         self,
         name: str,
         entity_type: str,
@@ -287,6 +635,9 @@ class EKGRepository:
         """
         查找或创建实体
 
+        先精确匹配，再以三元组相似度（≥ ENTITY_SIMILARITY_THRESHOLD）合并近似重名实体，
+        都未命中时 INSERT ... ON CONFLICT DO UPDATE ... RETURNING。
+
         Args:
             name: 实体名称
             entity_type: 实体类型
@@ -295,24 +646,86 @@ class EKGRepository:
         Returns:
             Entity: 实体对象
         """
-        entity = self.session.query(Entity).filter_by(name=name).first()
-
-        if not entity:
-            entity = Entity(
-                name=name,
-                type=entity_type,
-                **kwargs
+        async with self._session() as session:
+            entity = await session.scalar(select(Entity).where(Entity.name == name))
+            if entity:
+                return entity
+
+            # lower(name) % :q 走 ix_entities_name_trgm
+            lowered = func.lower(name)
+            similarity = func.similarity(func.lower(Entity.name), lowered)
+            entity = await session.scalar(
+                select(Entity)
+                .where(
+                    func.lower(Entity.name).op("%")(lowered),
+                    similarity >= ENTITY_SIMILARITY_THRESHOLD
+                )
+                .order_by(similarity.desc())
+                .limit(1)
             )
-            self.session.add(entity)
-            self.session.commit()
+            if entity:
+                return entity
+
+            stmt = pg_insert(Entity).values(name=name, type=entity_type, **kwargs)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Entity.name],
+                set_={"name": stmt.excluded.name}
+            ).returning(Entity)
+
+            entity = await session.scalar(stmt)
+            await self._commit(session)
 
         return entity
 
+    # ============================================
+    # 物料操作
+    # ============================================
+
+    async def bulk_import_artifacts(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        批量导入物料（COPY ... FROM STDIN，绕过逐行 INSERT）
+
+        大批量导入（>10k 行）时可先删除 content_hash 索引，导入后再 REINDEX。
+
+        Args:
+            rows: 物料属性列表（至少包含 type；content_hash 为 32 字节 SHA-256 摘要）
+
+        Returns:
+            int: 导入行数
+        """
+        if not rows:
+            return 0
+
+        now = datetime.now(timezone.utc)
+        records = [
+            (
+                row["type"],
+                row.get("url"),
+                row.get("content_hash"),
+                row.get("content"),
+                orjson.dumps(row.get("metadata") or {}).decode(),
+                row.get("captured_at") or now
+            )
+            for row in rows
+        ]
+
+        async with self._session() as session:
+            conn = await session.connection()
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                Artifact.__tablename__,
+                records=records,
+                columns=ARTIFACT_COPY_COLUMNS
+            )
+            await self._commit(session)
+
+        return len(records)
+
     # ============================================
     # 关系操作
     # ============================================
 
-    def create_claim_refutation(
+    async def create_claim_refutation(
         self,
         refuting_claim_id: int,
         refuted_claim_id: int,
@@ -322,6 +735,9 @@ class EKGRepository:
         """
         创建声明证伪关系
 
+        双方声明的 refuted_count / refuting_count 由数据库触发器同步更新，
+        读取"是否被证伪"无需再聚合 claim_refutations。
+
         Args:
             refuting_claim_id: 证伪方声明ID
             refuted_claim_id: 被证伪声明ID
@@ -331,27 +747,29 @@ class EKGRepository:
         Returns:
             ClaimRefutation: 证伪关系对象
         """
-        refutation = ClaimRefutation(
-            refuting_claim_id=refuting_claim_id,
-            refuted_claim_id=refuted_claim_id,
-            confidence=confidence,
-            evidence=evidence or []
-        )
-        self.session.add(refutation)
-        self.session.commit()
-        return refutation
+        async with self._session() as session:
+            refutation = ClaimRefutation(
+                refuting_claim_id=refuting_claim_id,
+                refuted_claim_id=refuted_claim_id,
+                confidence=confidence,
+                evidence=evidence or []
+            )
+            session.add(refutation)
+            await self._commit(session)
+            return refutation
 
     # ============================================
     # 调查历史操作
     # ============================================
 
-    def save_investigation_result(
+    async def save_investigation_result(
         self,
         investigation_id: str,
         event_id: str,
         report: Dict[str, Any],
         credibility_score: float,
-        started_at: datetime
+        started_at: datetime,
+        status: str = "completed"
     ) -> InvestigationHistory:
         """
         保存调查结果
@@ -362,22 +780,25 @@ class EKGRepository:
             report: 调查报告
             credibility_score: 可信度评分
             started_at: 开始时间
+            status: 调查状态
 
         Returns:
             InvestigationHistory: 调查历史对象
         """
-        history = InvestigationHistory(
-            investigation_id=investigation_id,
-            event_id=event_id,
-            report=report,
-            credibility_score=credibility_score,
-            started_at=started_at
-        )
-        self.session.add(history)
-        self.session.commit()
-        return history
+        async with self._session() as session:
+            history = InvestigationHistory(
+                investigation_id=investigation_id,
+                event_id=event_id,
+                report=report,
+                credibility_score=credibility_score,
+                started_at=started_at,
+                status=status
+            )
+            session.add(history)
+            await self._commit(session)
+            return history
 
-    def get_investigation_history(self, investigation_id: str) -> Optional[InvestigationHistory]:
+    async def get_investigation_history(self, investigation_id: str) -> Optional[InvestigationHistory]:
         """
         获取调查历史
 
@@ -387,37 +808,132 @@ class EKGRepository:
         Returns:
             InvestigationHistory: 调查历史对象
         """
-        return self.session.query(InvestigationHistory).filter_by(
-            investigation_id=investigation_id
-        ).first()
+        async with self._session() as session:
+            return await session.scalar(
+                _q(InvestigationHistory).where(
+                    InvestigationHistory.investigation_id == investigation_id
+                )
+            )
+
+    async def list_investigations(
+        self,
+        status: Optional[str] = None,
+        after: Optional[Tuple[datetime, int]] = None,
+        limit: int = 10
+    ) -> List[InvestigationHistory]:
+        """
+        分页查询调查历史（keyset分页，按完成时间倒序）
+
+        每页只扫描 limit 行，与翻页深度无关。
+
+        Args:
+            status: 过滤状态
+            after: 上一页最后一条的 (completed_at, id)
+            limit: 返回数量
+
+        Returns:
+            list: 调查历史列表
+        """
+        async with self._session() as session:
+            # 列表不返回完整报告，避免读取大 JSONB 列
+            stmt = select(InvestigationHistory).options(
+                defer(InvestigationHistory.report, raiseload=True)
+            )
+            if status:
+                stmt = stmt.where(InvestigationHistory.status == status)
+            if after:
+                stmt = stmt.where(
+                    tuple_(InvestigationHistory.completed_at, InvestigationHistory.id) < tuple_(*after)
+                )
+
+            result = await session.scalars(
+                stmt.order_by(
+                    InvestigationHistory.completed_at.desc(),
+                    InvestigationHistory.id.desc()
+                ).limit(limit)
+            )
+            return list(result)
 
     # ============================================
     # 复杂查询（飞轮效应相关）
     # ============================================
 
-    def query_source_reputation(self, source_name: str) -> Optional[Dict[str, Any]]:
+    async def query_source_reputation(self, source_name: str) -> Optional[Dict[str, Any]]:
         """
         查询信源声誉（飞轮效应的"读"操作）
 
+        结果在 Redis 中缓存 SOURCE_REPUTATION_TTL 秒，信誉分/统计的写入方负责失效。
+
         Args:
             source_name: 信源名称
 
         Returns:
             dict: 信源声誉数据
         """
-        source = self.get_source_by_name(source_name)
+        key = source_reputation_key(source_name)
+        reputation = await get_json(key)
+        if reputation is not None:
+            return reputation
+
+        source = await self.get_source_by_name(source_name)
         if not source:
             return None
 
+        reputation = self._source_reputation(source)
+        await set_json(key, SOURCE_REPUTATION_TTL, reputation)
+        return reputation
+
+    async def query_source_reputations(self, source_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        批量查询信源声誉（单次 IN 查询）
+
+        Args:
+            source_names: 信源名称列表
+
+        Returns:
+            dict: 信源名称 -> 信源声誉数据（不存在的信源不包含在内）
+        """
+        if not source_names:
+            return {}
+
+        async with self._session() as session:
+            sources = await session.scalars(select(Source).where(Source.name.in_(source_names)))
+            return {source.name: self._source_reputation(source) for source in sources}
+
+    def _source_reputation(self, source: Source) -> Dict[str, Any]:
+        """构建信源声誉数据"""
         return {
             "name": source.name,
             "type": source.type.value,
             "credit_score": source.credit_score,
-            "statistics": self.get_source_statistics(source.id),
+            "statistics": self._source_statistics(source),
             "last_updated": source.updated_at.isoformat()
         }
 
-    def find_similar_events(
+    async def query_history(
+        self,
+        entities: List[str],
+        source_name: Optional[str] = None,
+        limit: int = 5
+    ) -> Dict[str, Any]:
+        """
+        查询EKG历史数据（相似事件 + 信源声誉，单条SQL嵌套JSON聚合）
+
+        Args:
+            entities: 实体列表（匹配事件标签）
+            source_name: 信源名称
+            limit: 相似事件返回数量
+
+        Returns:
+            dict: {"similar_events": [...], "source_reputation": {...} | None}
+        """
+        async with self._session() as session:
+            return await session.scalar(
+                EKG_HISTORY_SQL,
+                {"entities": entities, "source_name": source_name, "limit": limit}
+            )
+
+    async def find_similar_events(
         self,
         entities: List[str],
         limit: int = 5
@@ -433,11 +949,21 @@ class EKGRepository:
             list: 相似事件列表
         """
         # TODO: 实现更复杂的相似度算法
-        # 简化版：查找包含相同实体的事件
+        # 简化版：查找标签包含任一实体的事件（tags ?| array，走 GIN 索引）
+        if not entities:
+            return []
+
+        async with self._session() as session:
+            events = await session.scalars(
+                select(Event)
+                .where(Event.tags.op("?|")(array(entities)))
+                .order_by(Event.updated_at.desc())
+                .limit(limit)
+            )
 
-        return []
+            return list(events)
 
-    def get_trending_sources(self, limit: int = 10) -> List[Dict[str, Any]]:
+    async def get_trending_sources(self, limit: int = 10) -> List[Dict[str, Any]]:
         """
         获取热门信源（按活跃度）
 
@@ -447,16 +973,31 @@ class EKGRepository:
         Returns:
             list: 信源列表
         """
-        sources = self.session.query(Source).order_by(
-            Source.total_claims.desc()
-        ).limit(limit).all()
+        # 只取需要的列，不构造 ORM 对象
+        async with self._session() as session:
+            result = await session.execute(
+                select(Source.name, Source.type, Source.credit_score, Source.total_claims)
+                .order_by(Source.total_claims.desc())
+                .limit(limit)
+            )
 
-        return [
-            {
-                "name": s.name,
-                "type": s.type.value,
-                "credit_score": s.credit_score,
-                "total_claims": s.total_claims
-            }
-            for s in sources
-        ]
+            return [
+                {**row._mapping, "type": row.type.value}
+                for row in result
+            ]
+
+
+def _default_session_factory() -> AsyncSession:
+    """默认会话工厂：使用全局 db_manager（在 init_database 之后可用）"""
+    # 延迟导入：database.connection 依赖 ekg.models
+    from ..database import db_manager
+    return db_manager.get_session()
+
+
+# 全局EKG Repository实例（共享连接池和会话工厂）
+ekg_repo = EKGRepository(session_factory=_default_session_factory)
+
+
+def get_ekg_repo() -> EKGRepository:
+    """FastAPI 依赖注入：返回全局EKG Repository"""
+    return ekg_repo
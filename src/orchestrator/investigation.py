@@ -7,9 +7,15 @@
 3. 在Agent间传递上下文
 4. 协调EKG的读写
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import replace
 from datetime import datetime
-import uuid
+from urllib.parse import urlparse
+import asyncio
+import secrets
+
+import msgspec
+import orjson
 
 from ..agents import (
     BaseAgent,
@@ -21,6 +27,8 @@ from ..agents import (
     NarrativeAnalystAgent,
     SynthesizerAgent
 )
+from ..ekg import ekg_repo
+from ..utils.cache import get_async_redis, investigation_result_key
 
 
 class InvestigationOrchestrator:
@@ -37,32 +45,67 @@ class InvestigationOrchestrator:
             config: 配置字典
         """
         self.config = config or {}
-        self.agents = self._initialize_agents()
-        # TODO: 初始化EKG连接
-        self.ekg = None
-
-    def _initialize_agents(self) -> List[BaseAgent]:
+        self.stages = self._initialize_agents()
+        self.agents = [agent for stage in self.stages for agent in stage]
+        self.verifier = next(a for a in self.agents if isinstance(a, VerifierAgent))
+        self.source_hunter = next(a for a in self.agents if isinstance(a, SourceHunterAgent))
+        # 共享全局EKG Repository（连接池和会话工厂）
+        self.ekg = self.config.get("ekg", ekg_repo)
+
+    def _initialize_agents(self) -> List[List[BaseAgent]]:
         """
         初始化所有Agent
 
         Returns:
-            list: Agent列表
-        """
-        # 按执行顺序排列
-        agents = [
-            MonitorAgent(self.config.get("monitor", {})),
-            SourceHunterAgent(self.config.get("source_hunter", {})),
-            VerifierAgent(self.config.get("verifier", {})),
-            NarrativeAnalystAgent(self.config.get("narrative", {})),
-            SynthesizerAgent(self.config.get("synthesizer", {}))
+            list: 执行阶段列表（阶段按顺序执行，同一阶段内的Agent并行执行）
+        """
+        # Verifier和NarrativeAnalyst都只依赖SourceHunter的发现，互不依赖
+        stages = [
+            [MonitorAgent(self.config.get("monitor", {}))],
+            [SourceHunterAgent(self.config.get("source_hunter", {}))],
+            [
+                VerifierAgent(self.config.get("verifier", {})),
+                NarrativeAnalystAgent(self.config.get("narrative", {}))
+            ],
+            [SynthesizerAgent(self.config.get("synthesizer", {}))]
+        ]
+
+        return stages
+
+    @staticmethod
+    async def _run_stage(stage: List[BaseAgent], context: InvestigationContext) -> List[AgentResult]:
+        """
+        执行一个阶段
+
+        并行分支各自使用上下文副本，结束后把发现合并回主上下文，避免共享字典的并发修改。
+
+        Args:
+            stage: 同一阶段的Agent列表
+            context: 调查上下文
+
+        Returns:
+            list: 各Agent执行结果（与stage顺序一致）
+        """
+        if len(stage) == 1:
+            return [await stage[0].run(context)]
+
+        branches = [
+            replace(context, metadata=dict(context.metadata), findings=dict(context.findings))
+            for _ in stage
         ]
+        results = await asyncio.gather(*(agent.run(branch) for agent, branch in zip(stage, branches)))
 
-        return agents
+        for branch in branches:
+            context.metadata.update(branch.metadata)
+            context.findings.update(branch.findings)
+
+        return list(results)
 
     async def start_investigation(
         self,
         submission: str,
-        submission_type: str = "url"
+        submission_type: str = "url",
+        investigation_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         启动调查流程（核心方法）
@@ -70,12 +113,13 @@ class InvestigationOrchestrator:
         Args:
             submission: 用户提交的链接或文本
             submission_type: 提交类型（"url" 或 "text"）
+            investigation_id: 调查ID（入队时已生成则沿用）
 
         Returns:
             dict: 调查结果（包含报告）
         """
         # 1. 创建调查上下文
-        investigation_id = self._generate_investigation_id()
+        investigation_id = investigation_id or self.generate_investigation_id()
         context = InvestigationContext(
             investigation_id=investigation_id,
             user_submission=submission,
@@ -88,14 +132,17 @@ class InvestigationOrchestrator:
         if historical_data:
             context.metadata["historical_data"] = historical_data
 
-        # 3. 按顺序执行Agent Pipeline
+        # 3. 按阶段执行Agent Pipeline（阶段内并行）
         agent_results = []
-        for agent in self.agents:
-            result = await agent.run(context)
-            agent_results.append(result)
+        for stage in self.stages:
+            results = await self._run_stage(stage, context)
+            agent_results.extend(results)
 
             # 如果关键Agent失败，可选择中止流程
-            if not result.is_success() and self._is_critical_agent(agent):
+            if any(
+                not result.is_success() and self._is_critical_agent(agent)
+                for agent, result in zip(stage, results)
+            ):
                 break
 
         # 4. 从最后的Synthesizer结果中提取报告和EKG更新数据
@@ -112,22 +159,83 @@ class InvestigationOrchestrator:
                 "status": "completed",
                 "report": report,
                 "credibility_score": final_result.data.get("credibility_score", 0.0),
-                "agent_results": [
-                    {
-                        "agent": r.agent_name,
-                        "status": r.status.value,
-                        "execution_time": r.execution_time
-                    }
-                    for r in agent_results
-                ]
+                "agent_results": self._summarize_agent_results(agent_results)
             }
         else:
             return {
                 "investigation_id": investigation_id,
                 "status": "failed",
                 "error": "Investigation pipeline failed",
-                "agent_results": agent_results
+                "agent_results": self._summarize_agent_results(agent_results)
+            }
+
+    @staticmethod
+    def _summarize_agent_results(agent_results: List[AgentResult]) -> List[Dict[str, Any]]:
+        """Agent执行结果摘要（可序列化，供API和后台任务存储）"""
+        return [
+            {
+                "agent": r.agent_name,
+                "status": r.status.value,
+                "execution_time": r.execution_time
             }
+            for r in agent_results
+        ]
+
+    async def batch_fact_check(
+        self,
+        claims: List[Tuple[str, List[str]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        批量事实核查（TaaS请求合并后调用）
+
+        先用一次查询在EKG中查找历史核查结论，未命中的声明再统一交给VerifierAgent。
+
+        Args:
+            claims: (声明文本, 涉及实体) 列表
+
+        Returns:
+            list: 核查结果（与输入一一对应）
+        """
+        known = await self.ekg.find_claims_by_texts([text for text, _ in claims]) if self.ekg else {}
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(claims)
+        pending = []
+
+        for i, (text, entities) in enumerate(claims):
+            record = known.get(text)
+            if record is not None:
+                results[i] = {
+                    "claim": text,
+                    "status": record.status.value,
+                    "evidence": (record.verification_result or {}).get("evidence", [])
+                }
+            else:
+                pending.append(i)
+
+        if pending:
+            verified = await self.verifier.verify_claims(
+                [{"text": claims[i][0], "entities": claims[i][1]} for i in pending]
+            )
+            for i, result in zip(pending, verified):
+                results[i] = msgspec.to_builtins(result)
+
+        return results
+
+    async def batch_source_check(self, source_names: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        批量查询信源声誉（TaaS请求合并后调用）
+
+        Args:
+            source_names: 信源名称列表
+
+        Returns:
+            list: 信源声誉数据（与输入一一对应，不存在为None）
+        """
+        if not self.ekg:
+            return [None] * len(source_names)
+
+        reputations = await self.ekg.query_source_reputations(source_names)
+        return [reputations.get(name) for name in source_names]
 
     async def _query_ekg_history(self, submission: str) -> Optional[Dict[str, Any]]:
         """
@@ -139,19 +247,16 @@ class InvestigationOrchestrator:
         Returns:
             dict: 历史数据（如果有）
         """
-        # TODO: 实现EKG查询
-        # 1. 提取关键实体
-        # 2. 在EKG中查找相关信源的历史信誉
-        # 3. 查找类似事件的历史记录
-
         if not self.ekg:
             return None
 
-        # 框架示例
-        return {
-            "similar_events": [],
-            "source_reputation": None
-        }
+        # 1. 提取关键实体
+        entities = await self.source_hunter.extract_entities(submission)
+        # 2. URL提交以域名作为信源
+        source_name = urlparse(submission).hostname
+
+        # 3. 相似事件和信源信誉在一次查询中返回
+        return await self.ekg.query_history(entities, source_name)
 
     async def _update_ekg(self, ekg_update: Dict[str, Any]) -> bool:
         """
@@ -190,15 +295,16 @@ class InvestigationOrchestrator:
         critical_agents = ["SourceHunterAgent", "SynthesizerAgent"]
         return agent.__class__.__name__ in critical_agents
 
-    def _generate_investigation_id(self) -> str:
+    @staticmethod
+    def generate_investigation_id() -> str:
         """
         生成调查ID
 
         Returns:
             str: 调查ID（如 E-1024）
         """
-        # 使用UUID确保唯一性
-        return f"E-{uuid.uuid4().hex[:8]}"
+        # 48位随机数：截断UUID只有32位，约6.5万次调查后即可能冲突
+        return f"E-{secrets.token_hex(6)}"
 
     async def get_investigation_status(self, investigation_id: str) -> Dict[str, Any]:
         """
@@ -210,11 +316,15 @@ class InvestigationOrchestrator:
         Returns:
             dict: 调查状态
         """
-        # TODO: 从数据库或缓存查询调查状态
-        return {
-            "investigation_id": investigation_id,
-            "status": "unknown"
-        }
+        # 后台worker在Redis中维护状态（pending/running/completed/failed）
+        payload = await get_async_redis().get(investigation_result_key(investigation_id))
+        if payload is None:
+            return {
+                "investigation_id": investigation_id,
+                "status": "unknown"
+            }
+
+        return orjson.loads(payload)
 
     async def cancel_investigation(self, investigation_id: str) -> bool:
         """
@@ -0,0 +1,20 @@
+"""
+后台任务模块
+
+导出调查任务队列（arq）
+"""
+from .investigation_tasks import (
+    WorkerSettings,
+    close_arq_pool,
+    enqueue_investigation,
+    get_arq_pool,
+    run_investigation
+)
+
+__all__ = [
+    "WorkerSettings",
+    "close_arq_pool",
+    "enqueue_investigation",
+    "get_arq_pool",
+    "run_investigation",
+]
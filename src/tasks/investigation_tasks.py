@@ -0,0 +1,159 @@
+"""
+调查后台任务 (arq)
+
+调查流程在独立的worker进程中执行，API进程只负责入队并立即返回调查ID。
+worker崩溃或重启不影响API，且可按机器水平扩展。
+
+启动worker:
+    arq src.tasks.investigation_tasks.WorkerSettings
+"""
+import asyncio
+from typing import Any, Dict, Optional
+
+import msgspec
+from arq import create_pool
+from arq.connections import ArqRedis, RedisSettings
+
+from ..database import init_database, close_database
+from ..orchestrator import InvestigationOrchestrator
+from ..utils import settings, get_logger
+from ..utils.cache import investigation_result_key
+
+logger = get_logger(__name__)
+
+# 调查结果在Redis中的保留时间（秒）
+INVESTIGATION_RESULT_TTL = 24 * 3600
+
+_arq_pool: Optional[ArqRedis] = None
+
+
+async def get_arq_pool() -> ArqRedis:
+    """获取arq连接池（懒初始化）"""
+    global _arq_pool
+    if _arq_pool is None:
+        _arq_pool = await create_pool(RedisSettings.from_dsn(settings.redis_url))
+    return _arq_pool
+
+
+async def close_arq_pool() -> None:
+    """关闭arq连接池（应用关闭时调用）"""
+    global _arq_pool
+    if _arq_pool is not None:
+        await _arq_pool.close()
+        _arq_pool = None
+
+
+async def enqueue_investigation(
+    investigation_id: str,
+    submission: str,
+    submission_type: str
+) -> None:
+    """
+    调查任务入队
+
+    以调查ID作为job_id，重复提交不会产生重复任务。
+
+    Args:
+        investigation_id: 调查ID
+        submission: 用户提交的链接或文本
+        submission_type: 提交类型
+    """
+    pool = await get_arq_pool()
+
+    # 先写入pending状态，入队后即可轮询
+    await pool.set(
+        investigation_result_key(investigation_id),
+        msgspec.json.encode({"investigation_id": investigation_id, "status": "pending"}),
+        ex=INVESTIGATION_RESULT_TTL
+    )
+    await pool.enqueue_job(
+        "run_investigation",
+        investigation_id,
+        submission,
+        submission_type,
+        _job_id=investigation_id
+    )
+
+
+async def run_investigation(
+    ctx: Dict[str, Any],
+    investigation_id: str,
+    submission: str,
+    submission_type: str
+) -> str:
+    """
+    执行调查（worker中运行）
+
+    Args:
+        ctx: arq任务上下文
+        investigation_id: 调查ID
+        submission: 用户提交的链接或文本
+        submission_type: 提交类型
+
+    Returns:
+        str: 调查最终状态
+    """
+    orchestrator: InvestigationOrchestrator = ctx["orchestrator"]
+    redis: ArqRedis = ctx["redis"]
+    key = investigation_result_key(investigation_id)
+
+    await redis.set(
+        key,
+        msgspec.json.encode({"investigation_id": investigation_id, "status": "running"}),
+        ex=INVESTIGATION_RESULT_TTL
+    )
+
+    try:
+        result = await orchestrator.start_investigation(
+            submission=submission,
+            submission_type=submission_type,
+            investigation_id=investigation_id
+        )
+    except (asyncio.CancelledError, asyncio.TimeoutError):
+        # arq 在 job_timeout 到期时取消任务（CancelledError 不是 Exception 的子类）：
+        # 先记录失败状态再继续抛出，否则状态会停留在 running 直到过期
+        logger.error(f"Investigation {investigation_id} timed out or was cancelled")
+        await redis.set(
+            key,
+            msgspec.json.encode({
+                "investigation_id": investigation_id,
+                "status": "failed",
+                "error": "Investigation timed out or was cancelled"
+            }),
+            ex=INVESTIGATION_RESULT_TTL
+        )
+        raise
+    except Exception as e:
+        logger.error(f"Investigation {investigation_id} failed: {e}")
+        result = {
+            "investigation_id": investigation_id,
+            "status": "failed",
+            "error": str(e)
+        }
+
+    # 报告中包含msgspec Struct，使用msgspec编码
+    await redis.set(key, msgspec.json.encode(result), ex=INVESTIGATION_RESULT_TTL)
+    return result["status"]
+
+
+async def startup(ctx: Dict[str, Any]) -> None:
+    """worker启动时初始化数据库和编排器（每个worker进程一个）"""
+    # 编排器通过共享的 EKG 仓库读写数据库，需先初始化连接
+    await init_database()
+    ctx["orchestrator"] = InvestigationOrchestrator()
+
+
+async def shutdown(ctx: Dict[str, Any]) -> None:
+    """worker退出时关闭数据库连接池"""
+    await close_database()
+
+
+class WorkerSettings:
+    """arq worker 配置"""
+    functions = [run_investigation]
+    on_startup = startup
+    on_shutdown = shutdown
+    redis_settings = RedisSettings.from_dsn(settings.redis_url)
+    max_jobs = settings.max_concurrent_investigations
+    job_timeout = settings.investigation_timeout
+    keep_result = INVESTIGATION_RESULT_TTL
@@ -1,13 +1,27 @@
 """
 工具模块
 
-导出配置和日志
+导出配置、日志、缓存、内容指纹和请求批处理工具
 """
 from .config import settings
-from .logger import get_logger, app_logger
+from .logger import get_logger, app_logger, add_json_sink
+from .fingerprint import content_fingerprint, simhash64, dedup_documents
+from .batcher import AsyncBatcher, Batcher, BatchRequest, http_batcher
+from .cache import cached, invalidate, source_cache_key
 
 __all__ = [
     "settings",
     "get_logger",
     "app_logger",
+    "add_json_sink",
+    "content_fingerprint",
+    "simhash64",
+    "dedup_documents",
+    "AsyncBatcher",
+    "Batcher",
+    "BatchRequest",
+    "http_batcher",
+    "cached",
+    "invalidate",
+    "source_cache_key",
 ]
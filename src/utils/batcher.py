@@ -0,0 +1,214 @@
+"""
+请求微批处理模块
+
+将短时间窗口内到达的单条请求合并为一批统一处理，摊薄每次请求的同步开销：
+- AsyncBatcher: 通用批处理器（批量回调由调用方提供）
+- Batcher: 外部HTTP请求批处理（SEC EDGAR、Wayback Machine等），
+  同一批通过同一个HTTP/2连接并发发出
+"""
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Generic, List, Optional, Set, Tuple, TypeVar, Union
+
+import httpx
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class AsyncBatcher(Generic[T, R]):
+    """
+    通用微批处理器
+
+    调用方通过 submit() 提交单条请求并等待结果；后台任务在 batch_window_ms
+    窗口内收集请求（或达到 max_batch_size 立即发送），调用一次批量回调后
+    逐个回填 Future。批量回调返回的结果与输入一一对应，单项结果为异常时
+    仅该请求失败。每批在独立任务中处理，慢批次不阻塞后续批次的收集和发送。
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[List[T]], Awaitable[List[Union[R, BaseException]]]],
+        batch_window_ms: float = 50.0,
+        max_batch_size: int = 32
+    ):
+        """
+        初始化批处理器
+
+        Args:
+            handler: 批量回调
+            batch_window_ms: 批处理窗口（毫秒）
+            max_batch_size: 单批最大请求数
+        """
+        self.handler = handler
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch_size = max_batch_size
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        # 处理中的批次任务（持有引用，避免任务被垃圾回收）
+        self._pending: Set[asyncio.Task] = set()
+
+    async def submit(self, item: T) -> R:
+        """
+        提交请求并等待结果
+
+        Args:
+            item: 单条请求
+
+        Returns:
+            单条结果
+        """
+        self._ensure_started()
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    def _ensure_started(self) -> None:
+        """在当前事件循环中懒启动后台任务"""
+        if self._worker is not None and not self._worker.done():
+            return
+
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        """后台任务：按窗口收集请求并批量处理"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window
+
+            try:
+                while len(batch) < self.max_batch_size:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                # 关闭时正在收集的批次不会再发出
+                _fail_all(batch, RuntimeError("Batcher closed"))
+                raise
+
+            task = asyncio.create_task(self._dispatch(batch))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    async def _dispatch(self, batch: List[Tuple[T, asyncio.Future]]) -> None:
+        """处理一批请求并回填结果"""
+        try:
+            results = await self.handler([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"Batch handler returned {len(results)} results for {len(batch)} items"
+                )
+        except Exception as e:
+            results = [e] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def close(self) -> None:
+        """停止后台任务，队列中尚未发出的请求以异常结束，并等待已发出的批次处理完成"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        if self._queue is not None:
+            queued = []
+            while not self._queue.empty():
+                queued.append(self._queue.get_nowait())
+            _fail_all(queued, RuntimeError("Batcher closed"))
+
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+
+def _fail_all(batch: List[Tuple[Any, asyncio.Future]], exc: BaseException) -> None:
+    """以异常结束批次中尚未完成的 future"""
+    for _, future in batch:
+        if not future.done():
+            future.set_exception(exc)
+
+
+@dataclass(frozen=True)
+class BatchRequest:
+    """待批量发送的GET请求"""
+    url: str
+    params: Optional[Dict[str, Any]] = None
+    headers: Optional[Dict[str, str]] = None
+
+
+class Batcher(AsyncBatcher[BatchRequest, httpx.Response]):
+    """
+    HTTP请求微批处理器
+
+    同一批请求通过共享的 httpx.AsyncClient（HTTP/2多路复用）并发发出。
+    """
+
+    def __init__(
+        self,
+        batch_window_ms: float = 10.0,
+        max_batch_size: int = 32,
+        timeout: float = 30.0,
+        http2: bool = True
+    ):
+        """
+        初始化批处理器
+
+        Args:
+            batch_window_ms: 批处理窗口（毫秒）
+            max_batch_size: 单批最大请求数
+            timeout: 单个请求超时（秒）
+            http2: 是否启用HTTP/2多路复用
+        """
+        super().__init__(
+            self._fetch_all,
+            batch_window_ms=batch_window_ms,
+            max_batch_size=max_batch_size
+        )
+        self.timeout = timeout
+        self.http2 = http2
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def _fetch_all(
+        self,
+        requests: List[BatchRequest]
+    ) -> List[Union[httpx.Response, BaseException]]:
+        """并发发送一批GET请求"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(http2=self.http2, timeout=self.timeout)
+
+        return await asyncio.gather(
+            *(
+                self._client.get(req.url, params=req.params, headers=req.headers)
+                for req in requests
+            ),
+            return_exceptions=True
+        )
+
+    async def close(self) -> None:
+        """停止后台任务并关闭HTTP客户端"""
+        await super().close()
+
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# 全局HTTP批处理器实例（各Agent共享）
+http_batcher = Batcher()
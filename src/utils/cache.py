@@ -0,0 +1,140 @@
+"""
+缓存模块
+
+基于 Redis 的查询结果缓存（TaaS热点查询），并通过 Prometheus 暴露命中率
+"""
+import functools
+from typing import Any, Awaitable, Callable, Optional, Type, TypeVar
+
+import orjson
+import redis
+import redis.asyncio as aioredis
+from prometheus_client import Counter
+from pydantic import BaseModel
+
+from .config import settings
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# 缓存命中统计（按被缓存函数名区分）
+CACHE_HITS = Counter("cache_hits_total", "Number of cache hits", ["namespace"])
+CACHE_MISSES = Counter("cache_misses_total", "Number of cache misses", ["namespace"])
+
+_async_client: Optional[aioredis.Redis] = None
+
+
+def get_async_redis() -> aioredis.Redis:
+    """获取异步Redis客户端（懒初始化）"""
+    global _async_client
+    if _async_client is None:
+        _async_client = aioredis.from_url(settings.redis_url)
+    return _async_client
+
+
+def source_cache_key(source_name: str) -> str:
+    """信源信誉查询的缓存键（与 EKG 中的信源名一致，区分大小写）"""
+    return f"taas:src:{source_name}"
+
+
+def source_reputation_key(source_name: str) -> str:
+    """EKG 信源声誉读缓存的键"""
+    return f"source:{source_name}"
+
+
+def investigation_result_key(investigation_id: str) -> str:
+    """调查状态/结果的Redis键（由后台worker写入）"""
+    return f"investigation:{investigation_id}"
+
+
+def cached(
+    ttl: int,
+    key: Callable[..., str],
+    model: Type[ModelT]
+) -> Callable[[Callable[..., Awaitable[ModelT]]], Callable[..., Awaitable[ModelT]]]:
+    """
+    异步函数结果缓存装饰器
+
+    结果以 orjson 序列化后 SETEX 写入 Redis；Redis 不可用时直接回源。
+
+    Args:
+        ttl: 过期时间（秒）
+        key: 根据被装饰函数的参数生成缓存键
+        model: 返回值的Pydantic模型（用于反序列化）
+
+    Returns:
+        装饰器
+    """
+    def decorator(func: Callable[..., Awaitable[ModelT]]) -> Callable[..., Awaitable[ModelT]]:
+        namespace = func.__name__
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> ModelT:
+            cache_key = key(*args, **kwargs)
+
+            data = await get_json(cache_key)
+            if data is not None:
+                CACHE_HITS.labels(namespace).inc()
+                return model.model_validate(data)
+
+            CACHE_MISSES.labels(namespace).inc()
+            result = await func(*args, **kwargs)
+            await set_json(cache_key, ttl, result.model_dump())
+
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+async def get_json(key: str) -> Optional[Any]:
+    """
+    读取 JSON 缓存值
+
+    Args:
+        key: 缓存键
+
+    Returns:
+        反序列化后的值；未命中或 Redis 不可用时返回 None
+    """
+    try:
+        payload = await get_async_redis().get(key)
+    except redis.RedisError as e:
+        logger.warning(f"Cache read failed for {key}: {e}")
+        return None
+
+    return None if payload is None else orjson.loads(payload)
+
+
+async def set_json(key: str, ttl: int, value: Any) -> None:
+    """
+    以 orjson 序列化后 SETEX 写入缓存
+
+    Args:
+        key: 缓存键
+        ttl: 过期时间（秒）
+        value: 可 JSON 序列化的值
+    """
+    try:
+        await get_async_redis().setex(key, ttl, orjson.dumps(value))
+    except redis.RedisError as e:
+        logger.warning(f"Cache write failed for {key}: {e}")
+
+
+async def invalidate(*keys: str) -> None:
+    """
+    删除缓存键
+
+    Args:
+        keys: 缓存键
+    """
+    if not keys:
+        return
+
+    try:
+        await get_async_redis().delete(*keys)
+    except redis.RedisError as e:
+        logger.warning(f"Cache invalidation failed for {keys}: {e}")
@@ -3,6 +3,7 @@
 
 使用 pydantic-settings 管理环境变量和配置
 """
+from functools import cached_property
 from typing import List, Optional
 from pydantic_settings import BaseSettings
 from pydantic import Field
@@ -27,6 +28,12 @@ class Settings(BaseSettings):
     )
     database_pool_size: int = Field(default=10, alias="DATABASE_POOL_SIZE")
     database_max_overflow: int = Field(default=20, alias="DATABASE_MAX_OVERFLOW")
+    database_insertmanyvalues_page_size: int = Field(
+        default=1000,
+        alias="DATABASE_INSERTMANYVALUES_PAGE_SIZE"
+    )
+    # 经 PgBouncer（transaction 模式）连接时关闭服务端预编译语句缓存
+    database_pgbouncer: bool = Field(default=False, alias="DATABASE_PGBOUNCER")
 
     # Redis配置
     redis_url: str = Field(default="redis://localhost:6379/0", alias="REDIS_URL")
@@ -84,9 +91,14 @@ class Settings(BaseSettings):
     log_file: str = Field(default="logs/news_gt.log", alias="LOG_FILE")
     log_rotation: str = Field(default="1 day", alias="LOG_ROTATION")
     log_retention: str = Field(default="30 days", alias="LOG_RETENTION")
+    # 活动日志暂存目录（如 tmpfs 上的 /dev/shm/news_gt），轮转时压缩归档到 LOG_FILE 所在目录；
+    # 进程或主机崩溃时会丢失尚未轮转的日志，默认关闭
+    log_staging_dir: Optional[str] = Field(default=None, alias="LOG_STAGING_DIR")
 
     # 安全配置
     secret_key: str = Field(default="change-this-in-production", alias="SECRET_KEY")
+    # 内部接口（如批量导入）的访问密钥，未配置时内部接口不可用
+    internal_api_key: Optional[str] = Field(default=None, alias="INTERNAL_API_KEY")
     cors_origins: str = Field(
         default="http://localhost:3000,http://localhost:8000",
         alias="CORS_ORIGINS"
@@ -104,14 +116,14 @@ class Settings(BaseSettings):
         env_file_encoding = "utf-8"
         case_sensitive = False
 
-    @property
+    @cached_property
     def cors_origins_list(self) -> List[str]:
-        """将CORS origins字符串转换为列表"""
+        """将CORS origins字符串转换为列表（首次访问时解析一次）"""
         return [origin.strip() for origin in self.cors_origins.split(",")]
 
-    @property
+    @cached_property
     def primary_sources_list(self) -> List[str]:
-        """将primary sources字符串转换为列表"""
+        """将primary sources字符串转换为列表（首次访问时解析一次）"""
         return [source.strip() for source in self.verifier_primary_sources.split(",")]
 
     def is_production(self) -> bool:
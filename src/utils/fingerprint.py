@@ -0,0 +1,117 @@
+"""
+内容指纹模块
+
+用于候选内容（传播版本、搜索结果）的去重：
+- content_fingerprint: 精确去重，xxh3 64位非加密哈希
+- simhash64: 近似去重，基于字符shingle的SimHash
+"""
+import re
+from collections import defaultdict
+from typing import Any, Dict, List, Set
+
+import numpy as np
+import xxhash
+
+# 参与指纹计算的正文最大长度
+FINGERPRINT_BODY_LIMIT = 4096
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_BIT_POSITIONS = np.arange(64, dtype=np.uint64)
+
+
+def normalize_text(text: str) -> str:
+    """统一大小写并压缩空白"""
+    return _WHITESPACE_RE.sub(" ", text).strip().lower()
+
+
+def content_fingerprint(title: str, body: str = "") -> int:
+    """
+    计算内容指纹（精确去重）
+
+    Args:
+        title: 标题
+        body: 正文（仅取前 FINGERPRINT_BODY_LIMIT 个字符）
+
+    Returns:
+        int: 64位指纹
+    """
+    data = (
+        normalize_text(title).encode()
+        + b"|"
+        + normalize_text(body[:FINGERPRINT_BODY_LIMIT]).encode()
+    )
+    return xxhash.xxh3_64_intdigest(data)
+
+
+def simhash64(text: str, shingle_size: int = 3) -> int:
+    """
+    计算64位SimHash（近似去重）
+
+    Args:
+        text: 输入文本
+        shingle_size: 字符shingle长度
+
+    Returns:
+        int: 64位SimHash，相似文本的汉明距离较小
+    """
+    text = normalize_text(text)
+    if not text:
+        return 0
+
+    count = max(1, len(text) - shingle_size + 1)
+    hashes = np.fromiter(
+        (xxhash.xxh3_64_intdigest(text[i:i + shingle_size].encode()) for i in range(count)),
+        dtype=np.uint64,
+        count=count
+    )
+
+    # 每一位按shingle哈希投票
+    bits = (hashes[:, None] >> _BIT_POSITIONS) & np.uint64(1)
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 - count
+
+    return int(np.bitwise_or.reduce(np.uint64(1) << _BIT_POSITIONS[votes > 0]))
+
+
+def dedup_documents(
+    documents: List[Dict[str, Any]],
+    title_key: str = "title",
+    body_key: str = "content",
+    max_distance: int = 3
+) -> List[Dict[str, Any]]:
+    """
+    文档去重（保持原有顺序）
+
+    先用精确指纹过滤完全重复的文档，再按SimHash高32位分桶，
+    仅在桶内比较汉明距离以过滤近似重复。
+
+    Args:
+        documents: 文档列表
+        title_key: 标题字段名
+        body_key: 正文字段名
+        max_distance: 视为近似重复的最大汉明距离
+
+    Returns:
+        list: 去重后的文档列表
+    """
+    seen: Set[int] = set()
+    buckets: Dict[int, List[int]] = defaultdict(list)
+    unique = []
+
+    for doc in documents:
+        title = doc.get(title_key) or ""
+        body = doc.get(body_key) or ""
+
+        fingerprint = content_fingerprint(title, body)
+        if fingerprint in seen:
+            continue
+        seen.add(fingerprint)
+
+        signature = simhash64(f"{title} {body[:FINGERPRINT_BODY_LIMIT]}")
+        bucket = buckets[signature >> 32]
+        if any((signature ^ other).bit_count() <= max_distance for other in bucket):
+            continue
+        bucket.append(signature)
+
+        unique.append(doc)
+
+    return unique
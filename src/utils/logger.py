@@ -1,14 +1,815 @@
 """
 日志模块
 
-使用 loguru 提供结构化日志
+使用 loguru 提供结构化日志；文件sink由后台线程批量写入（生产者只入队）
 """
+import atexit
+import functools
+import itertools
+import os
+import re
 import sys
+import threading
+import time
+import traceback
+import zipfile
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, time as dtime, timedelta
 from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Optional, Tuple, Union
+import orjson
 from loguru import logger
 
 from .config import settings
 
+# loguru 内置级别 -> 级别数值（级别过滤只需一次整数比较）
+LEVEL_NO = {
+    "TRACE": 5,
+    "DEBUG": 10,
+    "INFO": 20,
+    "SUCCESS": 25,
+    "WARNING": 30,
+    "ERROR": 40,
+    "CRITICAL": 50,
+}
+
+# 日志相关配置（导入时读取一次）
+_LOG_LEVEL = settings.log_level
+_LOG_FILE = Path(settings.log_file)
+_LOG_ROTATION = settings.log_rotation
+_LOG_RETENTION = settings.log_retention
+_LOG_STAGING_DIR = Path(settings.log_staging_dir) if settings.log_staging_dir else None
+_IS_PRODUCTION = settings.is_production()
+
+# 非生产环境才展开完整调用栈和局部变量（backtrace/diagnose 需要遍历栈帧）；
+# 生产环境如需堆栈，在调用处使用 logger.opt(exception=True)
+_DIAGNOSE = not _IS_PRODUCTION
+
+# 控制台仅在 stderr 为终端且 NO_COLOR 未设置或为空（https://no-color.org）时输出颜色；
+# 重定向到文件或由进程管理器采集时 ANSI 转义只是噪音
+_COLOR = sys.stderr.isatty() and not os.environ.get("NO_COLOR")
+
+
+def _stderr_is_journal() -> bool:
+    """
+    stderr 是否直接接入 journald
+
+    JOURNAL_STREAM 会被子进程继承，即便 stderr 已被重定向；按 systemd 文档，
+    将其中的 "设备号:inode" 与 fd 2 的实际 fstat 结果比较。
+
+    Returns:
+        bool: 是否接入 journald
+    """
+    stream = os.environ.get("JOURNAL_STREAM")
+    if not stream:
+        return False
+    try:
+        device, inode = (int(part) for part in stream.split(":"))
+        stat = os.fstat(2)
+    except (ValueError, OSError):
+        return False
+    return (stat.st_dev, stat.st_ino) == (device, inode)
+
+
+# 由 systemd 启动且 stderr 接入 journald
+_UNDER_JOURNALD = _stderr_is_journal()
+
+# 所有sink中的最低级别（setup_logger 中确定）
+_MIN_LEVEL_NO = LEVEL_NO["TRACE"]
+
+# 文件sink环形缓冲容量（写满时丢弃最旧记录，生产者永不阻塞）
+RING_CAPACITY = 8192
+# 后台线程单批最多写入的记录数
+DRAIN_BATCH_SIZE = 128
+# 用户态写缓冲容量（字节），攒满或到刷新间隔才发起一次 write()
+BUFFER_CAPACITY = 8 * 1024
+# 错误日志写缓冲容量（字节）：错误行较少，攒到 4 KiB 或到刷新间隔即写出，尽快落盘
+ERROR_BUFFER_CAPACITY = 4 * 1024
+# 文件刷新间隔（秒）
+FLUSH_INTERVAL = 1.0
+
+# 日志格式（loguru 风格颜色标签 + str.format 字段），setup_logger 时编译一次
+LOG_FORMAT = (
+    "<green>{time}</green> | "
+    "<level>{level: <8}</level> | "
+    "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> | "
+    "<level>{message}</level>"
+)
+
+# journald 下的控制台格式：时间和级别由 journald 记录，行首 <N> 为 syslog 优先级前缀
+JOURNAL_FORMAT = "<{priority}>{name}:{function}:{line} | {message}"
+
+# 时间戳的秒级部分缓存：(epoch 秒, "YYYY-MM-DD HH:MM:SS")，整体替换因而线程安全
+_TIME_BUCKET: Tuple[int, str] = (-1, "")
+
+
+def _format_time(dt: datetime) -> str:
+    """
+    格式化记录时间（精确到毫秒）
+
+    同一秒内的记录复用缓存的 strftime 结果，只拼接毫秒部分。
+
+    Args:
+        dt: 记录时间
+
+    Returns:
+        "YYYY-MM-DD HH:MM:SS.mmm"
+    """
+    global _TIME_BUCKET
+    second = int(dt.timestamp())
+    bucket = _TIME_BUCKET
+    if bucket[0] != second:
+        bucket = _TIME_BUCKET = (second, dt.strftime("%Y-%m-%d %H:%M:%S"))
+    return f"{bucket[1]}.{dt.microsecond // 1000:03d}"
+
+
+# 格式字段取值函数（record -> 值）
+_FIELD_GETTERS: Dict[str, Callable[[dict], Any]] = {
+    "time": lambda r: _format_time(r["time"]),
+    "level": lambda r: r["level"].name,
+    "name": lambda r: r["name"],
+    "function": lambda r: r["function"],
+    "line": lambda r: r["line"],
+    "message": lambda r: r["message"],
+    "level_color": lambda r: _LEVEL_ANSI.get(r["level"].name, ""),
+    "priority": lambda r: _SYSLOG_PRIORITY.get(r["level"].name, 6),
+}
+
+_ANSI = {
+    "green": "\x1b[32m",
+    "cyan": "\x1b[36m",
+    "reset": "\x1b[0m",
+}
+
+# 与 loguru 默认配色一致
+_LEVEL_ANSI = {
+    "TRACE": "\x1b[1m\x1b[36m",
+    "DEBUG": "\x1b[1m\x1b[34m",
+    "INFO": "\x1b[1m",
+    "SUCCESS": "\x1b[1m\x1b[32m",
+    "WARNING": "\x1b[1m\x1b[33m",
+    "ERROR": "\x1b[1m\x1b[31m",
+    "CRITICAL": "\x1b[1m\x1b[41m",
+}
+
+# 日志级别 -> syslog 优先级（journald 解析行首 <N> 得到 PRIORITY）
+_SYSLOG_PRIORITY = {
+    "TRACE": 7,
+    "DEBUG": 7,
+    "INFO": 6,
+    "SUCCESS": 5,
+    "WARNING": 4,
+    "ERROR": 3,
+    "CRITICAL": 2,
+}
+
+_TAG_RE = re.compile(r"<(/?)(\w+)>")
+
+# 时长单位（与 loguru 一致："m" 为分钟，月、年按 30 / 365 天计）
+_DURATION_UNITS = {
+    "ms": 0.001, "millisecond": 0.001,
+    "s": 1, "sec": 1, "second": 1,
+    "m": 60, "min": 60, "minute": 60,
+    "h": 3600, "hr": 3600, "hour": 3600,
+    "d": 86400, "day": 86400,
+    "w": 604800, "week": 604800,
+    "month": 30 * 86400,
+    "y": 365 * 86400, "year": 365 * 86400,
+}
+_SIZE_UNITS = {"b": 1, "k": 1024, "m": 1024 ** 2, "g": 1024 ** 3, "t": 1024 ** 4}
+_WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+_DURATION_RE = re.compile(r"(?:\s*\d+(?:\.\d*)?\s*[a-z]+\s*,?)+", re.I)
+_DURATION_PART_RE = re.compile(r"(\d+(?:\.\d*)?)\s*([a-z]+)", re.I)
+_SIZE_RE = re.compile(r"(\d+(?:\.\d*)?)\s*([kmgt]?)i?b", re.I)
+# 如 "00:00"、"12:00 PM"、"monday"、"w0 at 13:30"
+_TIME_OF_DAY_RE = re.compile(
+    r"(?:(?P<day>[a-z]+|w[0-6])\s*)?(?:at\s*)?"
+    r"(?:(?P<hour>\d{1,2}):(?P<minute>\d{2})(?::(?P<second>\d{2}))?\s*(?P<ampm>am|pm)?)?",
+    re.I
+)
+
+# 轮转时刻函数：当前时间戳 -> 下一次轮转的时间戳
+Schedule = Callable[[float], float]
+
+
+def parse_duration(text: str) -> float:
+    """
+    解析时长配置（loguru 语法）
+
+    Args:
+        text: 如 "30 days"、"1 week"、"12h"、"1h 30min"
+
+    Returns:
+        float: 秒数
+
+    Raises:
+        ValueError: 无法解析
+    """
+    if not _DURATION_RE.fullmatch(text.strip()):
+        raise ValueError(f"invalid duration: {text!r}")
+
+    seconds = 0.0
+    for number, unit in _DURATION_PART_RE.findall(text):
+        unit = unit.lower()
+        if unit not in _DURATION_UNITS and unit.endswith("s"):
+            unit = unit[:-1]
+        if unit not in _DURATION_UNITS:
+            raise ValueError(f"invalid duration unit {unit!r} in {text!r}")
+        seconds += float(number) * _DURATION_UNITS[unit]
+    return seconds
+
+
+def _every(seconds: float) -> Schedule:
+    return lambda now: now + seconds
+
+
+def _next_hour(now: float) -> float:
+    current = datetime.fromtimestamp(now).replace(minute=0, second=0, microsecond=0)
+    return (current + timedelta(hours=1)).timestamp()
+
+
+def _next_month(now: float) -> float:
+    current = datetime.fromtimestamp(now)
+    year, month = (current.year + 1, 1) if current.month == 12 else (current.year, current.month + 1)
+    return datetime(year, month, 1).timestamp()
+
+
+def _next_year(now: float) -> float:
+    return datetime(datetime.fromtimestamp(now).year + 1, 1, 1).timestamp()
+
+
+def _at_time(at: dtime, weekday: Optional[int] = None) -> Schedule:
+    """每天（或每周指定星期）的固定时刻"""
+    step = timedelta(days=1 if weekday is None else 7)
+
+    def next_rotation(now: float) -> float:
+        current = datetime.fromtimestamp(now)
+        candidate = datetime.combine(current.date(), at)
+        if weekday is not None:
+            candidate += timedelta(days=(weekday - current.weekday()) % 7)
+        while candidate <= current:
+            candidate += step
+        return candidate.timestamp()
+
+    return next_rotation
+
+
+_FREQUENCIES: Dict[str, Schedule] = {
+    "hourly": _next_hour,
+    "daily": _at_time(dtime(0, 0)),
+    "weekly": _at_time(dtime(0, 0), weekday=0),
+    "monthly": _next_month,
+    "yearly": _next_year,
+}
+
+
+def _parse_time_of_day(text: str) -> Optional[Schedule]:
+    """解析 "00:00"、"monday"、"sunday at 12:00 PM" 等固定时刻，无法解析时返回 None"""
+    match = _TIME_OF_DAY_RE.fullmatch(text)
+    if not match or not (match["day"] or match["hour"]):
+        return None
+
+    weekday = None
+    if match["day"]:
+        day = match["day"].lower()
+        if day in _WEEKDAYS:
+            weekday = _WEEKDAYS.index(day)
+        elif day[0] == "w" and day[1:].isdigit():
+            weekday = int(day[1:])
+        else:
+            return None
+
+    hour = int(match["hour"] or 0)
+    if match["ampm"]:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if match["ampm"].lower() == "pm" else 0)
+    minute, second = int(match["minute"] or 0), int(match["second"] or 0)
+    if hour > 23 or minute > 59 or second > 59:
+        return None
+
+    return _at_time(dtime(hour, minute, second), weekday)
+
+
+def parse_rotation(text: str) -> Tuple[Optional[int], Optional[Schedule]]:
+    """
+    解析轮转配置（loguru 语法）
+
+    Args:
+        text: 按大小（"100 MB"、"500KB"）、按间隔（"1 day"、"6h"）、
+            按频率（"daily"、"weekly"）或按固定时刻（"00:00"、"monday at 12:00"）
+
+    Returns:
+        tuple: (最大字节数, 轮转时刻函数)，未使用的一项为 None
+
+    Raises:
+        ValueError: 无法解析
+    """
+    text = text.strip()
+    size = _SIZE_RE.fullmatch(text)
+    if size:
+        number, unit = size.groups()
+        return int(float(number) * _SIZE_UNITS[unit.lower() or "b"]), None
+
+    lowered = text.lower()
+    if lowered in _FREQUENCIES:
+        return None, _FREQUENCIES[lowered]
+
+    schedule = _parse_time_of_day(text)
+    if schedule is not None:
+        return None, schedule
+
+    try:
+        return None, _every(parse_duration(text))
+    except ValueError:
+        raise ValueError(
+            f"invalid rotation: {text!r} (expected a size, duration, frequency or time of day)"
+        ) from None
+
+
+def parse_retention(text: str) -> Tuple[Optional[float], Optional[int]]:
+    """
+    解析保留配置（loguru 语法）
+
+    Args:
+        text: 保留时长（如 "30 days"）或保留的归档个数（如 "10"）
+
+    Returns:
+        tuple: (最长保留秒数, 最多保留个数)，未使用的一项为 None
+
+    Raises:
+        ValueError: 无法解析
+    """
+    text = text.strip()
+    if text.isdigit():
+        return None, int(text)
+    return parse_duration(text), None
+
+
+def _check_setting(name: str, parser: Callable[[str], Any], value: str) -> None:
+    """启动时校验日志配置，错误信息指明对应的环境变量"""
+    try:
+        parser(value)
+    except ValueError as e:
+        raise ValueError(f"Invalid {name} setting {value!r}: {e}") from None
+
+
+# ============================================
+# 格式编译
+# ============================================
+
+class _RecordView:
+    """format_map 使用的记录视图：按字段名调用取值函数，不构造中间字典"""
+
+    __slots__ = ("record",)
+
+    def __init__(self, record: dict):
+        self.record = record
+
+    def __getitem__(self, key: str) -> Any:
+        return _FIELD_GETTERS[key](self.record)
+
+
+def compile_format(template: str, colorize: bool = False) -> Callable[[dict], str]:
+    """
+    预编译日志格式
+
+    颜色标签在编译时替换为 ANSI 转义字面量（colorize=False 时直接去掉），
+    每条记录只需对编译后的模板做一次 str.format_map，不再解析颜色标签。
+
+    Args:
+        template: 日志格式（见 LOG_FORMAT）
+        colorize: 是否输出 ANSI 颜色
+
+    Returns:
+        渲染函数：record -> 文本
+    """
+    def replace_tag(tag: re.Match) -> str:
+        if not colorize:
+            return ""
+        closing, color = tag.groups()
+        if closing:
+            return _ANSI["reset"]
+        if color == "level":
+            return "{level_color}"
+        return _ANSI[color]
+
+    format_map = _TAG_RE.sub(replace_tag, template).format_map
+
+    def render(record: dict) -> str:
+        return format_map(_RecordView(record))
+
+    return render
+
+
+def message_formatter(template: str, colorize: bool = False) -> Callable[[str], str]:
+    """
+    构建sink使用的消息格式化函数
+
+    sink 以 format="{message}" 注册，loguru 传入的消息为 "<message>\\n<异常堆栈>"；
+    这里用编译好的模板渲染记录，再接上 loguru 生成的换行和异常部分。
+
+    Args:
+        template: 日志格式
+        colorize: 是否输出 ANSI 颜色
+
+    Returns:
+        格式化函数：loguru message -> 完整日志行
+    """
+    render = compile_format(template, colorize)
+
+    def format_message(message: str) -> str:
+        record = message.record
+        return render(record) + message[len(record["message"]):]
+
+    return format_message
+
+
+def stream_sink(stream, format_message: Callable[[str], str]) -> Callable[[str], None]:
+    """
+    同步输出到流的sink（控制台）
+
+    Args:
+        stream: 输出流
+        format_message: 消息格式化函数
+
+    Returns:
+        sink
+    """
+    def sink(message: str) -> None:
+        stream.write(format_message(message))
+
+    return sink
+
+
+# 注册自定义sink时 loguru 侧只拼接消息和异常，完整格式由 message_formatter 负责
+SINK_FORMAT = "{message}"
+
+
+def json_formatter(message: str) -> str:
+    """
+    结构化（JSON Lines）格式化函数
+
+    用 orjson 序列化记录的常用字段，替代 serialize=True 使用的标准库 json.dumps。
+
+    Args:
+        message: loguru 传入的消息
+
+    Returns:
+        单行 JSON（含换行）
+    """
+    record = message.record
+    payload = {
+        "ts": record["time"].timestamp(),
+        "lvl": record["level"].name,
+        "msg": record["message"],
+        "mod": record["name"],
+        "line": record["line"],
+    }
+    # 消息之后是 loguru 追加的换行和异常堆栈
+    exc = message[len(record["message"]) + 1:]
+    if exc:
+        payload["exc"] = exc
+    return orjson.dumps(payload, option=orjson.OPT_APPEND_NEWLINE).decode()
+
+
+# ============================================
+# 文件sink
+# ============================================
+
+_COMPRESSOR: Optional[ThreadPoolExecutor] = None
+
+
+# 进程启动时可用的 CPU 集合（导入时在主线程读取）
+try:
+    _PROCESS_CPUS = os.sched_getaffinity(0)
+except (AttributeError, OSError):
+    _PROCESS_CPUS = None
+
+
+def _lower_priority() -> None:
+    """
+    压缩线程降低调度优先级（Linux 上 nice 值按线程生效）
+
+    压缩线程由已绑核的写线程在轮转时创建，会继承其单核亲和性，这里恢复为进程的完整 CPU 集合，
+    避免压缩与日志写入争用同一核心。
+    """
+    try:
+        os.nice(10)
+    except (AttributeError, OSError):
+        pass
+    if _PROCESS_CPUS:
+        try:
+            os.sched_setaffinity(0, _PROCESS_CPUS)
+        except (AttributeError, OSError):
+            pass
+
+
+def _pin_to_last_core() -> None:
+    """
+    将当前线程固定到可用的最后一个 CPU 核心（Linux 上亲和性按线程生效）
+
+    写线程不在核心间迁移，其缓冲、fd 等工作集留在同一核心缓存中；
+    不支持 sched_setaffinity 的平台或仅有单核可用时不做处理。
+    """
+    try:
+        cores = os.sched_getaffinity(0)
+        if len(cores) > 1:
+            os.sched_setaffinity(0, {max(cores)})
+    except (AttributeError, OSError):
+        pass
+
+
+def _compressor() -> ThreadPoolExecutor:
+    """轮转归档压缩线程（懒创建，单线程）"""
+    global _COMPRESSOR
+    if _COMPRESSOR is None:
+        _COMPRESSOR = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="log-compress",
+            initializer=_lower_priority
+        )
+    return _COMPRESSOR
+
+
+def _ensure_dir(path: Path) -> None:
+    """确保目录存在（先 stat 判断，常见的已存在情况不再逐级 mkdir）"""
+    if not path.is_dir():
+        path.mkdir(parents=True, exist_ok=True)
+
+
+def _report_sink_error(exc: Optional[BaseException] = None) -> None:
+    """
+    将sink内部异常输出到原始 stderr（与 loguru catch=True 的行为一致），不中断写线程
+
+    Args:
+        exc: 异常对象（默认取当前正在处理的异常）
+    """
+    try:
+        details = "".join(traceback.format_exception(exc)) if exc is not None else traceback.format_exc()
+        sys.__stderr__.write(
+            f"--- Logging error in log-writer ---\n{details}--- End of logging error ---\n"
+        )
+    except Exception:
+        pass
+
+
+def _report_future_error(future: "Future") -> None:
+    """后台压缩任务的完成回调：报告压缩或清理中的异常（否则会被 Future 静默吞掉）"""
+    exc = future.exception()
+    if exc is not None:
+        _report_sink_error(exc)
+
+
+class RotatingFile:
+    """
+    按大小或时间轮转的追加写日志文件
+
+    写入先进入 BUFFER_CAPACITY 字节的用户态缓冲，攒满（或 flush()）时以一次 os.write()
+    写出；文件以 O_APPEND 打开，绕过 Python io 层的缓冲和锁。只由后台写线程访问，无需加锁。
+    轮转时旧文件重命名为 <stem>.<时间戳><suffix>，交给低优先级压缩线程打包为 zip
+    并清理超过保留期的归档，写线程不等待压缩完成。
+    文件及其目录在首次写入时才创建，从不输出日志的进程不产生任何文件系统操作。
+    指定 archive_dir 时，path 可位于 tmpfs 暂存目录：轮转出的文件直接从内存读取压缩，
+    归档写入 archive_dir（先写临时文件再原子替换），磁盘只承担一次压缩后的写入；
+    暂存目录同样在首次写入时创建，不可用时改为直接写入 archive_dir。
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        rotation: str,
+        retention: str,
+        capacity: int = BUFFER_CAPACITY,
+        archive_dir: Optional[Path] = None
+    ):
+        """
+        初始化日志文件
+
+        Args:
+            path: 日志文件路径
+            rotation: 轮转配置（如 "1 day"、"100 MB"）
+            retention: 保留期（如 "30 days"）或保留的归档个数（如 "10"）
+            capacity: 写缓冲容量（字节）
+            archive_dir: 归档目录（默认与日志文件同目录）
+        """
+        self.path = path
+        self.archive_dir = archive_dir or path.parent
+        self.max_bytes, self.schedule = parse_rotation(rotation)
+        self.max_age, self.max_count = parse_retention(retention)
+        self.capacity = capacity
+
+        self._fd: Optional[int] = None
+        self._buffer = bytearray()
+        self._size = 0  # 文件大小（含缓冲中未写出的字节）
+        self._next_rotation = 0.0
+
+    def _open(self) -> None:
+        try:
+            _ensure_dir(self.path.parent)
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        except OSError:
+            if self.path.parent == self.archive_dir:
+                raise
+            # 暂存目录不可用时直接写磁盘
+            self.path = self.archive_dir / self.path.name
+            _ensure_dir(self.path.parent)
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._size = os.fstat(self._fd).st_size
+        if self.schedule:
+            self._next_rotation = self.schedule(time.time())
+
+    def write(self, data: str) -> None:
+        """写入已格式化的日志文本（必要时先轮转）"""
+        encoded = data.encode("utf-8")
+
+        if self._fd is None:
+            self._open()
+        elif (
+            (self.max_bytes and self._size + len(encoded) > self.max_bytes)
+            or (self.schedule and time.time() >= self._next_rotation)
+        ):
+            self._rotate()
+
+        self._buffer += encoded
+        self._size += len(encoded)
+        if len(self._buffer) >= self.capacity:
+            self.flush()
+
+    def flush(self) -> None:
+        """写出缓冲"""
+        if not self._buffer or self._fd is None:
+            return
+
+        view = memoryview(self._buffer)
+        try:
+            while view:
+                view = view[os.write(self._fd, view):]
+        finally:
+            # 写入失败时丢弃缓冲，避免磁盘满等持续错误下缓冲无限增长
+            view.release()
+            self._buffer.clear()
+
+    def close(self) -> None:
+        if self._fd is not None:
+            try:
+                self.flush()
+            finally:
+                os.close(self._fd)
+                self._fd = None
+
+    def _rotate(self) -> None:
+        """重命名当前文件、压缩归档、清理过期归档并重新打开"""
+        self.close()
+
+        stamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S_%f")
+        rotated = self.path.with_name(f"{self.path.stem}.{stamp}{self.path.suffix}")
+        self.path.rename(rotated)
+        self._open()
+
+        _compressor().submit(self._compress_and_cleanup, rotated).add_done_callback(_report_future_error)
+
+    def _compress_and_cleanup(self, path: Path) -> None:
+        """压缩轮转出的文件（先写临时文件再原子替换，避免留下不完整的归档）"""
+        _ensure_dir(self.archive_dir)
+        target = self.archive_dir / f"{path.name}.zip"
+        tmp = self.archive_dir / f"{path.name}.zip.tmp"
+        with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.write(path, path.name)
+        os.replace(tmp, target)
+        path.unlink()
+
+        self._cleanup()
+
+    def _cleanup(self) -> None:
+        """
+        删除超过保留期（或超出保留个数）的归档
+
+        压缩失败时遗留的未压缩轮转文件（<stem>.<时间戳><suffix>）同样计入保留规则，避免永久残留。
+        """
+        pattern = f"{self.path.stem}.*{self.path.suffix}"
+        leftovers = set(self.path.parent.glob(pattern)) - {self.path}
+        archives = sorted(
+            [*self.archive_dir.glob(f"{pattern}.zip"), *leftovers],
+            key=lambda archive: archive.stat().st_mtime,
+            reverse=True
+        )
+        if self.max_count is not None:
+            expired = archives[self.max_count:]
+        else:
+            cutoff = time.time() - self.max_age
+            expired = [archive for archive in archives if archive.stat().st_mtime < cutoff]
+        for archive in expired:
+            archive.unlink(missing_ok=True)
+
+
+class BackgroundFileSink:
+    """
+    后台线程文件sink
+
+    loguru 调用 sink 时只把已格式化的消息追加到有界环形缓冲（满时丢弃最旧），
+    由单个后台线程批量取出、格式化后写入文件缓冲，并每 FLUSH_INTERVAL 秒刷新一次。
+    替代 enqueue=True：后者经由多进程队列，每条消息都要 pickle 并加锁。
+    若指定 error_file，error_sink 作为独立的 loguru handler 注册（自有级别与 backtrace），
+    其消息进入同一环形缓冲，由同一个后台线程写入 error_file。
+    """
+
+    def __init__(
+        self,
+        file: RotatingFile,
+        format_message: Callable[[str], str],
+        capacity: int = RING_CAPACITY,
+        error_file: Optional[RotatingFile] = None
+    ):
+        """
+        初始化sink并启动后台线程
+
+        Args:
+            file: 目标日志文件
+            format_message: 消息格式化函数（在后台线程中调用）
+            capacity: 环形缓冲容量（条）
+            error_file: 错误日志文件（可选，接收 error_sink 的消息）
+        """
+        self.file = file
+        self.error_file = error_file
+        self.format_message = format_message
+        self._ring: Deque[Tuple[bool, str]] = deque(maxlen=capacity)
+        self._wakeup = threading.Event()
+        self._stopped = False
+
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def __call__(self, message: str) -> None:
+        self._ring.append((False, message))
+        self._wakeup.set()
+
+    def error_sink(self, message: str) -> None:
+        """错误日志 handler 的 sink：消息写入 error_file"""
+        self._ring.append((True, message))
+        self._wakeup.set()
+
+    def _drain(self) -> None:
+        """写出缓冲中的全部消息（每批最多 DRAIN_BATCH_SIZE 条）"""
+        ring = self._ring
+        format_message = self.format_message
+        error_file = self.error_file
+        while ring:
+            entries = [ring.popleft() for _ in range(min(len(ring), DRAIN_BATCH_SIZE))]
+            try:
+                lines, errors = [], []
+                for is_error, message in entries:
+                    (errors if is_error else lines).append(format_message(message))
+                if lines:
+                    self.file.write("".join(lines))
+                if errors and error_file is not None:
+                    error_file.write("".join(errors))
+            except Exception:
+                # 格式化或写入失败（磁盘满、轮转时文件被移走等）只丢弃本批，写线程继续运行
+                _report_sink_error()
+
+    def _flush(self) -> None:
+        """刷新文件缓冲"""
+        for file in (self.file, self.error_file):
+            if file is None:
+                continue
+            try:
+                file.flush()
+            except Exception:
+                _report_sink_error()
+
+    def _run(self) -> None:
+        _pin_to_last_core()
+        last_flush = time.monotonic()
+        while not self._stopped:
+            self._wakeup.wait(FLUSH_INTERVAL)
+            self._wakeup.clear()
+            self._drain()
+
+            now = time.monotonic()
+            if now - last_flush >= FLUSH_INTERVAL:
+                self._flush()
+                last_flush = now
+
+    def stop(self) -> None:
+        """停止后台线程并写出剩余消息（进程退出时自动调用）"""
+        if self._stopped:
+            return
+        self._stopped = True
+        self._wakeup.set()
+        self._thread.join()
+        self._drain()
+        for file in (self.file, self.error_file):
+            if file is None:
+                continue
+            try:
+                file.close()
+            except Exception:
+                _report_sink_error()
+
 
 def setup_logger():
     """
@@ -16,78 +817,222 @@ def setup_logger():
 
     根据环境变量配置日志级别、输出格式和文件存储
     """
+    global _MIN_LEVEL_NO
+
+    _check_setting("LOG_ROTATION", parse_rotation, _LOG_ROTATION)
+    _check_setting("LOG_RETENTION", parse_retention, _LOG_RETENTION)
+
     # 移除默认handler
     logger.remove()
 
-    # 日志格式
-    log_format = (
-        "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | "
-        "<level>{level: <8}</level> | "
-        "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> | "
-        "<level>{message}</level>"
-    )
+    plain_format = message_formatter(LOG_FORMAT)
+
+    # 控制台输出（journald 下只输出优先级前缀和消息，时间、级别由 journald 记录）
+    if _UNDER_JOURNALD:
+        console_format = message_formatter(JOURNAL_FORMAT)
+    elif _COLOR:
+        console_format = message_formatter(LOG_FORMAT, colorize=True)
+    else:
+        console_format = plain_format
 
-    # 控制台输出
     logger.add(
-        sys.stderr,
-        format=log_format,
-        level=settings.log_level,
-        colorize=True,
-        backtrace=True,
-        diagnose=True
+        stream_sink(sys.stderr, console_format),
+        format=SINK_FORMAT,
+        level=_LOG_LEVEL,
+        backtrace=_DIAGNOSE,
+        diagnose=_DIAGNOSE
     )
 
     # 文件输出
-    log_file = Path(settings.log_file)
-    log_file.parent.mkdir(parents=True, exist_ok=True)
+    log_file = _LOG_FILE
+
+    # 活动日志可暂存在 tmpfs，轮转时归档回日志目录（暂存目录在首次写入时创建）
+    active_dir = log_file.parent
+    archive_dir = None
+    if _LOG_STAGING_DIR is not None:
+        active_dir, archive_dir = _LOG_STAGING_DIR, log_file.parent
+
+    # 生产环境错误日志单独文件：独立的级别与 backtrace，与主文件共用后台写线程
+    error_file = None
+    if _IS_PRODUCTION:
+        error_file = RotatingFile(
+            active_dir / "error.log", "1 day", "90 days",
+            capacity=ERROR_BUFFER_CAPACITY,
+            archive_dir=archive_dir
+        )
 
+    file_sink = BackgroundFileSink(
+        RotatingFile(
+            active_dir / log_file.name, _LOG_ROTATION, _LOG_RETENTION, archive_dir=archive_dir
+        ),
+        plain_format,
+        error_file=error_file
+    )
     logger.add(
-        log_file,
-        format=log_format,
-        level=settings.log_level,
-        rotation=settings.log_rotation,
-        retention=settings.log_retention,
-        compression="zip",
-        backtrace=True,
-        diagnose=True,
-        enqueue=True  # 异步写入
+        file_sink,
+        format=SINK_FORMAT,
+        level=_LOG_LEVEL,
+        backtrace=_DIAGNOSE,
+        diagnose=_DIAGNOSE
     )
 
-    # 生产环境额外配置
-    if settings.is_production():
-        # 错误日志单独文件
-        error_log_file = log_file.parent / "error.log"
+    _MIN_LEVEL_NO = logger.level(_LOG_LEVEL).no
+    if error_file is not None:
         logger.add(
-            error_log_file,
-            format=log_format,
+            file_sink.error_sink,
+            format=SINK_FORMAT,
             level="ERROR",
-            rotation="1 day",
-            retention="90 days",
-            compression="zip",
             backtrace=True,
-            diagnose=True,
-            enqueue=True
+            diagnose=False
         )
+        _MIN_LEVEL_NO = min(_MIN_LEVEL_NO, LEVEL_NO["ERROR"])
 
-    logger.info(f"Logger initialized - Level: {settings.log_level}, File: {log_file}")
-
+    # 不在此输出初始化日志：导入时的这条记录会立即打开日志文件，使文件延迟到首条业务日志才创建失效
     return logger
 
 
+def add_json_sink(path: Union[str, Path], level: Optional[str] = None) -> int:
+    """
+    添加结构化（JSON Lines）文件sink
+
+    与文本日志共用轮转、保留和后台写线程机制。
+
+    Args:
+        path: 日志文件路径
+        level: 日志级别（默认与 LOG_LEVEL 一致）
+
+    Returns:
+        loguru handler id（可用于 logger.remove）
+    """
+    global _MIN_LEVEL_NO
+
+    path = Path(path)
+    level = level or _LOG_LEVEL
+
+    handler_id = logger.add(
+        BackgroundFileSink(RotatingFile(path, _LOG_ROTATION, _LOG_RETENTION), json_formatter),
+        format=SINK_FORMAT,
+        level=level,
+        backtrace=_DIAGNOSE,
+        diagnose=_DIAGNOSE
+    )
+
+    # 级别低于 LOG_LEVEL 时同步放宽短路阈值，否则这些记录在到达 loguru 前就被丢弃
+    _MIN_LEVEL_NO = min(_MIN_LEVEL_NO, logger.level(level).no)
+    return handler_id
+
+
 # 初始化日志
 app_logger = setup_logger()
 
 
-def get_logger(name: str = None):
+def is_enabled(level: str) -> bool:
+    """判断该级别的日志是否会被任一sink输出"""
+    return LEVEL_NO[level] >= _MIN_LEVEL_NO
+
+
+def log(level: str, message: str, *args: Callable[[], Any]) -> None:
+    """
+    惰性日志：级别被过滤时直接返回，参数（无参可调用对象）只在输出时求值
+
+    Args:
+        level: 日志级别
+        message: 消息模板（str.format 风格）
+        args: 模板参数的工厂函数
+    """
+    if LEVEL_NO[level] < _MIN_LEVEL_NO:
+        return
+    logger.opt(lazy=True, depth=1).log(level, message, *args)
+
+
+# 采样计数器：按调用点 (代码对象, 行号) 计数，键数量受源码中的调用点数量限制；next() 在 GIL 下是原子的
+_SAMPLE_COUNTERS: Dict[Tuple[Any, int], "itertools.count"] = defaultdict(itertools.count)
+
+
+def sampled_log(level: str, message: str, *args: Callable[[], Any], rate: int = 100) -> None:
+    """
+    采样日志：同一调用点每 rate 条只输出 1 条（第 1 条总会输出），用于循环中的高频 DEBUG
+
+    Args:
+        level: 日志级别
+        message: 消息模板（str.format 风格）
+        args: 模板参数的工厂函数
+        rate: 采样间隔
+    """
+    if LEVEL_NO[level] < _MIN_LEVEL_NO:
+        return
+    caller = sys._getframe(1)
+    if next(_SAMPLE_COUNTERS[caller.f_code, caller.f_lineno]) % rate:
+        return
+    logger.opt(lazy=True, depth=1).log(level, message, *args)
+
+
+Message = Union[str, Callable[[], str]]
+
+
+class LazyLogger:
+    """
+    带级别短路的 logger 包装
+
+    消息可以是字符串或无参可调用对象（lambda: f"..."）：级别被过滤时不格式化、不分发。
+    其余属性（bind、opt 等）透传给 loguru logger。
+    """
+
+    __slots__ = ("_logger",)
+
+    def __init__(self, bound_logger):
+        self._logger = bound_logger
+
+    def _log(self, level: str, message: Message, args: tuple, kwargs: dict, exception: bool = False) -> None:
+        if LEVEL_NO[level] < _MIN_LEVEL_NO:
+            return
+        if callable(message):
+            message = message()
+        # depth=2：记录调用方（而非包装层）的模块、函数和行号
+        self._logger.opt(depth=2, exception=exception).log(level, message, *args, **kwargs)
+
+    def trace(self, message: Message, *args: Any, **kwargs: Any) -> None:
+        self._log("TRACE", message, args, kwargs)
+
+    def debug(self, message: Message, *args: Any, **kwargs: Any) -> None:
+        self._log("DEBUG", message, args, kwargs)
+
+    def info(self, message: Message, *args: Any, **kwargs: Any) -> None:
+        self._log("INFO", message, args, kwargs)
+
+    def success(self, message: Message, *args: Any, **kwargs: Any) -> None:
+        self._log("SUCCESS", message, args, kwargs)
+
+    def warning(self, message: Message, *args: Any, **kwargs: Any) -> None:
+        self._log("WARNING", message, args, kwargs)
+
+    def error(self, message: Message, *args: Any, **kwargs: Any) -> None:
+        self._log("ERROR", message, args, kwargs)
+
+    def critical(self, message: Message, *args: Any, **kwargs: Any) -> None:
+        self._log("CRITICAL", message, args, kwargs)
+
+    def exception(self, message: Message, *args: Any, **kwargs: Any) -> None:
+        self._log("ERROR", message, args, kwargs, exception=True)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._logger, name)
+
+
+@functools.lru_cache(maxsize=256)
+def get_logger(name: str = None) -> LazyLogger:
     """
     获取logger实例
 
+    按名称缓存：同名多次获取返回同一实例（绑定后的 loguru logger 无状态、线程安全），
+    不再每次调用都 bind 出新对象。
+
     Args:
         name: logger名称（可选）
 
     Returns:
-        logger实例
+        LazyLogger: 带级别短路的logger
     """
     if name:
-        return logger.bind(name=name)
-    return logger
+        return LazyLogger(logger.bind(name=name))
+    return LazyLogger(logger)
@@ -0,0 +1,304 @@
+"""
+日志模块测试：轮转 / 保留配置解析、按大小和时间轮转、保留清理
+"""
+import io
+import os
+import sys
+import time
+import zipfile
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("loguru")
+pytest.importorskip("pydantic_settings")
+
+from src.utils import logger as logmod  # noqa: E402
+from src.utils.logger import (  # noqa: E402
+    RotatingFile,
+    parse_duration,
+    parse_retention,
+    parse_rotation,
+)
+
+
+def wait_for_compressor() -> None:
+    """等待压缩线程处理完已提交的任务（单线程，按提交顺序执行）"""
+    logmod._compressor().submit(lambda: None).result(timeout=10)
+
+
+# ============================================
+# 配置解析
+# ============================================
+
+class TestParseDuration:
+
+    @pytest.mark.parametrize("text, seconds", [
+        ("30 days", 30 * 86400),
+        ("1 day", 86400),
+        ("1 week", 7 * 86400),
+        ("12 hours", 12 * 3600),
+        ("12h", 12 * 3600),
+        ("5 minutes", 300),
+        ("90s", 90),
+        ("1h 30min", 5400),
+        ("1.5 hours", 5400),
+        ("2 months", 60 * 86400),
+        ("1 year", 365 * 86400),
+    ])
+    def test_valid(self, text, seconds):
+        assert parse_duration(text) == pytest.approx(seconds)
+
+    @pytest.mark.parametrize("text", ["", "days", "10", "10 parsecs", "1 day later"])
+    def test_invalid(self, text):
+        with pytest.raises(ValueError):
+            parse_duration(text)
+
+
+class TestParseRotation:
+
+    @pytest.mark.parametrize("text, size", [
+        ("100 MB", 100 * 1024 ** 2),
+        ("100MB", 100 * 1024 ** 2),
+        ("500 KB", 500 * 1024),
+        ("500KiB", 500 * 1024),
+        ("0.5 GB", 512 * 1024 ** 2),
+        ("1024 B", 1024),
+    ])
+    def test_size(self, text, size):
+        assert parse_rotation(text) == (size, None)
+
+    def test_interval(self):
+        max_bytes, schedule = parse_rotation("6 hours")
+        assert max_bytes is None
+        assert schedule(1000.0) == pytest.approx(1000.0 + 6 * 3600)
+
+    def test_time_of_day(self):
+        _, schedule = parse_rotation("00:00")
+        now = datetime(2026, 10, 14, 17, 30)
+        assert datetime.fromtimestamp(schedule(now.timestamp())) == datetime(2026, 10, 15)
+
+    def test_time_of_day_later_today(self):
+        _, schedule = parse_rotation("18:15")
+        now = datetime(2026, 10, 14, 17, 30)
+        assert datetime.fromtimestamp(schedule(now.timestamp())) == datetime(2026, 10, 14, 18, 15)
+
+    def test_weekday(self):
+        # 2026-10-14 为星期三
+        _, schedule = parse_rotation("monday")
+        now = datetime(2026, 10, 14, 17, 30)
+        assert datetime.fromtimestamp(schedule(now.timestamp())) == datetime(2026, 10, 19)
+
+    def test_weekday_at_time_pm(self):
+        _, schedule = parse_rotation("sunday at 12:00 PM")
+        now = datetime(2026, 10, 14, 17, 30)
+        assert datetime.fromtimestamp(schedule(now.timestamp())) == datetime(2026, 10, 18, 12)
+
+    @pytest.mark.parametrize("text, expected", [
+        ("hourly", datetime(2026, 10, 14, 18)),
+        ("daily", datetime(2026, 10, 15)),
+        ("weekly", datetime(2026, 10, 19)),
+        ("monthly", datetime(2026, 11, 1)),
+        ("yearly", datetime(2027, 1, 1)),
+    ])
+    def test_frequency(self, text, expected):
+        _, schedule = parse_rotation(text)
+        now = datetime(2026, 10, 14, 17, 30)
+        assert datetime.fromtimestamp(schedule(now.timestamp())) == expected
+
+    @pytest.mark.parametrize("text", ["", "foo", "25:00", "13:00 PM", "someday", "10 parsecs"])
+    def test_invalid(self, text):
+        with pytest.raises(ValueError):
+            parse_rotation(text)
+
+
+class TestParseRetention:
+
+    def test_count(self):
+        assert parse_retention("10") == (None, 10)
+
+    def test_duration(self):
+        assert parse_retention("30 days") == (30 * 86400, None)
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            parse_retention("forever")
+
+    def test_setting_error_names_variable(self):
+        with pytest.raises(ValueError, match="LOG_RETENTION"):
+            logmod._check_setting("LOG_RETENTION", parse_retention, "forever")
+
+
+# ============================================
+# 轮转与保留
+# ============================================
+
+def archives_of(directory, stem="app", suffix=".log"):
+    return sorted(directory.glob(f"{stem}.*{suffix}.zip"))
+
+
+class TestRotatingFile:
+
+    def test_lazy_open(self, tmp_path):
+        path = tmp_path / "logs" / "app.log"
+        RotatingFile(path, "1 MB", "10 days")
+        assert not path.parent.exists()
+
+    def test_size_rotation(self, tmp_path):
+        path = tmp_path / "app.log"
+        file = RotatingFile(path, "100 B", "10 days", capacity=1)
+
+        file.write("a" * 80 + "\n")
+        file.write("b" * 80 + "\n")
+        wait_for_compressor()
+        file.close()
+
+        assert path.read_text() == "b" * 80 + "\n"
+        (archive,) = archives_of(tmp_path)
+        with zipfile.ZipFile(archive) as zf:
+            (name,) = zf.namelist()
+            assert zf.read(name).decode() == "a" * 80 + "\n"
+        # 压缩后原轮转文件被删除
+        assert sorted(p.name for p in tmp_path.iterdir()) == sorted(["app.log", archive.name])
+
+    def test_time_rotation(self, tmp_path):
+        path = tmp_path / "app.log"
+        file = RotatingFile(path, "1 hour", "10 days", capacity=1)
+
+        file.write("first\n")
+        assert file._next_rotation == pytest.approx(time.time() + 3600, abs=5)
+        file._next_rotation = time.time() - 1
+        file.write("second\n")
+        wait_for_compressor()
+        file.close()
+
+        assert path.read_text() == "second\n"
+        assert len(archives_of(tmp_path)) == 1
+
+    def test_archive_dir(self, tmp_path):
+        staging, archive_dir = tmp_path / "staging", tmp_path / "archive"
+        file = RotatingFile(staging / "app.log", "10 B", "10 days", capacity=1, archive_dir=archive_dir)
+
+        file.write("x" * 20 + "\n")
+        file.write("y\n")
+        wait_for_compressor()
+        file.close()
+
+        assert len(archives_of(archive_dir)) == 1
+        assert [p.name for p in staging.iterdir()] == ["app.log"]
+
+    def test_staging_dir_created_on_first_write(self, tmp_path):
+        staging, archive_dir = tmp_path / "staging", tmp_path / "archive"
+        file = RotatingFile(staging / "app.log", "1 MB", "10 days", capacity=1, archive_dir=archive_dir)
+        assert not staging.exists()
+
+        file.write("x\n")
+        file.close()
+
+        assert (staging / "app.log").read_text() == "x\n"
+
+    def test_unavailable_staging_dir_falls_back(self, tmp_path):
+        blocker = tmp_path / "staging"
+        blocker.write_text("")  # 同名文件使暂存目录无法创建
+        archive_dir = tmp_path / "archive"
+        file = RotatingFile(blocker / "app.log", "1 MB", "10 days", capacity=1, archive_dir=archive_dir)
+
+        file.write("x\n")
+        file.close()
+
+        assert (archive_dir / "app.log").read_text() == "x\n"
+
+    def test_retention_count(self, tmp_path):
+        path = tmp_path / "app.log"
+        file = RotatingFile(path, "1 MB", "2")
+        now = time.time()
+        for age in range(4):
+            archive = tmp_path / f"app.2026-01-0{age + 1}_00-00-00_000000.log.zip"
+            archive.write_bytes(b"")
+            os.utime(archive, (now - age * 60, now - age * 60))
+
+        file._cleanup()
+
+        assert [p.name for p in archives_of(tmp_path)] == [
+            "app.2026-01-01_00-00-00_000000.log.zip",
+            "app.2026-01-02_00-00-00_000000.log.zip",
+        ]
+
+    def test_retention_age(self, tmp_path):
+        path = tmp_path / "app.log"
+        file = RotatingFile(path, "1 MB", "1 day")
+        old = tmp_path / "app.old.log.zip"
+        recent = tmp_path / "app.recent.log.zip"
+        old.write_bytes(b"")
+        recent.write_bytes(b"")
+        two_days_ago = time.time() - timedelta(days=2).total_seconds()
+        os.utime(old, (two_days_ago, two_days_ago))
+
+        file._cleanup()
+
+        assert archives_of(tmp_path) == [recent]
+
+    def test_retention_includes_uncompressed_leftovers(self, tmp_path):
+        path = tmp_path / "app.log"
+        path.write_text("active\n")
+        file = RotatingFile(path, "1 MB", "1 day")
+        leftover = tmp_path / "app.2026-01-01_00-00-00_000000.log"
+        leftover.write_text("rotated\n")
+        two_days_ago = time.time() - timedelta(days=2).total_seconds()
+        os.utime(leftover, (two_days_ago, two_days_ago))
+        os.utime(path, (two_days_ago, two_days_ago))
+
+        file._cleanup()
+
+        assert not leftover.exists()
+        # 活动文件不受保留规则影响
+        assert path.exists()
+
+    def test_compression_error_is_reported(self, tmp_path, monkeypatch):
+        stderr = io.StringIO()
+        monkeypatch.setattr(sys, "__stderr__", stderr)
+
+        def broken_zip(*args, **kwargs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(logmod.zipfile, "ZipFile", broken_zip)
+
+        file = RotatingFile(tmp_path / "app.log", "10 B", "10 days", capacity=1)
+        file.write("x" * 20 + "\n")
+        file.write("y\n")
+        wait_for_compressor()
+        file.close()
+
+        assert "disk full" in stderr.getvalue()
+
+
+# ============================================
+# 后台写线程
+# ============================================
+
+class TestBackgroundFileSink:
+
+    def test_error_sink_routes_to_error_file(self, tmp_path):
+        main = RotatingFile(tmp_path / "app.log", "1 MB", "10 days", capacity=1)
+        errors = RotatingFile(tmp_path / "error.log", "1 MB", "10 days", capacity=1)
+        sink = logmod.BackgroundFileSink(main, str, error_file=errors)
+
+        sink("info\n")
+        sink.error_sink("boom\n")
+        sink.stop()
+
+        assert (tmp_path / "app.log").read_text() == "info\n"
+        assert (tmp_path / "error.log").read_text() == "boom\n"
+
+
+class TestJournalDetection:
+
+    def test_matching_stream(self, monkeypatch):
+        stat = os.fstat(2)
+        monkeypatch.setenv("JOURNAL_STREAM", f"{stat.st_dev}:{stat.st_ino}")
+        assert logmod._stderr_is_journal()
+
+    @pytest.mark.parametrize("value", ["1:1", "garbage", ""])
+    def test_inherited_or_invalid_stream(self, monkeypatch, value):
+        monkeypatch.setenv("JOURNAL_STREAM", value)
+        assert not logmod._stderr_is_journal()